@@ -26,7 +26,7 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 # Import Base and all models to ensure they're registered
 from app.models.base import Base
-from app.models import User, Client, Vehicle, WorkOrder
+from app.models import User, Client, Vehicle, WorkOrder, RevokedToken
 
 target_metadata = Base.metadata
 
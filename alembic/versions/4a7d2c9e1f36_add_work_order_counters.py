@@ -0,0 +1,41 @@
+"""add work order counters
+
+Revision ID: 4a7d2c9e1f36
+Revises: 8c41f0b2d7a9
+Create Date: 2026-10-18 16:02:47.530211
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a7d2c9e1f36'
+down_revision: Union[str, Sequence[str], None] = '8c41f0b2d7a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Reuse the enum types of work_orders
+    op.create_table('work_order_counters',
+    sa.Column('work_status', postgresql.ENUM('PENDING', 'COMPLETED', name='work_status', create_type=False), nullable=False),
+    sa.Column('payment_status', postgresql.ENUM('NOT_PAID', 'PAID', 'BILL_SENT', 'NOT_REQUESTED', name='payment_status', create_type=False), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('work_status', 'payment_status')
+    )
+
+    # Start from the current totals; later writes apply deltas
+    op.execute(
+        "INSERT INTO work_order_counters (work_status, payment_status, count) "
+        "SELECT work_status, payment_status, COUNT(*) FROM work_orders GROUP BY work_status, payment_status"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('work_order_counters')
@@ -0,0 +1,46 @@
+"""add work order and vehicle indexes
+
+Revision ID: 8c41f0b2d7a9
+Revises: 303e91d2a65e
+Create Date: 2026-10-18 14:21:05.118392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41f0b2d7a9'
+down_revision: Union[str, Sequence[str], None] = '303e91d2a65e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_work_orders_client_id_entry_date', 'work_orders', ['client_id', 'entry_date']),
+    ('ix_work_orders_vehicle_id_entry_date', 'work_orders', ['vehicle_id', 'entry_date']),
+    ('ix_work_orders_entry_date_id', 'work_orders', ['entry_date', 'id']),
+    ('ix_work_orders_work_status_entry_date', 'work_orders', ['work_status', 'entry_date']),
+    ('ix_work_orders_payment_status_entry_date', 'work_orders', ['payment_status', 'entry_date']),
+    ('ix_vehicles_owner_id', 'vehicles', ['owner_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # On Postgres build the indexes without locking out writes; CONCURRENTLY
+    # cannot run inside a transaction, hence the autocommit block
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=concurrently)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=concurrently)
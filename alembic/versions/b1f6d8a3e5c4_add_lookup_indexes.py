@@ -0,0 +1,59 @@
+"""add lookup indexes
+
+Revision ID: b1f6d8a3e5c4
+Revises: e93b5f1a7c20
+Create Date: 2026-10-18 19:12:33.410928
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.lookup import normalize_name
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1f6d8a3e5c4'
+down_revision: Union[str, Sequence[str], None] = 'e93b5f1a7c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+clients = sa.table('clients', sa.column('id', sa.Integer), sa.column('name', sa.String), sa.column('name_normalized', sa.String))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    op.add_column('clients', sa.Column('name_normalized', sa.String(length=100), nullable=True))
+
+    # Accent stripping is done in Python, the same way the model does it
+    rows = bind.execute(sa.select(clients.c.id, clients.c.name)).all()
+    for start in range(0, len(rows), 1000):
+        bind.execute(
+            clients.update().where(clients.c.id == sa.bindparam('row_id')).values(name_normalized=sa.bindparam('normalized')),
+            [{'row_id': row.id, 'normalized': normalize_name(row.name)} for row in rows[start:start + 1000]],
+        )
+
+    with op.batch_alter_table('clients') as batch_op:
+        batch_op.alter_column('name_normalized', existing_type=sa.String(length=100), nullable=False)
+
+    op.create_index(
+        'ix_clients_name_normalized', 'clients', ['name_normalized'], unique=False,
+        postgresql_ops={'name_normalized': 'text_pattern_ops'},
+    )
+    if bind.dialect.name == 'postgresql':
+        op.create_index(
+            'ix_vehicles_plate_number_pattern', 'vehicles', ['plate_number'], unique=False,
+            postgresql_ops={'plate_number': 'text_pattern_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_vehicles_plate_number_pattern', table_name='vehicles')
+    op.drop_index('ix_clients_name_normalized', table_name='clients')
+    with op.batch_alter_table('clients') as batch_op:
+        batch_op.drop_column('name_normalized')
@@ -0,0 +1,28 @@
+"""add token_version to users
+
+Revision ID: d7389d43ef1f
+Revises: b5ad31ff066d
+Create Date: 2026-10-18 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7389d43ef1f'
+down_revision: Union[str, Sequence[str], None] = 'b5ad31ff066d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
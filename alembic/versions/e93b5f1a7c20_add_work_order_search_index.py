@@ -0,0 +1,65 @@
+"""add work order search index
+
+Revision ID: e93b5f1a7c20
+Revises: 4a7d2c9e1f36
+Create Date: 2026-10-18 17:40:12.884106
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e93b5f1a7c20'
+down_revision: Union[str, Sequence[str], None] = '4a7d2c9e1f36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SOURCE = (
+    "FROM work_orders w "
+    "JOIN clients c ON c.id = w.client_id "
+    "JOIN vehicles v ON v.id = w.vehicle_id"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE work_order_search USING fts5("
+            "details, spare_parts, workers, client_name, plate_number, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+        op.execute(
+            "INSERT INTO work_order_search (rowid, details, spare_parts, workers, client_name, plate_number) "
+            "SELECT w.id, w.details, w.spare_parts, w.workers, c.name, v.plate_number " + SOURCE
+        )
+
+    elif dialect == 'postgresql':
+        op.create_table('work_order_search',
+        sa.Column('work_order_id', sa.Integer(), nullable=False),
+        sa.Column('document', sa.dialects.postgresql.TSVECTOR(), nullable=False),
+        sa.ForeignKeyConstraint(['work_order_id'], ['work_orders.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('work_order_id')
+        )
+        op.execute(
+            "INSERT INTO work_order_search (work_order_id, document) "
+            "SELECT w.id, "
+            "setweight(to_tsvector('simple', coalesce(w.details, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(w.spare_parts, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(w.workers, '')), 'C') || "
+            "setweight(to_tsvector('simple', coalesce(c.name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(v.plate_number, '')), 'A') " + SOURCE
+        )
+        # Built after the backfill, which is faster than updating it row by row
+        op.create_index('ix_work_order_search_document', 'work_order_search', ['document'], postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS work_order_search")
@@ -0,0 +1,245 @@
+"""
+Bulk creation of clients, vehicles and work orders, and bulk work-order
+status transitions.
+Creates validate every item on its own, check the references of each chunk
+with one query per referenced table, and insert the chunk with one multi-row
+INSERT ... RETURNING in its own transaction, so bad items are reported
+without aborting the rest of the batch. Transitions lock the matching rows,
+then UPDATE ... RETURNING them by id.
+"""
+from collections import Counter
+import os
+
+from dotenv import load_dotenv
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database.counters import apply_counter_deltas
+from app.database.lookup import track_inserted_rows
+from app.database.routing import pin_primary
+from app.database.search import reindex_work_orders
+from app.models.client import Client
+from app.models.vehicle import Vehicle
+from app.models.work_order import WorkOrder
+from app.schemas.client import ClientCreate
+from app.schemas.vehicle import VehicleCreate
+from app.schemas.work_order import WorkOrderCreate
+
+load_dotenv()
+
+# Items accepted per request, and rows per INSERT statement / transaction
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "5000"))
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+
+
+def _error(index: int, detail: str) -> dict:
+    return {"index": index, "detail": detail}
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    messages = []
+    for error in exc.errors():
+        location = ".".join(str(part) for part in error["loc"])
+        messages.append(f"{location}: {error['msg']}" if location else error["msg"])
+    return "; ".join(messages)
+
+
+def validate_items(schema, items: list) -> tuple:
+    """
+    Validate each raw item against schema.
+
+    Returns:
+        ([(index, values)], errors) with the values of the valid items and
+        one error per invalid item
+    """
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schema.model_validate(item).model_dump()))
+        except ValidationError as exc:
+            errors.append(_error(index, _validation_detail(exc)))
+    return valid, errors
+
+
+def _chunks(items: list) -> list:
+    return [items[start:start + BULK_CHUNK_SIZE] for start in range(0, len(items), BULK_CHUNK_SIZE)]
+
+
+# ============================================
+# CHUNKED INSERTS
+# ============================================
+def _insert_chunk(db: Session, model, chunk: list, after_insert, created: list, errors: list) -> None:
+    """
+    Insert the (index, values) items of chunk with one INSERT ... RETURNING
+    and commit. after_insert(db, rows) runs in the same transaction: Core
+    inserts bypass the flush hooks that maintain counters and indexes.
+
+    On an integrity error (a row written concurrently since the checks) the
+    chunk is rolled back and its items retried one by one, so only the
+    failing ones are reported.
+    """
+    if not chunk:
+        return
+
+    table = model.__table__
+    statement = insert(table).returning(*table.c, sort_by_parameter_order=True)
+    try:
+        rows = db.execute(statement, [values for _, values in chunk]).all()
+        after_insert(db, rows)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        if len(chunk) == 1:
+            errors.append(_error(chunk[0][0], f"Integrity error creating {table.name}"))
+            return
+        for item in chunk:
+            _insert_chunk(db, model, [item], after_insert, created, errors)
+        return
+
+    created.extend(rows)
+
+
+def _result(created: list, errors: list) -> dict:
+    return {"created": created, "errors": sorted(errors, key=lambda error: error["index"])}
+
+
+# ============================================
+# BULK CREATES
+# ============================================
+def _after_client_insert(db: Session, rows) -> None:
+    track_inserted_rows(db, Client, rows)
+
+
+def _after_vehicle_insert(db: Session, rows) -> None:
+    track_inserted_rows(db, Vehicle, rows)
+
+
+def _after_work_order_insert(db: Session, rows) -> None:
+    apply_counter_deltas(db, Counter((row.work_status, row.payment_status) for row in rows))
+    reindex_work_orders(db, WorkOrder.id.in_([row.id for row in rows]))
+
+
+def bulk_create_clients(db: Session, items: list) -> dict:
+    """Create the valid clients of items; returns the created rows (in input order) and per-item errors."""
+    valid, errors = validate_items(ClientCreate, items)
+    created = []
+
+    for chunk in _chunks(valid):
+        _insert_chunk(db, Client, chunk, _after_client_insert, created, errors)
+
+    return _result(created, errors)
+
+
+def bulk_create_vehicles(db: Session, items: list) -> dict:
+    """
+    Create the valid vehicles of items. Owners and taken plates are checked
+    with one query each per chunk; a plate repeated in the batch is only
+    created once.
+    """
+    valid, errors = validate_items(VehicleCreate, items)
+    created, seen_plates = [], set()
+
+    for chunk in _chunks(valid):
+        owner_ids = {values["owner_id"] for _, values in chunk}
+        plates = {values["plate_number"] for _, values in chunk}
+        owners = set(db.scalars(select(Client.id).where(Client.id.in_(owner_ids))))
+        taken = set(db.scalars(select(Vehicle.plate_number).where(Vehicle.plate_number.in_(plates))))
+
+        accepted = []
+        for index, values in chunk:
+            if values["owner_id"] not in owners:
+                errors.append(_error(index, "Owner not found"))
+            elif values["plate_number"] in taken or values["plate_number"] in seen_plates:
+                errors.append(_error(index, "Plate number already exists"))
+            else:
+                seen_plates.add(values["plate_number"])
+                accepted.append((index, values))
+
+        _insert_chunk(db, Vehicle, accepted, _after_vehicle_insert, created, errors)
+
+    return _result(created, errors)
+
+
+def bulk_create_work_orders(db: Session, items: list) -> dict:
+    """
+    Create the valid work orders of items. Clients and vehicles (with their
+    owners) are checked with one query each per chunk; counters and the
+    search index are updated in each chunk's transaction.
+    """
+    valid, errors = validate_items(WorkOrderCreate, items)
+    created = []
+
+    for chunk in _chunks(valid):
+        client_ids = {values["client_id"] for _, values in chunk}
+        vehicle_ids = {values["vehicle_id"] for _, values in chunk}
+        clients = set(db.scalars(select(Client.id).where(Client.id.in_(client_ids))))
+        owners = dict(db.execute(select(Vehicle.id, Vehicle.owner_id).where(Vehicle.id.in_(vehicle_ids))).all())
+
+        accepted = []
+        for index, values in chunk:
+            if values["client_id"] not in clients:
+                errors.append(_error(index, "Client not found"))
+            elif values["vehicle_id"] not in owners:
+                errors.append(_error(index, "Vehicle not found"))
+            elif owners[values["vehicle_id"]] != values["client_id"]:
+                errors.append(_error(index, "Vehicle does not belong to the specified client"))
+            else:
+                accepted.append((index, values))
+
+        _insert_chunk(db, WorkOrder, accepted, _after_work_order_insert, created, errors)
+
+    return _result(created, errors)
+
+
+# ============================================
+# BULK STATUS TRANSITIONS
+# ============================================
+def transition_work_orders(db: Session, condition, work_status=None, payment_status=None) -> list:
+    """
+    Set work_status and/or payment_status on the work orders matching
+    condition with UPDATE ... RETURNING, skipping those already in
+    the target statuses, and commit.
+
+    The matching rows are first selected with their current statuses and
+    (on PostgreSQL) locked, on the primary (or the SQLite writer connection);
+    the UPDATE then targets those ids only, BULK_CHUNK_SIZE at a time, so the
+    counters move by exactly the status pairs each updated row left, even if
+    other rows start matching meanwhile.
+
+    Returns:
+        The (id, work_status, payment_status) rows that changed
+    """
+    targets = {
+        name: value
+        for name, value in (("work_status", work_status), ("payment_status", payment_status))
+        if value is not None
+    }
+    changing = or_(*(getattr(WorkOrder, name) != value for name, value in targets.items()))
+
+    pin_primary(db)
+    before = {
+        row.id: (row.work_status, row.payment_status)
+        for row in db.execute(
+            select(WorkOrder.id, WorkOrder.work_status, WorkOrder.payment_status)
+            .where(condition, changing)
+            .with_for_update()
+        )
+    }
+
+    rows = []
+    for ids in _chunks(list(before)):
+        rows += db.execute(
+            update(WorkOrder.__table__)
+            .where(WorkOrder.id.in_(ids))
+            .values(**targets)
+            .returning(WorkOrder.id, WorkOrder.work_status, WorkOrder.payment_status)
+        ).all()
+
+    deltas = Counter((row.work_status, row.payment_status) for row in rows)
+    deltas.subtract(before[row.id] for row in rows)
+    apply_counter_deltas(db, {key: delta for key, delta in deltas.items() if delta})
+    db.commit()
+
+    return rows
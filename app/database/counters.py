@@ -0,0 +1,173 @@
+"""
+Work order status counters.
+Keeps work_order_counters in step with work_orders inside each flush, and
+recounts it from scratch to repair drift.
+
+Usage:
+    python -m app.database.counters          # report drift
+    python -m app.database.counters --fix    # report and rewrite the counters
+"""
+from collections import Counter
+import argparse
+import sys
+
+from sqlalchemy import delete, event, func, insert, inspect, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.work_order import WorkOrder, WorkStatus, PaymentStatus
+from app.models.work_order_counter import WorkOrderCounter
+
+counters = WorkOrderCounter.__table__
+
+UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+# ============================================
+# DELTAS
+# ============================================
+def _key(work_status, payment_status) -> tuple:
+    """Normalize a status pair; unset values fall back to the column defaults."""
+    return (
+        WorkStatus(work_status or WorkStatus.PENDING),
+        PaymentStatus(payment_status or PaymentStatus.NOT_PAID),
+    )
+
+
+def _committed_key(work_order: WorkOrder) -> tuple:
+    """Status pair of a work order as currently stored in the database."""
+    state = inspect(work_order)
+    values = []
+    for name in ("work_status", "payment_status"):
+        history = state.attrs[name].load_history()
+        values.append(history.deleted[0] if history.deleted else getattr(work_order, name))
+    return _key(*values)
+
+
+def collect_counter_deltas(session: Session) -> dict:
+    """Net counter change of the pending work-order inserts, updates and deletes."""
+    deltas = Counter()
+
+    for obj in session.new:
+        if isinstance(obj, WorkOrder):
+            deltas[_key(obj.work_status, obj.payment_status)] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, WorkOrder):
+            deltas[_committed_key(obj)] -= 1
+
+    for obj in session.dirty:
+        if isinstance(obj, WorkOrder) and session.is_modified(obj):
+            before, after = _committed_key(obj), _key(obj.work_status, obj.payment_status)
+            if before != after:
+                deltas[before] -= 1
+                deltas[after] += 1
+
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def apply_counter_deltas(session: Session, deltas: dict) -> None:
+    """
+    Add deltas ({(work_status, payment_status): n}) to the counters in the
+    session's transaction. Rows are touched in a fixed order so concurrent
+    writers cannot deadlock on them.
+    """
+    if not deltas:
+        return
+
+    rows = [
+        {"work_status": work_status, "payment_status": payment_status, "count": delta}
+        for (work_status, payment_status), delta in sorted(deltas.items())
+    ]
+    upsert = UPSERT_DIALECTS.get(session.connection().dialect.name)
+
+    if upsert is not None:
+        statement = upsert(counters).values(rows)
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[counters.c.work_status, counters.c.payment_status],
+            set_={"count": counters.c["count"] + statement.excluded["count"]},
+        ))
+        return
+
+    for row in rows:
+        result = session.execute(
+            update(counters)
+            .where(counters.c.work_status == row["work_status"], counters.c.payment_status == row["payment_status"])
+            .values(count=counters.c["count"] + row["count"])
+        )
+        if result.rowcount == 0:
+            session.execute(insert(counters).values(row))
+
+
+@event.listens_for(Session, "before_flush")
+def _update_counters_on_flush(session, flush_context, instances):
+    apply_counter_deltas(session, collect_counter_deltas(session))
+
+
+# ============================================
+# RECONCILIATION
+# ============================================
+def reconcile_counters(session: Session, fix: bool = False) -> dict:
+    """
+    Recount work orders per status pair and compare with the counters table.
+
+    Returns {(work_status, payment_status): (stored, actual)} for every pair
+    that drifted. With fix, the counters are rewritten from the recount and
+    committed; on PostgreSQL work-order writes wait until then.
+    """
+    if fix and session.connection().dialect.name == "postgresql":
+        session.execute(text("LOCK TABLE work_orders IN SHARE MODE"))
+
+    stored = {
+        (work_status, payment_status): count
+        for work_status, payment_status, count in session.execute(
+            select(counters.c.work_status, counters.c.payment_status, counters.c["count"])
+        )
+    }
+    actual = {
+        (work_status, payment_status): count
+        for work_status, payment_status, count in session.execute(
+            select(WorkOrder.work_status, WorkOrder.payment_status, func.count(WorkOrder.id))
+            .group_by(WorkOrder.work_status, WorkOrder.payment_status)
+        )
+    }
+
+    drift = {
+        key: (stored.get(key, 0), actual.get(key, 0))
+        for key in sorted(stored.keys() | actual.keys())
+        if stored.get(key, 0) != actual.get(key, 0)
+    }
+
+    if fix and drift:
+        session.execute(delete(counters))
+        session.execute(insert(counters), [
+            {"work_status": work_status, "payment_status": payment_status, "count": count}
+            for (work_status, payment_status), count in sorted(actual.items())
+        ])
+    session.commit()
+
+    return drift
+
+
+def main():
+    from app.database.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fix", action="store_true", help="rewrite the counters from the recount")
+    args = parser.parse_args()
+
+    with SessionLocal() as session:
+        drift = reconcile_counters(session, fix=args.fix)
+
+    if not drift:
+        print("work order counters match")
+        return 0
+
+    for (work_status, payment_status), (stored, actual) in drift.items():
+        print(f"{work_status.value}/{payment_status.value}: stored={stored} actual={actual} drift={stored - actual:+d}")
+    print("counters rewritten" if args.fix else "run with --fix to rewrite the counters")
+    return 0 if args.fix else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,171 @@
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 import os
 from app.models.base import Base
+from app.database.pool import TimedQueuePool
+from app.database import counters, lookup, search  # noqa: F401  (register the counter, lookup and search index hooks)
+from app.database.routing import RoutingSession, use_replica
+from app.database.sqlite import SQLITE_SINGLE_WRITER, configure_sqlite, is_sqlite_file
 from dotenv import load_dotenv
 
 load_dotenv()
 DB_URL = os.getenv("DB_URL", "sqlite:///./test.db")
 
-# Connection to DB
-engine = create_engine(DB_URL, future=True)
+# Optional read replica for the reads of GET requests
+DB_READ_URL = os.getenv("DB_READ_URL") or None
+
+# Connection pool settings
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# Serve the CRUD routes from async handlers on an AsyncSession
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() in ("1", "true", "yes")
+
+# Async drivers used for each backend
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def build_engine(url: str, sqlite_profile: str = None, **pool_options):
+    """
+    Create an engine with the configured, instrumented connection pool.
+    pool_options override the DB_POOL_* settings (e.g. pool_size=1).
+    """
+    options = {"future": True, "pool_pre_ping": DB_POOL_PRE_PING}
+
+    # In-memory SQLite keeps SQLAlchemy's default single-connection pool
+    if make_url(url).get_backend_name() != "sqlite" or is_sqlite_file(url):
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+        options.update(pool_options)
+
+    new_engine = create_engine(url, **options)
+    configure_sqlite(new_engine, sqlite_profile)
+    return new_engine
+
+
+def to_async_url(url: str):
+    """Translate a sync database URL to its asyncpg/aiosqlite equivalent."""
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS[parsed.get_backend_name()])
+
+
+def build_async_engine(url: str, sqlite_profile: str = None, **pool_options):
+    """Create an AsyncEngine with the same pool settings as build_engine."""
+    # Imported here so the sync stack works without the async drivers installed
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    async_url = to_async_url(url)
+    options = {"pool_pre_ping": DB_POOL_PRE_PING}
+
+    if async_url.get_backend_name() != "sqlite" or async_url.database not in (None, "", ":memory:"):
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+        options.update(pool_options)
+
+    async_engine = create_async_engine(async_url, **options)
+    configure_sqlite(async_engine.sync_engine, sqlite_profile)
+    return async_engine
+
+
+# A single connection owns every SQLite write; readers keep the normal pool
+USE_SINGLE_WRITER = SQLITE_SINGLE_WRITER and not DB_READ_URL and is_sqlite_file(DB_URL)
+SINGLE_WRITER_POOL = {"pool_size": 1, "max_overflow": 0}
+
+# Connection to the primary DB, and to the replica or SQLite writer when configured
+engine = build_engine(DB_URL)
+read_engine = build_engine(DB_READ_URL) if DB_READ_URL else None
+writer_engine = build_engine(DB_URL, **SINGLE_WRITER_POOL) if USE_SINGLE_WRITER else None
 
 # Creates local sessions
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+SessionLocal = sessionmaker(
+    bind=engine,
+    class_=RoutingSession,
+    primary=writer_engine or engine,
+    replica=engine if writer_engine else read_engine,
+    replica_lag_free=writer_engine is not None,
+    autoflush=False,
+    autocommit=False,
+    future=True,
+)
+
+# Live pool occupancy and wait times
+def get_pool_stats(target=None) -> dict:
+    pool = (target or engine).pool
+    if hasattr(pool, "stats"):
+        return pool.stats()
+    return {"status": pool.status()}
 
-# Creates the session and ends it
-def get_db():
+# Creates the session and ends it (GET requests read from the replica)
+def get_db(request: Request = None):
     db = SessionLocal()
+    db.info["replica"] = db.replica_lag_free or use_replica(request)
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Async engines and sessions, created on first use
+_async_engine = None
+_async_read_engine = None
+_async_writer_engine = None
+_AsyncSessionLocal = None
+
+def get_async_sessionmaker():
+    global _async_engine, _async_read_engine, _async_writer_engine, _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_engine = build_async_engine(DB_URL)
+        _async_read_engine = build_async_engine(DB_READ_URL) if DB_READ_URL else None
+        _async_writer_engine = build_async_engine(DB_URL, **SINGLE_WRITER_POOL) if USE_SINGLE_WRITER else None
+
+        if _async_writer_engine is not None:
+            primary, replica = _async_writer_engine, _async_engine
+        else:
+            primary, replica = _async_engine, _async_read_engine
+
+        _AsyncSessionLocal = async_sessionmaker(
+            bind=_async_engine,
+            sync_session_class=RoutingSession,
+            primary=primary.sync_engine,
+            replica=replica.sync_engine if replica else None,
+            replica_lag_free=USE_SINGLE_WRITER,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _AsyncSessionLocal
+
+# Creates the async session and ends it (GET requests read from the replica)
+async def get_async_db(request: Request = None):
+    async with get_async_sessionmaker()() as db:
+        db.info["replica"] = db.sync_session.replica_lag_free or use_replica(request)
+        yield db
+
+# Disposes the async pools on shutdown
+async def dispose_async_engine():
+    global _async_engine, _async_read_engine, _async_writer_engine, _AsyncSessionLocal
+    for async_engine in (_async_engine, _async_read_engine, _async_writer_engine):
+        if async_engine is not None:
+            await async_engine.dispose()
+    _async_engine = None
+    _async_read_engine = None
+    _async_writer_engine = None
+    _AsyncSessionLocal = None
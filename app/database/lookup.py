@@ -0,0 +1,153 @@
+"""
+Typeahead lookups of vehicles by plate and clients by name.
+Answers prefix queries from the database indexes or, when LOOKUP_MEMORY_INDEX
+is on, from in-process sorted arrays that committed writes keep current and a
+background thread reloads every LOOKUP_INDEX_MAX_AGE_SECONDS.
+"""
+import os
+
+from dotenv import load_dotenv
+from sqlalchemy import Connection, event, select
+from sqlalchemy.orm import Session
+
+from app.models.client import Client
+from app.models.vehicle import Vehicle
+from app.utils.lookup import SortedPrefixIndex, normalize_name, prefix_condition
+
+load_dotenv()
+
+# Serve lookups from memory (reloaded in the background after LOOKUP_INDEX_MAX_AGE_SECONDS)
+LOOKUP_MEMORY_INDEX = os.getenv("LOOKUP_MEMORY_INDEX", "false").lower() in ("1", "true", "yes")
+LOOKUP_INDEX_MAX_AGE_SECONDS = float(os.getenv("LOOKUP_INDEX_MAX_AGE_SECONDS", "300"))
+
+VEHICLE_LOOKUP_COLUMNS = (Vehicle.id, Vehicle.plate_number, Vehicle.brand_model, Vehicle.owner_id)
+CLIENT_LOOKUP_COLUMNS = (Client.id, Client.name, Client.phone_number)
+
+vehicle_index = SortedPrefixIndex(max_age=LOOKUP_INDEX_MAX_AGE_SECONDS)
+client_index = SortedPrefixIndex(max_age=LOOKUP_INDEX_MAX_AGE_SECONDS)
+
+
+def _payload(row, columns) -> dict:
+    return {column.key: getattr(row, column.key) for column in columns}
+
+
+def _vehicle_rows(db: Session) -> list:
+    rows = db.execute(select(*VEHICLE_LOOKUP_COLUMNS))
+    return [(row.plate_number, row.id, _payload(row, VEHICLE_LOOKUP_COLUMNS)) for row in rows]
+
+
+def _client_rows(db: Session) -> list:
+    rows = db.execute(select(Client.name_normalized, *CLIENT_LOOKUP_COLUMNS))
+    return [(row.name_normalized, row.id, _payload(row, CLIENT_LOOKUP_COLUMNS)) for row in rows]
+
+
+def _ensure_loaded(index, db: Session, read_rows) -> None:
+    """
+    Load the index from db on first use. Once loaded, a stale index keeps
+    answering while a thread reloads it through a session of its own (on the
+    sync engine under DB_ASYNC, whose driver only runs on the event loop).
+    """
+    if not index.loaded:
+        index.load(read_rows(db))
+    elif index.stale:
+        # Bind of a read, so a routed session neither pins itself nor skips its replica
+        bind = db.get_bind(clause=select(Client.id))
+        if isinstance(bind, Connection):
+            bind = bind.engine
+        if bind.dialect.is_async:
+            from app.database.database import engine, read_engine
+            bind = read_engine or engine
+
+        def refresh():
+            with Session(bind=bind) as session:
+                return read_rows(session)
+
+        index.refresh_in_background(refresh)
+
+
+# ============================================
+# LOOKUPS
+# ============================================
+def lookup_vehicles(db: Session, prefix: str, limit: int) -> list:
+    """Vehicles whose plate starts with prefix (case-insensitive), by plate."""
+    prefix = prefix.strip().upper()
+
+    if LOOKUP_MEMORY_INDEX:
+        _ensure_loaded(vehicle_index, db, _vehicle_rows)
+        return vehicle_index.lookup(prefix, limit)
+
+    query = (
+        select(*VEHICLE_LOOKUP_COLUMNS)
+        .where(prefix_condition(Vehicle.plate_number, prefix, db.bind.dialect.name))
+        .order_by(Vehicle.plate_number)
+        .limit(limit)
+    )
+    return [_payload(row, VEHICLE_LOOKUP_COLUMNS) for row in db.execute(query)]
+
+
+def lookup_clients(db: Session, prefix: str, limit: int) -> list:
+    """Clients whose name starts with prefix, ignoring case and accents, by name."""
+    prefix = normalize_name(prefix)
+
+    if LOOKUP_MEMORY_INDEX:
+        _ensure_loaded(client_index, db, _client_rows)
+        return client_index.lookup(prefix, limit)
+
+    query = (
+        select(*CLIENT_LOOKUP_COLUMNS)
+        .where(prefix_condition(Client.name_normalized, prefix, db.bind.dialect.name))
+        .order_by(Client.name_normalized, Client.id)
+        .limit(limit)
+    )
+    return [_payload(row, CLIENT_LOOKUP_COLUMNS) for row in db.execute(query)]
+
+
+# ============================================
+# MEMORY INDEX MAINTENANCE
+# ============================================
+def _entry(model, obj) -> tuple:
+    """(index, key, id, payload) of a vehicle or client object or row."""
+    if model is Vehicle:
+        return vehicle_index, obj.plate_number, obj.id, _payload(obj, VEHICLE_LOOKUP_COLUMNS)
+    return client_index, obj.name_normalized, obj.id, _payload(obj, CLIENT_LOOKUP_COLUMNS)
+
+
+def track_inserted_rows(session: Session, model, rows) -> None:
+    """
+    Queue the memory-index entries of vehicle or client rows inserted without
+    the ORM (the flush hook never sees them); applied when the session commits.
+    """
+    if LOOKUP_MEMORY_INDEX:
+        session.info.setdefault("lookup_changes", []).extend(_entry(model, row) for row in rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_lookup_changes(session, flush_context):
+    if not LOOKUP_MEMORY_INDEX:
+        return
+
+    changes = session.info.setdefault("lookup_changes", [])
+    for obj in session.new | session.dirty:
+        if isinstance(obj, Vehicle):
+            changes.append(_entry(Vehicle, obj))
+        elif isinstance(obj, Client):
+            changes.append(_entry(Client, obj))
+    for obj in session.deleted:
+        if isinstance(obj, Vehicle):
+            changes.append((vehicle_index, None, obj.id, None))
+        elif isinstance(obj, Client):
+            changes.append((client_index, None, obj.id, None))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_lookup_changes(session):
+    for index, key, row_id, payload in session.info.pop("lookup_changes", ()):
+        if payload is None:
+            index.discard(row_id)
+        else:
+            index.put(key, row_id, payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_lookup_changes(session):
+    session.info.pop("lookup_changes", None)
@@ -0,0 +1,51 @@
+"""
+Connection pool instrumentation.
+QueuePool subclass that records how long requests wait for a connection.
+"""
+from threading import Lock
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that tracks checkout wait times and timeouts."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def stats(self) -> dict:
+        """Return live pool occupancy and checkout wait counters."""
+        with self._stats_lock:
+            checkouts = self.checkouts
+            return {
+                "pool_size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": self.overflow(),
+                "checkouts": checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_seconds_total / checkouts * 1000, 3) if checkouts else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
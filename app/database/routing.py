@@ -0,0 +1,110 @@
+"""
+Read-replica routing.
+Session subclass that sends SELECTs to a replica engine and everything else
+(flushes, DML, reads after a write) to the primary. Also used for SQLite's
+single-writer mode, where the "replica" is the read pool on the same file.
+"""
+from typing import Optional
+import os
+
+from dotenv import load_dotenv
+from fastapi import Request
+from sqlalchemy.orm import Session
+
+from app.utils.cache import TTLCache
+
+# Load environment variables
+load_dotenv()
+
+# How long a client keeps reading from the primary after one of its writes
+READ_AFTER_WRITE_SECONDS = float(os.getenv("READ_AFTER_WRITE_SECONDS", "5"))
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Clients (by credentials, else address) that wrote recently
+recent_writers = TTLCache(max_size=10_000, ttl=READ_AFTER_WRITE_SECONDS)
+
+
+# ============================================
+# ROUTING SESSION
+# ============================================
+class RoutingSession(Session):
+    """
+    Session bound to a primary and an optional replica engine.
+
+    Only sessions flagged with info["replica"] read from the replica, and only
+    for SELECT statements. The first flush or DML statement pins the session
+    to the primary so it reads its own writes; a replica that is never behind
+    (another pool on the same SQLite file) releases the pin on commit.
+    """
+
+    def __init__(self, *args, primary=None, replica=None, replica_lag_free=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replica = replica
+        self.replica_lag_free = replica_lag_free
+        self._pinned = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.replica is None or self.primary is None:
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+        if self._flushing or not getattr(clause, "is_select", False):
+            self._pinned = True
+        elif self.info.get("replica") and not self._pinned:
+            return self.replica
+        return self.primary
+
+    def pin_to_primary(self) -> None:
+        """Send the following reads to the primary, in the transaction of the writes."""
+        self._pinned = True
+
+    def commit(self):
+        super().commit()
+        if self.replica_lag_free:
+            self._pinned = False
+
+    def rollback(self):
+        super().rollback()
+        if self.replica_lag_free:
+            self._pinned = False
+
+
+def pin_primary(session) -> None:
+    """
+    Pin a (possibly async) session to the primary before reads that a write
+    depends on, such as SELECT ... FOR UPDATE; no-op for a plain Session.
+    """
+    session = getattr(session, "sync_session", session)
+    if isinstance(session, RoutingSession):
+        session.pin_to_primary()
+
+
+# ============================================
+# REQUEST CLASSIFICATION
+# ============================================
+def _client_key(request: Request) -> Optional[str]:
+    """Identify the caller by its credentials, falling back to its address."""
+    authorization = request.headers.get("authorization")
+    if authorization:
+        return authorization
+    return request.client.host if request.client else None
+
+
+def use_replica(request: Optional[Request]) -> bool:
+    """
+    Decide whether a request may read from the replica.
+
+    Unsafe methods are recorded so that the same client keeps reading from the
+    primary for READ_AFTER_WRITE_SECONDS, hiding replication lag from it.
+    """
+    if request is None:
+        return False
+
+    key = _client_key(request)
+    if request.method not in SAFE_METHODS:
+        if key is not None:
+            recent_writers.set(key, True)
+        return False
+
+    return key is None or recent_writers.get(key) is None
@@ -0,0 +1,180 @@
+"""
+Work order full-text search.
+Keeps the work_order_search index in step with work orders, clients and
+vehicles inside each flush, answers ranked queries, and rebuilds the index.
+
+Usage:
+    python -m app.database.search    # rebuild the index from the tables
+"""
+import re
+import sys
+from typing import Optional
+
+from sqlalchemy import delete, event, func, inspect, literal_column, or_, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.models.client import Client
+from app.models.vehicle import Vehicle
+from app.models.work_order import WorkOrder
+from app.models.work_order_search import fts_work_order_search, pg_work_order_search
+
+SEARCH_CONFIG = "simple"
+
+# Indexed fields of a work order, in FTS5 column order
+SEARCH_COLUMNS = {
+    "details": WorkOrder.details,
+    "spare_parts": WorkOrder.spare_parts,
+    "workers": WorkOrder.workers,
+    "client_name": Client.name,
+    "plate_number": Vehicle.plate_number,
+}
+
+# Edits to these attributes change what a work order is found by
+WORK_ORDER_TEXT = ("details", "spare_parts", "workers", "client_id", "vehicle_id")
+
+# bm25 weights of the FTS5 columns, and tsvector weights of the same fields
+FTS_WEIGHTS = (1.0, 1.0, 0.5, 2.0, 3.0)
+TSVECTOR_WEIGHTS = {"details": "B", "spare_parts": "B", "workers": "C", "client_name": "A", "plate_number": "A"}
+
+
+def _indexed_rows(columns, *conditions):
+    """Select id and columns of the work orders matching conditions, joined with client and vehicle."""
+    return (
+        select(WorkOrder.id, *columns)
+        .join(Client, Client.id == WorkOrder.client_id)
+        .join(Vehicle, Vehicle.id == WorkOrder.vehicle_id)
+        .where(*conditions)
+    )
+
+
+def _document():
+    """Weighted tsvector of the indexed fields."""
+    vectors = [
+        func.setweight(
+            func.to_tsvector(SEARCH_CONFIG, func.coalesce(column, "")),
+            literal_column(f"'{TSVECTOR_WEIGHTS[name]}'"),  # untyped, setweight takes a "char"
+        )
+        for name, column in SEARCH_COLUMNS.items()
+    ]
+    document = vectors[0]
+    for vector in vectors[1:]:
+        document = document.op("||")(vector)
+    return document
+
+
+# ============================================
+# INDEX MAINTENANCE
+# ============================================
+def reindex_work_orders(session: Session, *conditions) -> None:
+    """
+    Rewrite the index entries of the work orders matching conditions (every
+    work order when none are given) in the session's transaction.
+    """
+    dialect = session.connection().dialect.name
+
+    if dialect == "sqlite":
+        stale = fts_work_order_search.c.rowid.in_(select(WorkOrder.id).where(*conditions))
+        session.execute(delete(fts_work_order_search).where(stale) if conditions else delete(fts_work_order_search))
+        session.execute(fts_work_order_search.insert().from_select(
+            list(fts_work_order_search.c), _indexed_rows(SEARCH_COLUMNS.values(), *conditions)
+        ))
+
+    elif dialect == "postgresql":
+        statement = postgresql.insert(pg_work_order_search).from_select(
+            ["work_order_id", "document"], _indexed_rows([_document()], *conditions)
+        )
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[pg_work_order_search.c.work_order_id],
+            set_={"document": statement.excluded.document},
+        ))
+
+
+def remove_from_search_index(session: Session, work_order_ids) -> None:
+    """Drop the index entries of deleted work orders (PostgreSQL drops them by ON DELETE CASCADE)."""
+    if session.connection().dialect.name == "sqlite":
+        session.execute(delete(fts_work_order_search).where(fts_work_order_search.c.rowid.in_(work_order_ids)))
+
+
+def _changed(obj, names) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in names)
+
+
+@event.listens_for(Session, "after_flush")
+def _reindex_on_flush(session, flush_context):
+    work_order_ids, removed_ids, client_ids, vehicle_ids = set(), set(), set(), set()
+
+    for obj in session.new:
+        if isinstance(obj, WorkOrder):
+            work_order_ids.add(obj.id)
+
+    for obj in session.dirty:
+        if isinstance(obj, WorkOrder) and _changed(obj, WORK_ORDER_TEXT):
+            work_order_ids.add(obj.id)
+        elif isinstance(obj, Client) and _changed(obj, ("name",)):
+            client_ids.add(obj.id)
+        elif isinstance(obj, Vehicle) and _changed(obj, ("plate_number",)):
+            vehicle_ids.add(obj.id)
+
+    for obj in session.deleted:
+        if isinstance(obj, WorkOrder):
+            removed_ids.add(obj.id)
+
+    if removed_ids:
+        remove_from_search_index(session, sorted(removed_ids))
+
+    conditions = [
+        column.in_(sorted(ids))
+        for column, ids in ((WorkOrder.id, work_order_ids), (WorkOrder.client_id, client_ids), (WorkOrder.vehicle_id, vehicle_ids))
+        if ids
+    ]
+    if conditions:
+        reindex_work_orders(session, or_(*conditions))
+
+
+def rebuild_search_index(session: Session) -> int:
+    """Recreate every index entry from the tables and commit. Returns the number of work orders."""
+    reindex_work_orders(session)
+    session.commit()
+    return session.scalar(select(func.count(WorkOrder.id)))
+
+
+# ============================================
+# QUERIES
+# ============================================
+def search_terms(q: str) -> list:
+    """Split a search box string into lowercase word prefixes."""
+    return re.findall(r"\w+", q.lower())
+
+
+def _match(terms: list, dialect: str) -> tuple:
+    """(match condition, index key column, score: lower is better) of terms on dialect's index."""
+    if dialect == "sqlite":
+        matches = literal_column("work_order_search").op("MATCH")(" AND ".join(f'"{term}"*' for term in terms))
+        return matches, fts_work_order_search.c.rowid, func.bm25(literal_column("work_order_search"), *FTS_WEIGHTS)
+
+    if dialect == "postgresql":
+        tsquery = func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{term}:*" for term in terms))
+        matches = pg_work_order_search.c.document.op("@@")(tsquery)
+        return matches, pg_work_order_search.c.work_order_id, -func.ts_rank(pg_work_order_search.c.document, tsquery)
+
+    raise ValueError(f"Full-text search is not available on {dialect}")
+
+
+def search_work_orders(query, terms: list, dialect: str, limit: Optional[int] = None):
+    """
+    Restrict a Query or select() over work orders to the limit best of those
+    containing every term as a word prefix, best matches first. Every match
+    is ranked in the database (bm25 / ts_rank) on the index table alone, and
+    only the best limit are joined to work_orders.
+    """
+    matches, key, score = _match(terms, dialect)
+    best = (
+        select(key.label("id"), score.label("score"))
+        .where(matches)
+        .order_by(score, key.desc())
+        .limit(limit)
+        .subquery()
+    )
+    return query.join(best, best.c.id == WorkOrder.id).order_by(best.c.score, WorkOrder.id.desc())
@@ -0,0 +1,60 @@
+"""
+SQLite connection profile.
+Applies WAL journaling and tuned pragmas to every new SQLite connection so
+readers no longer block behind writers on single-server deployments.
+"""
+import os
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Load environment variables
+load_dotenv()
+
+# "tuned" applies the pragmas below; "default" leaves SQLite's own settings
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "tuned").lower()
+
+# Funnel all writes through one dedicated connection; reads use the normal pool
+SQLITE_SINGLE_WRITER = os.getenv("SQLITE_SINGLE_WRITER", "true").lower() in ("1", "true", "yes")
+
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    # Negative values are KiB: 64 MiB of page cache per connection
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "temp_store": "MEMORY",
+}
+
+
+def is_sqlite_file(url) -> bool:
+    """Return True for a file-backed (not in-memory) SQLite URL."""
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None) -> None:
+    """Engine "connect" listener setting SQLITE_PRAGMAS on a new connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def configure_sqlite(engine, profile: str = None) -> None:
+    """
+    Install the connection profile on a SQLite engine.
+
+    Args:
+        engine: Sync Engine (use AsyncEngine.sync_engine for async engines)
+        profile: "tuned" or "default"; defaults to SQLITE_PROFILE
+    """
+    # In-memory databases cannot use WAL and have no file to map
+    if (profile or SQLITE_PROFILE) != "tuned" or not is_sqlite_file(engine.url):
+        return
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+
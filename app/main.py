@@ -1,23 +1,22 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-import os
+from sqlalchemy import text
 
-from app.routes import auth_router, clients_router, user_router, vehicle_router, work_order_router
+from app.database.database import engine, get_pool_stats, DB_ASYNC, dispose_async_engine
+from app.routes import auth_router, clients_router, user_router, vehicle_router, work_order_router, search_router, system_router
+from app.utils.auth import configure_password_hashing
 
-# Load environment variables
-load_dotenv()
-
-DB_URL = os.getenv("DB_URL")
-
-# SQLAlchemy setup
-engine = create_engine(DB_URL)
-SessionLocal = sessionmaker(autocommit = False, autoflush= False, bind=engine)
+# Startup and shutdown tasks
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Tune the bcrypt cost to this machine before serving logins
+    configure_password_hashing()
+    yield
+    await dispose_async_engine()
 
 # Starting the APP
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # CORS configuration
 app.add_middleware(
@@ -28,18 +27,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Router functionalities
+# Router functionalities (the async variants on an AsyncSession with DB_ASYNC)
+if DB_ASYNC:
+    from app.routes.aio import (
+        async_auth_router as auth_router,
+        async_clients_router as clients_router,
+        async_user_router as user_router,
+        async_vehicle_router as vehicle_router,
+        async_work_order_router as work_order_router,
+        async_search_router as search_router,
+        async_system_router as system_router,
+    )
+
 app.include_router(auth_router)
 app.include_router(clients_router)
 app.include_router(user_router)
 app.include_router(vehicle_router)
 app.include_router(work_order_router)
+app.include_router(search_router)
+app.include_router(system_router)
 
 @app.get("/test-db")
 def test_db():
     try:
         with engine.connect() as conn:
             result = conn.execute(text("SELECT 1"))
-            return {"db_status": "connected", "result": [row[0] for row in result]}
+            return {
+                "db_status": "connected",
+                "result": [row[0] for row in result],
+                "pool": get_pool_stats(engine),
+            }
     except Exception as e:
           return {"db_status": "error", "error": str(e)}
@@ -3,6 +3,9 @@ from app.models.user import User, UserRole
 from app.models.client import Client
 from app.models.vehicle import Vehicle
 from app.models.work_order import WorkOrder, WorkStatus, PaymentStatus
+from app.models.work_order_counter import WorkOrderCounter
+from app.models import work_order_search  # noqa: F401  (search index DDL)
+from app.models.revoked_token import RevokedToken
 
 # Export all models and enums
 __all__ = [
@@ -14,4 +17,6 @@ __all__ = [
     "WorkOrder",
     "WorkStatus",
     "PaymentStatus",
+    "WorkOrderCounter",
+    "RevokedToken",
 ]
@@ -1,11 +1,26 @@
 from app.models.base import Base
-from sqlalchemy import Column, Integer, String
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Index
+from sqlalchemy.orm import relationship, validates
+from app.utils.lookup import normalize_name
+
+
+def _normalized_name(context):
+    # Default for inserts that bypass the ORM attribute (bulk Core inserts)
+    return normalize_name(context.get_current_parameters().get("name"))
 
 
 class Client(Base):
     __tablename__ = 'clients'
 
+    # Prefix lookups on the normalized name (LIKE 'prefix%' on Postgres)
+    __table_args__ = (
+        Index(
+            "ix_clients_name_normalized",
+            "name_normalized",
+            postgresql_ops={"name_normalized": "text_pattern_ops"},
+        ),
+    )
+
     # Primary key
     id = Column(Integer, primary_key=True, autoincrement=True)
 
@@ -14,10 +29,18 @@ class Client(Base):
     phone_number = Column(String(20), nullable=False)
     email = Column(String(50), nullable=True)
 
+    # Lowercase, accent-free copy of name for typeahead lookups
+    name_normalized = Column(String(100), nullable=False, default=_normalized_name)
+
     # Relationships
     vehicles = relationship("Vehicle", back_populates="owner", cascade="all, delete-orphan")
     work_orders = relationship("WorkOrder", back_populates="client", cascade="all, delete-orphan")
 
+    @validates("name")
+    def _normalize_name(self, key, value):
+        self.name_normalized = normalize_name(value)
+        return value
+
     def __repr__(self):
         """String representation of Clients"""
         return f"<Client(id='{self.id}', name='{self.name}', phone='{self.phone_number}', email='{self.email}')>"
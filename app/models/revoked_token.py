@@ -0,0 +1,22 @@
+"""
+Revoked token model.
+Stores the jti of refresh tokens invalidated by logout or rotation until they expire.
+"""
+from sqlalchemy import Column, String, DateTime
+from app.models.base import Base
+
+
+class RevokedToken(Base):
+
+    __tablename__ = "revoked_tokens"
+    
+    # Primary Key (JWT ID claim)
+    jti = Column(String(64), primary_key=True)
+    
+    # Revocation is only needed until the token expires on its own
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        """String representation of RevokedToken"""
+        return f"<RevokedToken(jti='{self.jti}', expires_at='{self.expires_at}')>"
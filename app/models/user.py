@@ -4,6 +4,7 @@ Includes role-based access control (admin/employee).
 """
 from sqlalchemy import Column, Integer, String, Enum
 import enum
+import secrets
 from app.models.base import Base
 
 
@@ -14,6 +15,15 @@ class UserRole(str, enum.Enum):
     EMPLOYEE = "EMPLOYEE"
 
 
+def new_token_version() -> int:
+    """
+    Random starting token version, so a user recreated under a deleted
+    user's name (and possibly id) does not accept that user's tokens.
+    30 bits leave room for the bumps within a 32-bit INTEGER.
+    """
+    return secrets.randbits(30)
+
+
 class User(Base):
 
     __tablename__ = "users"
@@ -32,6 +42,9 @@ class User(Base):
         default=UserRole.EMPLOYEE
     )
     
+    # Bumped whenever the role or password changes to invalidate issued tokens
+    token_version = Column(Integer, nullable=False, default=new_token_version, server_default="0")
+    
     def __repr__(self):
         """String representation of User"""
         return f"<User(id={self.id}, username='{self.username}', role='{self.role.value}')>"
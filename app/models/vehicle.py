@@ -2,7 +2,7 @@
 Vehicle model for tracking client vehicles.
 Each vehicle belongs to a client (owner).
 """
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
@@ -11,6 +11,16 @@ class Vehicle(Base):
     
     __tablename__ = "vehicles"
     
+    # The unique plate index cannot serve LIKE 'prefix%' under a Postgres
+    # locale collation; SQLite uses the unique index for prefix ranges
+    __table_args__ = (
+        Index(
+            "ix_vehicles_plate_number_pattern",
+            "plate_number",
+            postgresql_ops={"plate_number": "text_pattern_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+    
     # Primary Key
     id = Column(Integer, primary_key=True, autoincrement=True)
     
@@ -24,7 +34,8 @@ class Vehicle(Base):
     owner_id = Column(
         Integer,
         ForeignKey('clients.id', ondelete='CASCADE'),
-        nullable=False
+        nullable=False,
+        index=True
     )
     
     # Relationships
@@ -2,8 +2,8 @@
 Work Order model for tracking vehicle service and repair jobs.
 Includes work status, payment tracking, and service details.
 """
-from sqlalchemy import Column, Integer, String, Date, Boolean, Text, ForeignKey, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Date, Boolean, Text, ForeignKey, Enum, Index
+from sqlalchemy.orm import column_property, relationship
 import enum
 from app.models.base import Base
 
@@ -27,6 +27,16 @@ class PaymentStatus(str, enum.Enum):
 class WorkOrder(Base):
     __tablename__ = "work_orders"
     
+    # Indexes for foreign-key cascades, per-client/vehicle history and
+    # status filters; entry_date is the default listing order
+    __table_args__ = (
+        Index("ix_work_orders_client_id_entry_date", "client_id", "entry_date"),
+        Index("ix_work_orders_vehicle_id_entry_date", "vehicle_id", "entry_date"),
+        Index("ix_work_orders_entry_date_id", "entry_date", "id"),
+        Index("ix_work_orders_work_status_entry_date", "work_status", "entry_date"),
+        Index("ix_work_orders_payment_status_entry_date", "payment_status", "entry_date"),
+    )
+    
     # Primary Key
     id = Column(Integer, primary_key=True, autoincrement=True)
     
@@ -47,15 +57,22 @@ class WorkOrder(Base):
     )
     
     # Status Fields
-    work_status = Column(
-        Enum(WorkStatus, name="work_status"),
-        nullable=False,
-        default=WorkStatus.PENDING
+    # active_history keeps the previous value for the status counters
+    work_status = column_property(
+        Column(
+            Enum(WorkStatus, name="work_status"),
+            nullable=False,
+            default=WorkStatus.PENDING
+        ),
+        active_history=True
     )
-    payment_status = Column(
-        Enum(PaymentStatus, name="payment_status"),
-        nullable=False,
-        default=PaymentStatus.NOT_PAID
+    payment_status = column_property(
+        Column(
+            Enum(PaymentStatus, name="payment_status"),
+            nullable=False,
+            default=PaymentStatus.NOT_PAID
+        ),
+        active_history=True
     )
     
     # Service Details - Refrigerant and Oil
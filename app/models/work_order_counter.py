@@ -0,0 +1,23 @@
+"""
+Work order counter model.
+Number of work orders per (work_status, payment_status) pair, kept up to date
+by every flush that creates, changes or deletes work orders.
+"""
+from sqlalchemy import Column, Integer, Enum
+from app.models.base import Base
+from app.models.work_order import WorkStatus, PaymentStatus
+
+
+class WorkOrderCounter(Base):
+
+    __tablename__ = "work_order_counters"
+    
+    # Primary Key (status pair, same enum types as work_orders)
+    work_status = Column(Enum(WorkStatus, name="work_status"), primary_key=True)
+    payment_status = Column(Enum(PaymentStatus, name="payment_status"), primary_key=True)
+    
+    count = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        """String representation of WorkOrderCounter"""
+        return f"<WorkOrderCounter({self.work_status.value}/{self.payment_status.value}={self.count})>"
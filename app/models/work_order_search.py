@@ -0,0 +1,37 @@
+"""
+Work order search index.
+Full-text index over each work order's details, spare parts and workers plus
+its client name and plate number: an FTS5 virtual table on SQLite, a
+tsvector column with a GIN index on PostgreSQL. It has no mapped class; the
+DDL runs with Base.metadata.create_all() and the rows are written by
+app.database.search.
+"""
+from sqlalchemy import DDL, column, event, table
+from app.models.base import Base
+
+
+# Indexed text columns, in FTS5 column order
+SEARCH_FIELDS = ("details", "spare_parts", "workers", "client_name", "plate_number")
+
+# Lightweight table constructs for each backend
+fts_work_order_search = table("work_order_search", column("rowid"), *(column(name) for name in SEARCH_FIELDS))
+pg_work_order_search = table("work_order_search", column("work_order_id"), column("document"))
+
+
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS work_order_search USING fts5("
+    + ", ".join(SEARCH_FIELDS)
+    + ", tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+)
+
+POSTGRESQL_DDL = (
+    "CREATE TABLE IF NOT EXISTS work_order_search ("
+    "work_order_id INTEGER PRIMARY KEY REFERENCES work_orders (id) ON DELETE CASCADE, "
+    "document TSVECTOR NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_work_order_search_document ON work_order_search USING GIN (document)",
+)
+
+event.listen(Base.metadata, "after_create", DDL(SQLITE_DDL).execute_if(dialect="sqlite"))
+for statement in POSTGRESQL_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+event.listen(Base.metadata, "before_drop", DDL("DROP TABLE IF EXISTS work_order_search"))
@@ -5,3 +5,5 @@ from .client import router as clients_router
 from .user import router as user_router
 from .vehicle import router as vehicle_router
 from .work_orders import router as work_order_router
+from .search import router as search_router
+from .system import router as system_router
@@ -0,0 +1,12 @@
+# Async variants of the routers (enabled with DB_ASYNC=true)
+
+from app.routes import clients_router, vehicle_router, search_router, system_router
+from .adapter import async_router
+from .auth import router as async_auth_router
+from .user import router as async_user_router
+from .work_orders import router as async_work_order_router
+
+async_clients_router = async_router(clients_router)
+async_vehicle_router = async_router(vehicle_router)
+async_search_router = async_router(search_router)
+async_system_router = async_router(system_router)
@@ -0,0 +1,116 @@
+"""
+Async routers derived from the sync ones.
+
+Every route keeps its sync handler: the async endpoint hands it the sync
+Session behind the request's AsyncSession with run_sync, which drives the
+async driver from a greenlet on the event loop, so no threadpool thread and
+no connection from the sync pool is used. The auth dependencies are swapped
+for their AsyncSession versions.
+
+Handlers must not block outside their queries: the ones that hash passwords
+(async def handlers on a sync Session) or stream a response get an async
+endpoint of their own (endpoints=), built on the same helpers as the sync
+handler.
+"""
+import dataclasses
+import functools
+import inspect
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional
+
+from fastapi import APIRouter
+from fastapi.params import Depends
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.database import get_async_db, get_db
+from app.utils.auth import (
+    get_current_user,
+    get_current_user_async,
+    get_current_active_user,
+    get_current_active_user_async,
+    require_admin,
+    require_admin_async,
+    require_employee_or_admin,
+    require_employee_or_admin_async,
+)
+
+# Dependency of the sync handlers -> dependency of the derived endpoints
+ASYNC_DEPENDENCIES = {
+    get_db: get_async_db,
+    get_current_user: get_current_user_async,
+    get_current_active_user: get_current_active_user_async,
+    require_admin: require_admin_async,
+    require_employee_or_admin: require_employee_or_admin_async,
+}
+
+# APIRoute attributes carried over to the derived route
+ROUTE_OPTIONS = (
+    "response_model", "status_code", "tags", "summary", "description", "response_description",
+    "responses", "deprecated", "methods", "operation_id", "response_model_include",
+    "response_model_exclude", "response_model_by_alias", "response_model_exclude_unset",
+    "response_model_exclude_defaults", "response_model_exclude_none", "include_in_schema",
+    "response_class", "name", "openapi_extra",
+)
+
+
+def _async_depends(default):
+    if isinstance(default, Depends) and default.dependency in ASYNC_DEPENDENCIES:
+        return dataclasses.replace(default, dependency=ASYNC_DEPENDENCIES[default.dependency])
+    return default
+
+
+def async_endpoint(endpoint: Callable) -> Callable:
+    """
+    Wrap a sync handler: same parameters with the async dependencies, and
+    the handler run on the AsyncSession's sync Session (called directly when
+    it takes no session).
+    """
+    if inspect.iscoroutinefunction(endpoint):
+        raise TypeError(f"{endpoint.__qualname__} is async; pass its AsyncSession variant in endpoints=")
+    signature = inspect.signature(endpoint)
+    parameters = [
+        parameter.replace(default=_async_depends(parameter.default))
+        for parameter in signature.parameters.values()
+    ]
+    session_names = [
+        name for name, parameter in signature.parameters.items()
+        if isinstance(parameter.default, Depends) and parameter.default.dependency is get_db
+    ]
+
+    @functools.wraps(endpoint)
+    async def run(**kwargs):
+        if not session_names:
+            return endpoint(**kwargs)
+        db: AsyncSession = kwargs[session_names[0]]
+        return await db.run_sync(lambda session: endpoint(**{**kwargs, session_names[0]: session}))
+
+    run.__signature__ = signature.replace(parameters=parameters)
+    return run
+
+
+def async_router(router: APIRouter, endpoints: Optional[Dict[Callable, Callable]] = None) -> APIRouter:
+    """
+    Router with the routes of router, in the same order, served by
+    async_endpoint(handler) or by the async endpoint given for that handler.
+    """
+    endpoints = endpoints or {}
+    derived = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            derived.routes.append(route)
+            continue
+        endpoint = endpoints.get(route.endpoint) or async_endpoint(route.endpoint)
+        derived.add_api_route(
+            route.path,
+            endpoint,
+            dependencies=[_async_depends(dependency) for dependency in route.dependencies],
+            **{option: getattr(route, option) for option in ROUTE_OPTIONS},
+        )
+    return derived
+
+
+async def iterate_on(db: AsyncSession, iterator: Iterator) -> AsyncIterator:
+    """Read a sync iterator that fetches rows through db, one item per run_sync."""
+    done = object()
+    while (item := await db.run_sync(lambda session: next(iterator, done))) is not done:
+        yield item
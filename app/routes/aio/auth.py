@@ -0,0 +1,61 @@
+"""
+Async authentication routes: the sync routes, with login reading on the
+AsyncSession (the sync login awaits bcrypt but queries a sync Session).
+"""
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.auth import LoginRequest
+from app.database.database import get_async_db
+from app.routes.auth import (
+    router as sync_router,
+    login as sync_login,
+    find_user,
+    store_password_hash,
+    incorrect_credentials,
+    login_response,
+)
+from app.routes.aio.adapter import async_router
+from app.utils.auth import verify_password_async, hash_password_async, password_needs_rehash, check_login_rate, request_client_ip
+
+
+# ------------------------------------------------------------
+# LOGIN
+# ------------------------------------------------------------
+async def login(login_data: LoginRequest, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Authenticate user and return JWT tokens.
+    
+    Args:
+        login_data: Username and password
+        request: Incoming request (used for the client address)
+        db: Async database session
+        
+    Returns:
+        User information with access and refresh tokens
+        
+    Raises:
+        HTTPException: If credentials are invalid or too many attempts were made
+    """
+    # Reject excess attempts before any query or bcrypt work
+    check_login_rate(login_data.username, request_client_ip(request))
+    
+    user = await db.run_sync(find_user, login_data.username)
+    
+    if not user or not await verify_password_async(login_data.password, user.password):
+        raise incorrect_credentials()
+    
+    # Transparently upgrade hashes created with a different bcrypt cost
+    if password_needs_rehash(user.password):
+        try:
+            new_hash = await hash_password_async(login_data.password)
+        except HTTPException:
+            new_hash = None  # Hashing pool is busy; retry on a later login
+        
+        if new_hash:
+            await db.run_sync(store_password_hash, user.id, new_hash)
+    
+    return login_response(user)
+
+
+router = async_router(sync_router, {sync_login: login})
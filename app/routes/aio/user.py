@@ -0,0 +1,54 @@
+"""
+Async user routes: the sync routes, with create and update writing on the
+AsyncSession (the sync ones await bcrypt but write through a sync Session).
+"""
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User as UserModel
+from app.schemas.user import UserCreate, UserUpdate
+from app.database.database import get_async_db
+from app.routes.user import (
+    router as sync_router,
+    create_user as sync_create_user,
+    update_user as sync_update_user,
+    insert_user,
+    apply_user_update,
+)
+from app.routes.aio.adapter import async_router
+from app.utils.auth import hash_password_async, require_admin_async
+
+
+# ------------------------------------------------------------
+# CREATE USER (ADMIN ONLY)
+# ------------------------------------------------------------
+async def create_user(
+    user_data: UserCreate, 
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(require_admin_async)
+):
+    """Create a new user. Requires ADMIN role."""
+    hashed_password = await hash_password_async(user_data.password)
+
+    return await db.run_sync(insert_user, user_data, hashed_password)
+
+
+# ------------------------------------------------------------
+# UPDATE USER BY ID (ADMIN ONLY)
+# ------------------------------------------------------------
+async def update_user(
+    user_id: int, 
+    updates: UserUpdate, 
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(require_admin_async)
+):
+    """Update user by ID. Requires ADMIN role."""
+    data = updates.dict(exclude_unset = True)
+    
+    if 'password' in data and data['password'] is not None:
+        data['password'] = await hash_password_async(data['password'])
+    
+    return await db.run_sync(apply_user_update, user_id, data)
+
+
+router = async_router(sync_router, {sync_create_user: create_user, sync_update_user: update_user})
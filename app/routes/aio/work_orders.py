@@ -0,0 +1,48 @@
+"""
+Async work-order routes: the sync routes with an async export, whose chunks
+are fetched on the AsyncSession while the response streams.
+"""
+from typing import Literal
+
+from fastapi import Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.database import get_async_db
+from app.models.user import User as UserModel
+from app.routes.work_orders import (
+    router as sync_router,
+    export_work_orders as sync_export_work_orders,
+    EXPANDED_FIELDS,
+    WorkOrderFilters,
+    export_chunks,
+    export_response,
+)
+from app.routes.aio.adapter import async_router, iterate_on
+from app.utils.auth import require_employee_or_admin_async
+from app.utils.fields import SparseFields
+
+
+# ------------------------------------------------------------
+# EXPORT WORK ORDERS (CSV / NDJSON)
+# ------------------------------------------------------------
+async def export_work_orders(
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    filters: WorkOrderFilters = Depends(),
+    fields: SparseFields = Depends(EXPANDED_FIELDS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(require_employee_or_admin_async)
+):
+    """
+    Stream every work order matching the filters (e.g. date_from/date_to)
+    with its client and vehicle fields, ordered by id, as CSV or NDJSON.
+    Rows are read from a server-side cursor EXPORT_BATCH_SIZE at a time and
+    written as they arrive, so memory does not grow with the export size.
+    ?fields= picks the columns.
+    """
+    chunks = await db.run_sync(export_chunks, export_format, filters, fields)
+
+    # The session stays open until the response is sent
+    return export_response(iterate_on(db, chunks), export_format)
+
+
+router = async_router(sync_router, {sync_export_work_orders: export_work_orders})
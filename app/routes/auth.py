@@ -1,21 +1,30 @@
 """
 Authentication routes for login, logout, token refresh, and user info.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from datetime import timedelta
+from datetime import datetime, timedelta
+from typing import Optional
 
 from app.models.user import User as UserModel
-from app.schemas.auth import LoginRequest, LoginResponse, RefreshTokenRequest, Token, UserInfo
+from app.schemas.auth import LoginRequest, LoginResponse, LogoutRequest, RefreshTokenRequest, Token, UserInfo
 from app.database.database import get_db
 from app.utils.auth import (
-    verify_password,
+    verify_password_async,
+    hash_password_async,
+    password_needs_rehash,
     create_access_token,
     create_refresh_token,
     decode_token,
+    build_token_claims,
+    check_login_rate,
+    request_client_ip,
     get_current_active_user,
-    ACCESS_TOKEN_EXPIRE_MINUTES
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    AUTH_CLAIMS_ONLY
 )
+from app.utils.revocation import revocation_store
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -28,41 +37,85 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 # LOGIN
 # ------------------------------------------------------------
 @router.post("/login", response_model=LoginResponse)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, request: Request, db: Session = Depends(get_db)):
     """
     Authenticate user and return JWT tokens.
     
+    The queries run on the threadpool; bcrypt is awaited on the password
+    pool, so a login burst does not hold threadpool threads meanwhile.
+    
     Args:
         login_data: Username and password
+        request: Incoming request (used for the client address)
         db: Database session
         
     Returns:
         User information with access and refresh tokens
         
     Raises:
-        HTTPException: If credentials are invalid
+        HTTPException: If credentials are invalid or too many attempts were made
     """
-    # Find user by username
-    user = db.query(UserModel).filter(UserModel.username == login_data.username).first()
+    # Reject excess attempts before any query or bcrypt work
+    check_login_rate(login_data.username, request_client_ip(request))
+    
+    user = await run_in_threadpool(find_user, db, login_data.username)
     
     # Verify user exists and password is correct
-    if not user or not verify_password(login_data.password, user.password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    if not user or not await verify_password_async(login_data.password, user.password):
+        raise incorrect_credentials()
     
+    # Transparently upgrade hashes created with a different bcrypt cost
+    if password_needs_rehash(user.password):
+        try:
+            new_hash = await hash_password_async(login_data.password)
+        except HTTPException:
+            new_hash = None  # Hashing pool is busy; retry on a later login
+        
+        if new_hash:
+            await run_in_threadpool(store_password_hash, db, user.id, new_hash)
+    
+    return login_response(user)
+
+
+def find_user(db: Session, username: str) -> Optional[UserModel]:
+    """
+    Return the user with this username, if any, and close db so the
+    connection is back in the pool before the slow bcrypt check (in the same
+    call: no connection is held while waiting for a thread or for bcrypt).
+    """
+    try:
+        return db.query(UserModel).filter(UserModel.username == username).first()
+    finally:
+        db.close()
+
+
+def store_password_hash(db: Session, user_id: int, new_hash: str) -> None:
+    """Replace the stored password hash of a user (rehash on login)."""
+    db.query(UserModel).filter(UserModel.id == user_id).update({"password": new_hash})
+    db.commit()
+
+
+def incorrect_credentials() -> HTTPException:
+    """401 returned for an unknown username or a wrong password."""
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Incorrect username or password",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def login_response(user: UserModel) -> LoginResponse:
+    """User info with new access and refresh tokens for an authenticated user."""
     # Create access token with user info
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username, "role": user.role.value},
+        data=build_token_claims(user),
         expires_delta=access_token_expires
     )
     
     # Create refresh token
     refresh_token = create_refresh_token(
-        data={"sub": user.username}
+        data=build_token_claims(user)
     )
     
     # Return user info and tokens
@@ -101,6 +154,7 @@ def refresh_token(refresh_data: RefreshTokenRequest, db: Session = Depends(get_d
         payload = decode_token(refresh_data.refresh_token)
         username: str = payload.get("sub")
         token_type: str = payload.get("type")
+        jti: str = payload.get("jti")
         
         # Verify it's a refresh token
         if token_type != "refresh":
@@ -109,12 +163,19 @@ def refresh_token(refresh_data: RefreshTokenRequest, db: Session = Depends(get_d
                 detail="Invalid token type"
             )
         
-        if username is None:
+        if username is None or jti is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid token"
             )
         
+        # Reject tokens revoked by logout or already rotated
+        if revocation_store.is_revoked(db, jti):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked"
+            )
+        
         # Verify user still exists
         user = db.query(UserModel).filter(UserModel.username == username).first()
         if not user:
@@ -123,15 +184,30 @@ def refresh_token(refresh_data: RefreshTokenRequest, db: Session = Depends(get_d
                 detail="User not found"
             )
         
+        # Tokens issued before a role or password change, or to a deleted user
+        # with the same name, are no longer valid
+        if AUTH_CLAIMS_ONLY and (payload.get("uid") != user.id or payload.get("ver", 0) != user.token_version):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked"
+            )
+        
+        # Rotate: each refresh token can be exchanged only once
+        if not revocation_store.revoke(db, jti, datetime.utcfromtimestamp(payload["exp"])):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked"
+            )
+        
         # Create new tokens
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         new_access_token = create_access_token(
-            data={"sub": user.username, "role": user.role.value},
+            data=build_token_claims(user),
             expires_delta=access_token_expires
         )
         
         new_refresh_token = create_refresh_token(
-            data={"sub": user.username}
+            data=build_token_claims(user)
         )
         
         return Token(
@@ -174,19 +250,35 @@ def get_current_user_info(current_user: UserModel = Depends(get_current_active_u
 # LOGOUT
 # ------------------------------------------------------------
 @router.post("/logout")
-def logout(current_user: UserModel = Depends(get_current_active_user)):
+def logout(
+    logout_data: Optional[LogoutRequest] = None,
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
     """
-    Logout endpoint (client-side token removal).
+    Logout endpoint.
     
-    Since JWT is stateless, logout is handled client-side by removing the token.
-    This endpoint validates the token and confirms logout.
+    Revokes the given refresh token so it can no longer be exchanged for new
+    access tokens. The short-lived access token is removed client-side.
     
     Args:
+        logout_data: Optional refresh token to revoke
+        db: Database session
         current_user: Current authenticated user
         
     Returns:
         Success message
     """
+    if logout_data and logout_data.refresh_token:
+        payload = decode_token(logout_data.refresh_token)
+        
+        if (
+            payload.get("type") == "refresh"
+            and payload.get("sub") == current_user.username
+            and payload.get("jti")
+        ):
+            revocation_store.revoke(db, payload["jti"], datetime.utcfromtimestamp(payload["exp"]))
+    
     return {
         "message": "Successfully logged out",
         "detail": "Please remove the token from client storage"
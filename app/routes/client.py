@@ -1,16 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session, with_parent
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import Any, Dict, List, Optional, Union
 
 from app.models.client import Client as ClientModel
+from app.models.vehicle import Vehicle as VehicleModel
 from app.models.user import User as UserModel
-from app.schemas.client import ClientCreate, ClientUpdate, ClientRead
+from app.schemas.client import ClientCreate, ClientUpdate, ClientRead, ClientLookup
+from app.schemas.vehicle import VehicleResponse
+from app.schemas.pagination import Page
+from app.schemas.bulk import BulkResult
 from app.database.database import get_db
+from app.database.bulk import BULK_MAX_ITEMS, bulk_create_clients
+from app.database.lookup import lookup_clients
 from app.utils.auth import get_current_active_user, require_admin
+from app.utils.fields import SparseFields, schema_columns, sparse_fields
+from app.utils.pagination import KeysetPagination
+from app.routes.vehicle import VEHICLE_SORTS, VEHICLE_FIELDS
+from app.routes.work_orders import invalidate_work_order_stats
 
 router = APIRouter(prefix="/clients", tags=["clients"])
 
+# Sort keys accepted by ?sort= (prefix with "-" for descending)
+CLIENT_SORTS = {"id": ClientModel.id, "name": ClientModel.name}
+
+# Fields selectable with ?fields=
+CLIENT_FIELDS = sparse_fields(schema_columns(ClientRead, ClientModel.__table__.columns))
+
 # ============================================
 # CLIENT CRUD OPERATIONS
 # ============================================
@@ -40,20 +56,55 @@ def create_client(
     return new_client
 
 
+# ------------------------------------------------------------
+# CREATE CLIENTS IN BULK (AUTHENTICATED)
+# ------------------------------------------------------------
+@router.post("/bulk", response_model=BulkResult[ClientRead])
+def create_clients_bulk(
+    items: List[Dict[str, Any]] = Body(..., max_length=BULK_MAX_ITEMS),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """Create many clients; invalid items are reported by index in errors. Requires authentication."""
+    return bulk_create_clients(db, items)
+
+
 # ------------------------------------------------------------
 # GET ALL CLIENTS (AUTHENTICATED)
 # ------------------------------------------------------------
-@router.get("/", response_model=List[ClientRead])
+@router.get("/", response_model=Union[List[ClientRead], Page[ClientRead]])
 def list_clients(
     skip: int = 0, 
     limit: int = 100, 
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    fields: SparseFields = Depends(CLIENT_FIELDS),
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
 ):
-    """Get all clients. Requires authentication."""
-    clients = db.query(ClientModel).offset(skip).limit(limit).all()
+    """Get all clients (a cursor page when ?cursor= is given). Requires authentication."""
+    keyset = KeysetPagination(CLIENT_SORTS, ClientModel.id, sort, cursor, limit)
+    columns = fields.entities(ClientModel, required=(keyset.column, ClientModel.id))
+    query = db.query(*columns).select_from(ClientModel)
 
-    return clients
+    if cursor is None:
+        return fields.render(keyset.order(query).offset(skip).limit(limit).all())
+
+    return fields.render(keyset.page(keyset.apply(query).all()))
+
+
+# ------------------------------------------------------------
+# LOOK UP CLIENTS BY NAME PREFIX (AUTHENTICATED)
+# ------------------------------------------------------------
+@router.get("/lookup", response_model=List[ClientLookup])
+def lookup_clients_by_name(
+    prefix: str = Query(..., min_length=1, max_length=50),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """Up to limit clients whose name starts with prefix (ignoring case and accents). Requires authentication."""
+    return lookup_clients(db, prefix, limit)
 
 
 # ------------------------------------------------------------
@@ -62,16 +113,49 @@ def list_clients(
 @router.get("/{client_id}", response_model=ClientRead)
 def get_client(
     client_id: int, 
+    fields: SparseFields = Depends(CLIENT_FIELDS),
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(get_current_active_user)
 ):
     """Get client by ID. Requires authentication."""
-    client = db.query(ClientModel).filter(ClientModel.id == client_id).first()
+    query = db.query(*fields.entities(ClientModel)).select_from(ClientModel)
+    client = query.filter(ClientModel.id == client_id).first()
 
     if not client:
         raise HTTPException(status_code=404, detail="Client not found")
     
-    return client
+    return fields.render(client)
+
+
+# ------------------------------------------------------------
+# GET VEHICLES OF A CLIENT (AUTHENTICATED)
+# ------------------------------------------------------------
+@router.get("/{client_id}/vehicles", response_model=Union[List[VehicleResponse], Page[VehicleResponse]])
+def list_client_vehicles(
+    client_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    fields: SparseFields = Depends(VEHICLE_FIELDS),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(get_current_active_user)
+):
+    """Get one page of a client's vehicles (indexed on owner_id). Requires authentication."""
+    keyset = KeysetPagination(VEHICLE_SORTS, VehicleModel.id, sort, cursor, limit)
+
+    client = db.get(ClientModel, client_id)
+    if not client:
+        raise HTTPException(status_code=404, detail="Client not found")
+
+    # Query through the relationship instead of loading the whole collection
+    columns = fields.entities(VehicleModel, required=(keyset.column, VehicleModel.id))
+    query = db.query(*columns).select_from(VehicleModel).filter(with_parent(client, ClientModel.vehicles))
+
+    if cursor is None:
+        return fields.render(keyset.order(query).offset(skip).limit(limit).all())
+
+    return fields.render(keyset.page(keyset.apply(query).all()))
 
 
 # ------------------------------------------------------------
@@ -120,4 +204,7 @@ def delete_client(
     db.delete(client)
     db.commit()
 
+    # Its work orders were deleted with it
+    invalidate_work_order_stats()
+
     return {"message": "Client deleted"}
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List
+
+from app.database.database import get_db
+from app.database.search import search_terms, search_work_orders
+from app.models.user import User as UserModel
+from app.models.work_order import WorkOrder as WorkOrderModel
+from app.routes.work_orders import EXPANDED_COLUMNS, join_client_and_vehicle
+from app.schemas.work_order import WorkOrderExpandedResponse
+from app.utils.auth import require_employee_or_admin
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+# ------------------------------------------------------------
+# SEARCH WORK ORDERS
+# ------------------------------------------------------------
+@router.get("/", response_model=List[WorkOrderExpandedResponse])
+def search(
+    q: str = Query(..., max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(require_employee_or_admin)
+):
+    """
+    Work orders whose details, spare parts, workers, client name or plate
+    contain every word of q (as a word prefix), best matches first.
+    Served by the full-text index (FTS5 on SQLite, tsvector/GIN on PostgreSQL),
+    which ranks every match before the limit is applied.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return []
+
+    query = join_client_and_vehicle(db.query(*EXPANDED_COLUMNS).select_from(WorkOrderModel))
+    return search_work_orders(query, terms, db.bind.dialect.name, limit).all()
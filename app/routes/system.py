@@ -0,0 +1,50 @@
+"""
+System routes exposing in-process runtime statistics for monitoring.
+"""
+from fastapi import APIRouter, Depends
+
+from app.database.database import get_pool_stats, read_engine, writer_engine
+from app.database.lookup import client_index, vehicle_index
+from app.database.routing import recent_writers
+from app.models.user import User as UserModel
+from app.utils.auth import (
+    principal_cache,
+    token_cache,
+    login_user_limiter,
+    login_ip_limiter,
+    password_hashing,
+    require_admin,
+)
+from app.routes.work_orders import stats_cache
+from app.utils.password_pool import password_pool
+from app.utils.revocation import revocation_store
+
+router = APIRouter(prefix="/system", tags=["System"])
+
+
+# ------------------------------------------------------------
+# RUNTIME STATS (ADMIN ONLY)
+# ------------------------------------------------------------
+@router.get("/stats")
+def get_system_stats(current_user: UserModel = Depends(require_admin)):
+    """Return cache and pool counters of this process. Requires ADMIN role."""
+    return {
+        "db_pool": get_pool_stats(),
+        "db_read_pool": get_pool_stats(read_engine) if read_engine is not None else None,
+        "db_writer_pool": get_pool_stats(writer_engine) if writer_engine is not None else None,
+        "recent_writers": recent_writers.stats(),
+        "principal_cache": principal_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "work_order_stats_cache": stats_cache.stats(),
+        "lookup_index": {
+            "vehicles": vehicle_index.stats(),
+            "clients": client_index.stats(),
+        },
+        "password_pool": password_pool.stats(),
+        "password_hashing": dict(password_hashing),
+        "revocation_store": revocation_store.stats(),
+        "login_rate_limit": {
+            "username": login_user_limiter.stats(),
+            "ip": login_ip_limiter.stats(),
+        },
+    }
@@ -1,15 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional, Union
 
 from app.models.user import User as UserModel
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
+from app.schemas.pagination import Page
 from app.database.database import get_db
-from app.utils.auth import hash_password, require_admin, get_current_active_user
+from app.utils.auth import hash_password_async, require_admin, get_current_active_user, invalidate_cached_user
+from app.utils.pagination import KeysetPagination
 
 router = APIRouter(prefix="/user", tags=["User"])
 
+# Sort keys accepted by ?sort= (prefix with "-" for descending)
+USER_SORTS = {"id": UserModel.id, "username": UserModel.username}
+
 # ============================================
 # USER CRUD OPERATIONS
 # ============================================
@@ -18,21 +24,29 @@ router = APIRouter(prefix="/user", tags=["User"])
 # CREATE USER (ADMIN ONLY)
 # ------------------------------------------------------------
 @router.post("/", response_model=UserResponse)
-def create_user(
+async def create_user(
     user_data: UserCreate, 
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(require_admin)
 ):
     """Create a new user. Requires ADMIN role."""
+    # Hash the password before storing (before the lookup, so no connection is held meanwhile);
+    # awaited, so no threadpool thread waits on bcrypt either
+    hashed_password = await hash_password_async(user_data.password)
+
+    return await run_in_threadpool(insert_user, db, user_data, hashed_password)
+
+
+def insert_user(db: Session, user_data: UserCreate, hashed_password: str) -> UserModel:
+    """Store a new user with an already hashed password (400 if the username is taken)."""
     existing = db.query(UserModel).filter(UserModel.username == user_data.username).first()
 
     if existing:
         raise HTTPException(status_code=400, detail="Username already exists")
     
-    # Hash the password before storing
     new_user = UserModel(
         username = user_data.username,
-        password = hash_password(user_data.password),
+        password = hashed_password,
         role = user_data.role
     )
 
@@ -45,22 +59,30 @@ def create_user(
         db.rollback()
         raise HTTPException(status_code=400, detail="Integrity error creating user :(")
 
+    invalidate_cached_user(new_user.username)
+
     return new_user
 
 
 # ------------------------------------------------------------
 # GET ALL USERS (ADMIN ONLY)
 # ------------------------------------------------------------
-@router.get("/", response_model=List[UserResponse])
+@router.get("/", response_model=Union[List[UserResponse], Page[UserResponse]])
 def list_users(
     skip: int = 0, 
     limit: int = 100, 
+    cursor: Optional[str] = None,
+    sort: str = "id",
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(require_admin)
 ):
-    """Get all users. Requires ADMIN role."""
-    users = db.query(UserModel).offset(skip).limit(limit).all()
-    return users
+    """Get all users (a cursor page when ?cursor= is given). Requires ADMIN role."""
+    keyset = KeysetPagination(USER_SORTS, UserModel.id, sort, cursor, limit)
+
+    if cursor is None:
+        return keyset.order(db.query(UserModel)).offset(skip).limit(limit).all()
+
+    return keyset.page(keyset.apply(db.query(UserModel)).all())
 
 
 # ------------------------------------------------------------
@@ -85,23 +107,34 @@ def get_user(
 # UPDATE USER BY ID (ADMIN ONLY)
 # ------------------------------------------------------------
 @router.put("/{user_id}", response_model=UserResponse)
-def update_user(
+async def update_user(
     user_id: int, 
     updates: UserUpdate, 
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(require_admin)
 ):
     """Update user by ID. Requires ADMIN role."""
+    data = updates.dict(exclude_unset = True)
+    
+    # Hash password if it's being updated (before the lookup, so no connection is held meanwhile)
+    if 'password' in data and data['password'] is not None:
+        data['password'] = await hash_password_async(data['password'])
+    
+    return await run_in_threadpool(apply_user_update, db, user_id, data)
+
+
+def apply_user_update(db: Session, user_id: int, data: dict) -> UserModel:
+    """Apply updates (password already hashed) to a user, revoking its tokens on a role or password change."""
     user = db.query(UserModel).filter(UserModel.id == user_id).first()
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    data = updates.dict(exclude_unset = True)
+    previous_username = user.username
     
-    # Hash password if it's being updated
-    if 'password' in data and data['password'] is not None:
-        data['password'] = hash_password(data['password'])
+    # Invalidate tokens issued with the old role or password
+    if data.get('password') is not None or data.get('role', user.role) != user.role:
+        user.token_version = (user.token_version or 0) + 1
     
     for key, value in data.items():
         setattr(user, key, value)
@@ -113,6 +146,8 @@ def update_user(
         db.rollback()
         raise HTTPException(status_code=400, detail="Integrity error updating user")
 
+    invalidate_cached_user(previous_username, user.username)
+
     return user
 
 
@@ -134,4 +169,6 @@ def delete_user(
     db.delete(user)
     db.commit()
 
+    invalidate_cached_user(user.username)
+
     return {"message": "User deleted"}
@@ -1,15 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session, with_parent
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import Any, Dict, List, Optional, Union
 
 from app.models.vehicle import Vehicle as VehicleModel
 from app.models.client import Client
-from app.schemas.vehicle import VehicleCreate, VehicleUpdate, VehicleResponse
+from app.models.user import User as UserModel
+from app.models.work_order import WorkOrder as WorkOrderModel
+from app.schemas.vehicle import VehicleCreate, VehicleUpdate, VehicleResponse, VehicleLookup
+from app.schemas.work_order import WorkOrderResponse
+from app.schemas.pagination import Page
+from app.schemas.bulk import BulkResult
 from app.database.database import get_db
+from app.database.bulk import BULK_MAX_ITEMS, bulk_create_vehicles
+from app.database.lookup import lookup_vehicles
+from app.utils.auth import require_employee_or_admin
+from app.utils.fields import SparseFields, schema_columns, sparse_fields
+from app.utils.pagination import KeysetPagination
+from app.routes.work_orders import WORK_ORDER_SORTS, WORK_ORDER_FIELDS, invalidate_work_order_stats
 
 router = APIRouter(prefix="/vehicles", tags=["Vehicles"])
 
+# Sort keys accepted by ?sort= (prefix with "-" for descending)
+VEHICLE_SORTS = {"id": VehicleModel.id}
+
+# Fields selectable with ?fields=
+VEHICLE_FIELDS = sparse_fields(schema_columns(VehicleResponse, VehicleModel.__table__.columns))
+
 # ============================================
 # VEHICLE CRUD OPERATIONS
 # ============================================
@@ -47,28 +64,99 @@ def create_vehicle(vehicle_data: VehicleCreate, db: Session = Depends(get_db)):
     return new_vehicle
 
 
+# ------------------------------------------------------------
+# CREATE VEHICLES IN BULK
+# ------------------------------------------------------------
+@router.post("/bulk", response_model=BulkResult[VehicleResponse])
+def create_vehicles_bulk(
+    items: List[Dict[str, Any]] = Body(..., max_length=BULK_MAX_ITEMS),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(require_employee_or_admin)
+):
+    """Create many vehicles; items with a missing owner or a taken plate are reported by index in errors."""
+    return bulk_create_vehicles(db, items)
+
+
 # ------------------------------------------------------------
 # GET ALL VEHICLES
 # ------------------------------------------------------------
-@router.get("/", response_model=List[VehicleResponse])
-def list_vehicles(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@router.get("/", response_model=Union[List[VehicleResponse], Page[VehicleResponse]])
+def list_vehicles(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    fields: SparseFields = Depends(VEHICLE_FIELDS),
+    db: Session = Depends(get_db)
+):
 
-    vehicles = db.query(VehicleModel).offset(skip).limit(limit).all()
-    return vehicles
+    keyset = KeysetPagination(VEHICLE_SORTS, VehicleModel.id, sort, cursor, limit)
+    columns = fields.entities(VehicleModel, required=(keyset.column, VehicleModel.id))
+    query = db.query(*columns).select_from(VehicleModel)
+
+    if cursor is None:
+        return fields.render(keyset.order(query).offset(skip).limit(limit).all())
+
+    return fields.render(keyset.page(keyset.apply(query).all()))
+
+
+# ------------------------------------------------------------
+# LOOK UP VEHICLES BY PLATE PREFIX
+# ------------------------------------------------------------
+@router.get("/lookup", response_model=List[VehicleLookup])
+def lookup_vehicles_by_plate(
+    prefix: str = Query(..., min_length=1, max_length=25),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """Up to limit vehicles whose plate starts with prefix, for typeahead pickers."""
+    return lookup_vehicles(db, prefix, limit)
 
 
 # ------------------------------------------------------------
 # GET SINGLE VEHICLE BY ID
 # ------------------------------------------------------------
 @router.get("/{vehicle_id}", response_model=VehicleResponse)
-def get_vehicle(vehicle_id: int, db: Session = Depends(get_db)):
+def get_vehicle(vehicle_id: int, fields: SparseFields = Depends(VEHICLE_FIELDS), db: Session = Depends(get_db)):
 
-    vehicle = db.query(VehicleModel).filter(VehicleModel.id == vehicle_id).first()
+    query = db.query(*fields.entities(VehicleModel)).select_from(VehicleModel)
+    vehicle = query.filter(VehicleModel.id == vehicle_id).first()
 
     if not vehicle:
         raise HTTPException(status_code=404, detail="Vehicle not found :(")
     
-    return vehicle
+    return fields.render(vehicle)
+
+
+# ------------------------------------------------------------
+# GET WORK ORDERS OF A VEHICLE
+# ------------------------------------------------------------
+@router.get("/{vehicle_id}/work-orders", response_model=Union[List[WorkOrderResponse], Page[WorkOrderResponse]])
+def list_vehicle_work_orders(
+    vehicle_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: str = "-entry_date",
+    fields: SparseFields = Depends(WORK_ORDER_FIELDS),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(require_employee_or_admin)
+):
+    """Get one page of a vehicle's work orders, newest first by default (indexed on vehicle_id, entry_date)."""
+    keyset = KeysetPagination(WORK_ORDER_SORTS, WorkOrderModel.id, sort, cursor, limit)
+
+    vehicle = db.get(VehicleModel, vehicle_id)
+    if not vehicle:
+        raise HTTPException(status_code=404, detail="Vehicle not found")
+
+    # Query through the relationship instead of loading the whole collection
+    columns = fields.entities(WorkOrderModel, required=(keyset.column, WorkOrderModel.id))
+    query = db.query(*columns).select_from(WorkOrderModel).filter(with_parent(vehicle, VehicleModel.work_orders))
+
+    if cursor is None:
+        return fields.render(keyset.order(query).offset(skip).limit(limit).all())
+
+    return fields.render(keyset.page(keyset.apply(query).all()))
 
 
 # ------------------------------------------------------------
@@ -126,4 +214,7 @@ def delete_vehicle(vehicle_id: int, db: Session = Depends(get_db)):
     db.delete(vehicle)
     db.commit()
 
+    # Its work orders were deleted with it
+    invalidate_work_order_stats()
+
     return {"message": "Vehicle deleted"}
\ No newline at end of file
@@ -1,17 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import Any, AsyncIterator, Dict, Iterator, List, Literal, Optional, Union
+from datetime import date
 from pydantic import BaseModel
+import os
 from app.database.database import get_db
-from app.models.work_order import WorkOrder as WorkOrderModel
+from app.database.bulk import BULK_MAX_ITEMS, bulk_create_work_orders, transition_work_orders
+from app.database.routing import pin_primary
+from app.models.work_order import WorkOrder as WorkOrderModel, WorkStatus, PaymentStatus
 from app.models.client import Client as ClientModel
 from app.models.vehicle import Vehicle as VehicleModel
+from app.models.work_order_counter import WorkOrderCounter
 from app.schemas.work_order import (
     WorkOrderCreate,
     WorkOrderUpdate,
-    WorkOrderResponse
+    WorkOrderResponse,
+    WorkOrderExpandedResponse,
+    WorkOrderStats,
+    WorkOrderTransition,
+    WorkOrderTransitionResult
 )
+from app.schemas.pagination import Page
+from app.schemas.bulk import BulkResult
+from app.utils.cache import TTLCache
+from app.utils.export import EXPORT_BATCH_SIZE, EXPORT_MEDIA_TYPES, EXPORT_WRITERS
+from app.utils.fields import SparseFields, schema_columns, sparse_fields
+from app.utils.pagination import KeysetPagination
 # AGREGAR ESTAS IMPORTACIONES
 from app.utils.auth import get_current_user, require_employee_or_admin
 from app.models.user import User as UserModel
@@ -24,6 +41,160 @@ router = APIRouter(
 class MessageResponse(BaseModel):
     message: str
 
+# Sort keys accepted by ?sort= (prefix with "-" for descending)
+WORK_ORDER_SORTS = {"id": WorkOrderModel.id, "entry_date": WorkOrderModel.entry_date}
+
+
+# Client and vehicle columns embedded by the expanded listing
+EXPANDED_COLUMNS = (
+    *WorkOrderModel.__table__.columns,
+    ClientModel.name.label("client_name"),
+    ClientModel.phone_number.label("client_phone"),
+    ClientModel.email.label("client_email"),
+    VehicleModel.plate_number.label("vehicle_plate"),
+    VehicleModel.brand_model.label("vehicle_model"),
+    VehicleModel.vehicle_type.label("vehicle_type"),
+)
+
+
+# Fields selectable with ?fields=
+WORK_ORDER_FIELDS = sparse_fields(schema_columns(WorkOrderResponse, EXPANDED_COLUMNS))
+EXPANDED_FIELDS = sparse_fields(schema_columns(WorkOrderExpandedResponse, EXPANDED_COLUMNS))
+
+
+def join_client_and_vehicle(query):
+    """Inner-join the owning client and the vehicle of each work order."""
+    return (
+        query.join(ClientModel, ClientModel.id == WorkOrderModel.client_id)
+        .join(VehicleModel, VehicleModel.id == WorkOrderModel.vehicle_id)
+    )
+
+
+# Dashboard stats are cached until a work-order write (or the TTL, for other workers)
+WORK_ORDER_STATS_TTL_SECONDS = float(os.getenv("WORK_ORDER_STATS_TTL_SECONDS", "60"))
+STATS_KEY = "work_orders"
+stats_cache = TTLCache(max_size=1, ttl=WORK_ORDER_STATS_TTL_SECONDS)
+
+# Maintained per (work_status, payment_status) pair on every flush (app.database.counters)
+STATS_COLUMNS = (WorkOrderCounter.work_status, WorkOrderCounter.payment_status, WorkOrderCounter.count)
+UNPAID_STATUSES = (PaymentStatus.NOT_PAID, PaymentStatus.BILL_SENT)
+
+
+def build_work_order_stats(rows) -> dict:
+    """Fold grouped (work_status, payment_status, count) rows into the dashboard stats."""
+    by_work_status, by_payment_status = {}, {}
+    unpaid = 0
+    for work_status, payment_status, count in rows:
+        by_work_status[work_status.value] = by_work_status.get(work_status.value, 0) + count
+        by_payment_status[payment_status.value] = by_payment_status.get(payment_status.value, 0) + count
+        if payment_status in UNPAID_STATUSES:
+            unpaid += count
+
+    return {
+        "total": sum(by_work_status.values()),
+        "pending": by_work_status.get(WorkStatus.PENDING.value, 0),
+        "completed": by_work_status.get(WorkStatus.COMPLETED.value, 0),
+        "unpaid": unpaid,
+        "by_work_status": by_work_status,
+        "by_payment_status": by_payment_status,
+        "facets": {
+            "work_status": sorted(by_work_status),
+            "payment_status": sorted(by_payment_status),
+        },
+    }
+
+
+def invalidate_work_order_stats() -> None:
+    """Drop the cached stats after work orders were created, changed or deleted."""
+    stats_cache.invalidate(STATS_KEY)
+
+
+# Row lock taken before a status change: the counter deltas are computed from
+# the stored statuses, so concurrent writers of one order must not both read them
+LOCK_WORK_ORDER_OPTIONS = {"with_for_update": True, "populate_existing": True}
+
+
+def lock_work_order(db: Session, work_order_id: int) -> Optional[WorkOrderModel]:
+    """Load a work order on the primary with SELECT ... FOR UPDATE, or None."""
+    pin_primary(db)
+    return db.get(WorkOrderModel, work_order_id, **LOCK_WORK_ORDER_OPTIONS)
+
+
+class WorkOrderFilters:
+    """
+    Query parameters narrowing a work-order listing.
+
+    Status, date range, client and vehicle filters are served by the
+    work_orders indexes; q is a case-insensitive substring search over
+    details, spare parts, workers, plate number and client name (or an
+    exact id when numeric).
+    """
+
+    def __init__(
+        self,
+        work_status: Optional[WorkStatus] = None,
+        payment_status: Optional[PaymentStatus] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        client_id: Optional[int] = None,
+        vehicle_id: Optional[int] = None,
+        q: Optional[str] = Query(None, max_length=100),
+    ):
+        if date_from and date_to and date_from > date_to:
+            raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+
+        self.work_status = work_status
+        self.payment_status = payment_status
+        self.date_from = date_from
+        self.date_to = date_to
+        self.client_id = client_id
+        self.vehicle_id = vehicle_id
+        self.q = q.strip() if q and q.strip() else None
+
+    @property
+    def empty(self) -> bool:
+        """True when no filter was given."""
+        values = (self.work_status, self.payment_status, self.date_from, self.date_to, self.client_id, self.vehicle_id, self.q)
+        return all(value is None for value in values)
+
+    def apply(self, query, joined: bool = False):
+        """
+        Add the requested conditions to a Query or select() over work orders.
+        joined tells that clients and vehicles are already joined in.
+        """
+        conditions = []
+        if self.work_status is not None:
+            conditions.append(WorkOrderModel.work_status == self.work_status)
+        if self.payment_status is not None:
+            conditions.append(WorkOrderModel.payment_status == self.payment_status)
+        if self.date_from is not None:
+            conditions.append(WorkOrderModel.entry_date >= self.date_from)
+        if self.date_to is not None:
+            conditions.append(WorkOrderModel.entry_date <= self.date_to)
+        if self.client_id is not None:
+            conditions.append(WorkOrderModel.client_id == self.client_id)
+        if self.vehicle_id is not None:
+            conditions.append(WorkOrderModel.vehicle_id == self.vehicle_id)
+
+        if self.q is not None:
+            if not joined:
+                query = join_client_and_vehicle(query)
+            matches = [
+                column.icontains(self.q, autoescape=True)
+                for column in (
+                    WorkOrderModel.details,
+                    WorkOrderModel.spare_parts,
+                    WorkOrderModel.workers,
+                    VehicleModel.plate_number,
+                    ClientModel.name,
+                )
+            ]
+            if self.q.isdigit():
+                matches.append(WorkOrderModel.id == int(self.q))
+            conditions.append(or_(*matches))
+
+        return query.filter(*conditions) if conditions else query
+
 # ============================================
 # WORK ORDERS CRUD OPERATIONS
 # ============================================
@@ -60,23 +231,210 @@ def create_work_order(
         db.rollback()
         raise HTTPException(status_code=400, detail="Integrity error creating work order :(")
 
+    invalidate_work_order_stats()
+
     return new_work_order
 
 
+# ------------------------------------------------------------
+# CREATE WORK ORDERS IN BULK
+# ------------------------------------------------------------
+@router.post("/bulk", response_model=BulkResult[WorkOrderResponse])
+def create_work_orders_bulk(
+    items: List[Dict[str, Any]] = Body(..., max_length=BULK_MAX_ITEMS),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(require_employee_or_admin)
+):
+    """
+    Create many work orders. Items that fail validation or reference a
+    missing client or vehicle (or another client's vehicle) are reported by
+    index in errors; the others are inserted in chunks.
+    """
+    result = bulk_create_work_orders(db, items)
+
+    if result["created"]:
+        invalidate_work_order_stats()
+
+    return result
+
+
+# ------------------------------------------------------------
+# CHANGE THE STATUS OF MANY WORK ORDERS
+# ------------------------------------------------------------
+@router.patch("/status", response_model=WorkOrderTransitionResult)
+def transition_work_order_status(
+    data: WorkOrderTransition,
+    filters: WorkOrderFilters = Depends(),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(require_employee_or_admin)
+):
+    """
+    Set work_status and/or payment_status on the orders listed in ids and/or
+    matching the same query filters as GET /work-orders/ (e.g. a month with
+    date_from/date_to), locking them and updating them by id in one
+    transaction. Orders already in the target
+    statuses are left alone; returns the number and ids of the changed ones.
+    """
+    if data.ids is None and filters.empty:
+        raise HTTPException(status_code=400, detail="Select the work orders with ids or at least one filter")
+    if data.ids is not None and len(data.ids) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_ITEMS} ids per request")
+
+    conditions = []
+    if data.ids is not None:
+        conditions.append(WorkOrderModel.id.in_(data.ids))
+    if not filters.empty:
+        conditions.append(WorkOrderModel.id.in_(filters.apply(select(WorkOrderModel.id))))
+
+    rows = transition_work_orders(db, and_(*conditions), data.work_status, data.payment_status)
+
+    if rows:
+        invalidate_work_order_stats()
+
+    return {"updated": len(rows), "ids": sorted(row.id for row in rows)}
+
+
 # ------------------------------------------------------------
 # GET ALL WORK ORDERS
 # ------------------------------------------------------------
-@router.get("/", response_model=List[WorkOrderResponse])
+@router.get("/", response_model=Union[List[WorkOrderResponse], Page[WorkOrderResponse]])
 def list_work_orders(
+    response: Response,
     skip: int = 0, 
     limit: int = 100, 
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    with_total: bool = False,
+    filters: WorkOrderFilters = Depends(),
+    fields: SparseFields = Depends(WORK_ORDER_FIELDS),
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(require_employee_or_admin)
 ):
-    
-    work_orders = db.query(WorkOrderModel).offset(skip).limit(limit).all()
-    
-    return work_orders
+    """
+    List work orders matching the filters, ordered by (sort, id).
+    With ?cursor= (empty for the first page) returns a page and its next_cursor;
+    without it, the legacy skip/limit list. with_total adds the number of
+    matching orders (as "total", or the X-Total-Count header for lists).
+    ?fields= reads and returns only the named fields.
+    """
+    keyset = KeysetPagination(WORK_ORDER_SORTS, WorkOrderModel.id, sort, cursor, limit)
+    columns = fields.entities(WorkOrderModel, required=(keyset.column, WorkOrderModel.id))
+    query = filters.apply(db.query(*columns).select_from(WorkOrderModel))
+
+    total = None
+    if with_total:
+        total = filters.apply(db.query(func.count(WorkOrderModel.id)).select_from(WorkOrderModel)).scalar()
+
+    if cursor is None:
+        if total is not None:
+            response.headers["X-Total-Count"] = str(total)
+        return fields.render(keyset.order(query).offset(skip).limit(limit).all(), response)
+
+    return fields.render({**keyset.page(keyset.apply(query).all()), "total": total})
+
+
+# ------------------------------------------------------------
+# GET ALL WORK ORDERS WITH CLIENT AND VEHICLE FIELDS
+# ------------------------------------------------------------
+@router.get("/expanded", response_model=Union[List[WorkOrderExpandedResponse], Page[WorkOrderExpandedResponse]])
+def list_work_orders_expanded(
+    response: Response,
+    skip: int = 0, 
+    limit: int = 100, 
+    cursor: Optional[str] = None,
+    sort: str = "id",
+    with_total: bool = False,
+    filters: WorkOrderFilters = Depends(),
+    fields: SparseFields = Depends(EXPANDED_FIELDS),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(require_employee_or_admin)
+):
+    """
+    Same listing as GET /work-orders/, with client name/phone/email and vehicle
+    plate/model/type read in the same SELECT (one query per page).
+    """
+    keyset = KeysetPagination(WORK_ORDER_SORTS, WorkOrderModel.id, sort, cursor, limit)
+    columns = fields.entities(*EXPANDED_COLUMNS, required=(keyset.column, WorkOrderModel.id))
+    query = join_client_and_vehicle(db.query(*columns).select_from(WorkOrderModel))
+    query = filters.apply(query, joined=True)
+
+    total = None
+    if with_total:
+        total = filters.apply(db.query(func.count(WorkOrderModel.id)).select_from(WorkOrderModel)).scalar()
+
+    if cursor is None:
+        if total is not None:
+            response.headers["X-Total-Count"] = str(total)
+        return fields.render(keyset.order(query).offset(skip).limit(limit).all(), response)
+
+    return fields.render({**keyset.page(keyset.apply(query).all()), "total": total})
+
+
+# ------------------------------------------------------------
+# GET WORK ORDER STATS
+# ------------------------------------------------------------
+@router.get("/stats", response_model=WorkOrderStats)
+def get_work_order_stats(
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(require_employee_or_admin)
+):
+    """
+    Dashboard counters and filter facets, read from the status counters
+    table (a few rows, whatever the history size). Served from the
+    in-process cache until the next work-order write.
+    """
+    stats = stats_cache.get(STATS_KEY)
+    if stats is None:
+        rows = db.query(*STATS_COLUMNS).filter(WorkOrderCounter.count > 0).all()
+        stats = build_work_order_stats(rows)
+        stats_cache.set(STATS_KEY, stats)
+
+    return stats
+
+
+# ------------------------------------------------------------
+# EXPORT WORK ORDERS AS CSV / NDJSON
+# ------------------------------------------------------------
+@router.get("/export", response_class=StreamingResponse)
+def export_work_orders(
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    filters: WorkOrderFilters = Depends(),
+    fields: SparseFields = Depends(EXPANDED_FIELDS),
+    db: Session = Depends(get_db),
+    current_user: UserModel = Depends(require_employee_or_admin)
+):
+    """
+    Stream every work order matching the filters (e.g. date_from/date_to)
+    with its client and vehicle fields, ordered by id, as CSV or NDJSON.
+    Rows are read from a server-side cursor EXPORT_BATCH_SIZE at a time and
+    written as they arrive, so memory does not grow with the export size.
+    ?fields= picks the columns.
+    """
+    # The session stays open until the response is sent
+    return export_response(export_chunks(db, export_format, filters, fields), export_format)
+
+
+def export_chunks(db: Session, export_format: str, filters: WorkOrderFilters, fields: SparseFields) -> Iterator:
+    """
+    Run the export query and return the writer of export_format over it:
+    each chunk read fetches the next EXPORT_BATCH_SIZE rows from the cursor.
+    """
+    names = fields.names if fields.requested else list(fields.columns)
+    columns = [fields.columns[name].label(name) for name in names]
+    query = join_client_and_vehicle(select(*columns).select_from(WorkOrderModel))
+    query = filters.apply(query, joined=True).order_by(WorkOrderModel.id)
+
+    result = db.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    return EXPORT_WRITERS[export_format](columns, result.partitions())
+
+
+def export_response(chunks: Union[Iterator, AsyncIterator], export_format: str) -> StreamingResponse:
+    """Stream export chunks as a work-orders.<format> attachment."""
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="work-orders.{export_format}"'},
+    )
 
 
 # ------------------------------------------------------------
@@ -85,16 +443,18 @@ def list_work_orders(
 @router.get("/{work_order_id}", response_model=WorkOrderResponse)
 def get_work_order(
     work_order_id: int, 
+    fields: SparseFields = Depends(WORK_ORDER_FIELDS),
     db: Session = Depends(get_db),
     current_user: UserModel = Depends(require_employee_or_admin)
 ):
     
-    work_order = db.query(WorkOrderModel).filter(WorkOrderModel.id == work_order_id).first()
+    query = db.query(*fields.entities(WorkOrderModel)).select_from(WorkOrderModel)
+    work_order = query.filter(WorkOrderModel.id == work_order_id).first()
 
     if not work_order:
         raise HTTPException(status_code=404, detail="Work order not found")
     
-    return work_order
+    return fields.render(work_order)
 
 
 # ------------------------------------------------------------
@@ -108,7 +468,7 @@ def update_work_order(
     current_user: UserModel = Depends(require_employee_or_admin)
 ):
     
-    work_order = db.query(WorkOrderModel).filter(WorkOrderModel.id == work_order_id).first()
+    work_order = lock_work_order(db, work_order_id)
 
     if not work_order:
         raise HTTPException(status_code=404, detail="Work order not found")
@@ -121,6 +481,8 @@ def update_work_order(
     db.commit()
     db.refresh(work_order)
 
+    invalidate_work_order_stats()
+
     return work_order
 
 
@@ -129,11 +491,13 @@ def update_work_order(
 # ------------------------------------------------------------
 @router.delete("/{work_order_id}", response_model=MessageResponse)
 def delete_work_order(work_order_id: int, db: Session = Depends(get_db)):
-    work_order = db.query(WorkOrderModel).filter(WorkOrderModel.id == work_order_id).first()
+    work_order = lock_work_order(db, work_order_id)
     if not work_order:
         raise HTTPException(status_code=404, detail="Work order not found")
     
     db.delete(work_order)
     db.commit()
+
+    invalidate_work_order_stats()
     
     return {"message": "Work order deleted"}
\ No newline at end of file
@@ -31,6 +31,11 @@ class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
 
+class LogoutRequest(BaseModel):
+    """Schema for logout request with the refresh token to revoke"""
+    refresh_token: str | None = None
+
+
 # ============================================
 # USER INFO SCHEMAS
 # ============================================
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Generic, List, TypeVar
+
+T = TypeVar("T")
+
+# Item of a bulk request that was not created; index is its position in the request
+class BulkItemError(BaseModel):
+    index: int
+    detail: str
+
+# Result of a bulk create: the created rows in request order, and the rejected items
+class BulkResult(BaseModel, Generic[T]):
+    created: List[T]
+    errors: List[BulkItemError]
@@ -49,4 +49,10 @@ class ClientUpdate(BaseModel):
 class ClientRead(ClientCreate):
     id: int
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Typeahead result of GET /clients/lookup
+class ClientLookup(BaseModel):
+    id: int
+    name: str
+    phone_number: str
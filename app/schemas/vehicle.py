@@ -68,4 +68,11 @@ class VehicleResponse(VehicleBase):
     id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Typeahead result of GET /vehicles/lookup
+class VehicleLookup(BaseModel):
+    id: int
+    plate_number: str
+    brand_model: str
+    owner_id: int
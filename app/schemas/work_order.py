@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Dict, List, Optional
 from datetime import date
 from app.models.work_order import WorkStatus, PaymentStatus
 from app.utils.validators import (
@@ -95,3 +95,47 @@ class WorkOrderResponse(WorkOrderBase):
 
     class Config:
         from_attributes = True
+
+# Work order with the client and vehicle fields listings display
+class WorkOrderExpandedResponse(WorkOrderResponse):
+    client_name: str
+    client_phone: str
+    client_email: Optional[str] = None
+
+    vehicle_plate: str
+    vehicle_model: str
+    vehicle_type: str
+
+# Distinct status values present, for the listing filter dropdowns
+class WorkOrderFacets(BaseModel):
+    work_status: List[str]
+    payment_status: List[str]
+
+# Dashboard counters of GET /work-orders/stats
+class WorkOrderStats(BaseModel):
+    total: int
+    pending: int
+    completed: int
+    unpaid: int
+
+    by_work_status: Dict[str, int]
+    by_payment_status: Dict[str, int]
+    facets: WorkOrderFacets
+
+# Target statuses of PATCH /work-orders/status, for the orders in ids and/or matching the query filters
+class WorkOrderTransition(BaseModel):
+    ids: Optional[List[int]] = Field(None, min_length=1)
+
+    work_status: Optional[WorkStatus] = None
+    payment_status: Optional[PaymentStatus] = None
+
+    @model_validator(mode="after")
+    def _require_target(self):
+        if self.work_status is None and self.payment_status is None:
+            raise ValueError("Set work_status, payment_status or both")
+        return self
+
+# Work orders whose status changed in a bulk transition
+class WorkOrderTransitionResult(BaseModel):
+    updated: int
+    ids: List[int]
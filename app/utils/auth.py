@@ -3,17 +3,25 @@ Authentication utilities for JWT token management and password hashing.
 Provides secure password hashing with bcrypt and JWT token creation/validation.
 """
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import NamedTuple, Optional
 from jose import JWTError, jwt
 import bcrypt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+import ipaddress
+import math
 import os
+import time
+from uuid import uuid4
 from dotenv import load_dotenv
 
-from app.models.user import User as UserModel
-from app.database.database import get_db
+from app.models.user import User as UserModel, UserRole
+from app.database.database import get_async_db, get_db
+from app.utils.cache import TTLCache
+from app.utils.password_pool import password_pool
+from app.utils.rate_limit import TokenBucketLimiter
 
 # Load environment variables
 load_dotenv()
@@ -32,9 +40,124 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30  # Token expires in 30 minutes
 REFRESH_TOKEN_EXPIRE_DAYS = 7     # Refresh token expires in 7 days
 
+# Authorize from the verified token claims instead of the stored role
+AUTH_CLAIMS_ONLY = os.getenv("AUTH_CLAIMS_ONLY", "false").lower() in ("1", "true", "yes")
+
+# Authenticated-principal cache (username -> id, role and token version)
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+PRINCIPAL_CACHE_MAX_SIZE = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "1024"))
+
+# Verified-token cache (token -> payload until its exp claim)
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "4096"))
+
+# bcrypt cost: fixed with BCRYPT_ROUNDS, otherwise calibrated at startup to BCRYPT_TARGET_MS
+BCRYPT_ROUNDS = os.getenv("BCRYPT_ROUNDS")
+BCRYPT_TARGET_MS = float(os.getenv("BCRYPT_TARGET_MS", "250"))
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+
+# Login admission control (token buckets per username and per client IP)
+LOGIN_RATE_LIMIT_ENABLED = os.getenv("LOGIN_RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+LOGIN_RATE_USER_BURST = float(os.getenv("LOGIN_RATE_USER_BURST", "5"))
+LOGIN_RATE_USER_PER_MINUTE = float(os.getenv("LOGIN_RATE_USER_PER_MINUTE", "5"))
+LOGIN_RATE_IP_BURST = float(os.getenv("LOGIN_RATE_IP_BURST", "20"))
+LOGIN_RATE_IP_PER_MINUTE = float(os.getenv("LOGIN_RATE_IP_PER_MINUTE", "30"))
+LOGIN_RATE_MAX_KEYS = int(os.getenv("LOGIN_RATE_MAX_KEYS", "100000"))
+
+# Proxies (IPs or CIDRs, comma-separated) whose X-Forwarded-For gives the client address
+TRUSTED_PROXIES = [
+    ipaddress.ip_network(proxy.strip(), strict=False)
+    for proxy in os.getenv("TRUSTED_PROXIES", "").split(",")
+    if proxy.strip()
+]
+
+# Per-IP login bucket. Off unless TRUSTED_PROXIES is set: behind a reverse proxy
+# every client has the proxy's address and would share one bucket
+LOGIN_RATE_IP_ENABLED = os.getenv(
+    "LOGIN_RATE_IP_ENABLED", "true" if TRUSTED_PROXIES else "false"
+).lower() in ("1", "true", "yes")
+
 # ============================================
 # PASSWORD HASHING
 # ============================================
+# Current bcrypt cost, set at startup by configure_password_hashing()
+password_hashing = {
+    "rounds": int(BCRYPT_ROUNDS) if BCRYPT_ROUNDS else 12,
+    "calibrated": False,
+    "measured_ms": None,
+}
+
+
+def calibrate_bcrypt_rounds(target_ms: float, sample_rounds: int = 8) -> int:
+    """
+    Pick the bcrypt cost whose hashing time is closest to target_ms here.
+    
+    Each extra round doubles the work, so one cheap sample is extrapolated.
+    
+    Args:
+        target_ms: Desired hashing latency in milliseconds
+        sample_rounds: Cost used for the timing sample
+        
+    Returns:
+        Number of rounds, clamped to a safe range
+    """
+    salt = bcrypt.gensalt(rounds=sample_rounds)
+    sample_ms = min(
+        _time_hash(salt) for _ in range(3)
+    )
+    rounds = sample_rounds + round(math.log2(max(target_ms, 1.0) / max(sample_ms, 0.01)))
+    return max(BCRYPT_MIN_ROUNDS, min(BCRYPT_MAX_ROUNDS, rounds))
+
+
+def _time_hash(salt: bytes) -> float:
+    """Return the milliseconds taken by one bcrypt hash with the given salt."""
+    start = time.perf_counter()
+    bcrypt.hashpw(b"calibration-password", salt)
+    return (time.perf_counter() - start) * 1000
+
+
+def configure_password_hashing() -> int:
+    """
+    Set the bcrypt cost for this process (called on application startup).
+    
+    Returns:
+        Rounds used for new hashes
+    """
+    if not BCRYPT_ROUNDS:
+        password_hashing["rounds"] = calibrate_bcrypt_rounds(BCRYPT_TARGET_MS)
+        password_hashing["calibrated"] = True
+    
+    salt = bcrypt.gensalt(rounds=password_hashing["rounds"])
+    password_hashing["measured_ms"] = round(_time_hash(salt), 1)
+    return password_hashing["rounds"]
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a stored hash should move to the current cost.
+    
+    A cost fixed with BCRYPT_ROUNDS is the deployment's latency knob, so hashes
+    follow it both ways. A calibrated cost only upgrades them: workers
+    calibrated to different costs (or one calibrated on a busy host) must not
+    lower a stored cost or re-hash the same password back and forth.
+    Calibration never goes below BCRYPT_MIN_ROUNDS.
+    
+    Args:
+        hashed_password: Stored bcrypt hash ($2b$<rounds>$...)
+        
+    Returns:
+        True if the password should be hashed again
+    """
+    try:
+        stored_rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return False
+    
+    if BCRYPT_ROUNDS:
+        return stored_rounds != password_hashing["rounds"]
+    return stored_rounds < password_hashing["rounds"]
+
+
 def hash_password(password: str) -> str:
     """
     Hash a plain text password using bcrypt.
@@ -47,7 +170,7 @@ def hash_password(password: str) -> str:
     """
     # Convert password to bytes and hash it
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=password_hashing["rounds"])
     hashed = bcrypt.hashpw(password_bytes, salt)
     # Return as string for database storage
     return hashed.decode('utf-8')
@@ -70,6 +193,93 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bcrypt pool without blocking the event loop."""
+    return await password_pool.run_async(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bcrypt pool without blocking the event loop."""
+    return await password_pool.run_async(verify_password, plain_password, hashed_password)
+
+
+# ============================================
+# LOGIN RATE LIMITING
+# ============================================
+login_user_limiter = TokenBucketLimiter(
+    LOGIN_RATE_USER_BURST, LOGIN_RATE_USER_PER_MINUTE / 60, LOGIN_RATE_MAX_KEYS
+)
+login_ip_limiter = TokenBucketLimiter(
+    LOGIN_RATE_IP_BURST, LOGIN_RATE_IP_PER_MINUTE / 60, LOGIN_RATE_MAX_KEYS
+)
+
+
+def _is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXIES)
+
+
+def request_client_ip(request: Request) -> Optional[str]:
+    """
+    Return the address of the client behind a request.
+    
+    X-Forwarded-For is only read when the peer is a trusted proxy: the
+    client is then the last entry not added by a trusted proxy (earlier
+    entries can be forged by the client).
+    
+    Args:
+        request: Incoming request
+        
+    Returns:
+        Client IP address, or None if unknown
+    """
+    if request.client is None:
+        return None
+    
+    address = request.client.host
+    if not _is_trusted_proxy(address):
+        return address
+    
+    forwarded = ",".join(request.headers.getlist("x-forwarded-for")).split(",")
+    for entry in reversed([entry.strip() for entry in forwarded if entry.strip()]):
+        address = entry
+        if not _is_trusted_proxy(entry):
+            break
+    return address
+
+
+def check_login_rate(username: str, client_ip: Optional[str]) -> None:
+    """
+    Admit or reject a login attempt before any user lookup or bcrypt work.
+    
+    Args:
+        username: Username being tried
+        client_ip: Client address (see request_client_ip()); only limited with LOGIN_RATE_IP_ENABLED
+        
+    Raises:
+        HTTPException: 429 if the IP or the username ran out of attempts
+    """
+    if not LOGIN_RATE_LIMIT_ENABLED:
+        return
+    
+    allowed, retry_after = True, 0.0
+    if LOGIN_RATE_IP_ENABLED:
+        allowed, retry_after = login_ip_limiter.acquire(client_ip or "unknown")
+    if allowed:
+        # Keys are normalized and truncated so arbitrary input stays small
+        allowed, retry_after = login_user_limiter.acquire(username.lower()[:64])
+    
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please try again later",
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+        )
+
+
 # ============================================
 # JWT TOKEN MANAGEMENT
 # ============================================
@@ -112,15 +322,22 @@ def create_refresh_token(data: dict) -> str:
     """
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    # jti identifies the token so logout and rotation can revoke it
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid4().hex})
     
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+# Only tokens that passed verification are stored, and each entry expires at
+# the token's own exp claim, so a cached payload is always still valid.
+token_cache = TTLCache(max_size=TOKEN_CACHE_MAX_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
 def decode_token(token: str) -> dict:
     """
     Decode and validate a JWT token.
+    Verified payloads are cached until the token expires.
     
     Args:
         token: JWT token string to decode
@@ -131,15 +348,67 @@ def decode_token(token: str) -> dict:
     Raises:
         HTTPException: If token is invalid or expired
     """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return dict(cached)
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        remaining = exp - time.time()
+        if remaining > 0:
+            token_cache.set(token, dict(payload), ttl=remaining)
+    
+    return payload
+
+
+# ============================================
+# PRINCIPAL CACHE
+# ============================================
+class CachedPrincipal(NamedTuple):
+    """Minimal user data needed to authorize a request"""
+    id: int
+    role: UserRole
+    token_version: int
+
+
+principal_cache = TTLCache(max_size=PRINCIPAL_CACHE_MAX_SIZE, ttl=PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def invalidate_cached_user(*usernames: Optional[str]) -> None:
+    """
+    Drop cached principals so role changes and deletions apply immediately.
+    
+    Args:
+        usernames: Usernames whose cache entries must be removed
+    """
+    principal_cache.invalidate(*(name for name in usernames if name))
+
+
+def build_token_claims(user: UserModel) -> dict:
+    """
+    Build the identity claims embedded in access and refresh tokens.
+    
+    Args:
+        user: Authenticated user
+        
+    Returns:
+        Dictionary with username, id, role and token version
+    """
+    return {
+        "sub": user.username,
+        "uid": user.id,
+        "role": user.role.value,
+        "ver": user.token_version or 0,
+    }
 
 
 # ============================================
@@ -152,6 +421,10 @@ def get_current_user(
     """
     Dependency to get the current authenticated user from JWT token.
     
+    With AUTH_CLAIMS_ONLY enabled, the role comes from the verified token and
+    the stored user is only consulted (through the principal cache) to check
+    that the token version is still current.
+    
     Args:
         token: JWT token from Authorization header
         db: Database session
@@ -171,19 +444,39 @@ def get_current_user(
     try:
         payload = decode_token(token)
         username: str = payload.get("sub")
-        
-        if username is None:
+
+        # Refresh tokens are only accepted by /auth/refresh (and revoked there)
+        if username is None or payload.get("type") == "refresh":
             raise credentials_exception
             
     except JWTError:
         raise credentials_exception
     
-    user = db.query(UserModel).filter(UserModel.username == username).first()
+    # Warm path: build a detached user from the cache without touching the DB
+    user = None
+    principal = principal_cache.get(username)
+    if principal is None:
+        user = db.query(UserModel).filter(UserModel.username == username).first()
+        
+        if user is None:
+            raise credentials_exception
+        
+        principal = CachedPrincipal(id=user.id, role=user.role, token_version=user.token_version or 0)
+        principal_cache.set(username, principal)
     
-    if user is None:
-        raise credentials_exception
+    if AUTH_CLAIMS_ONLY:
+        # uid and ver tell a recreated user apart from a deleted one with the same name
+        if (
+            payload.get("uid") != principal.id
+            or payload.get("ver", 0) != principal.token_version
+            or payload.get("role") is None
+        ):
+            raise credentials_exception
+        return UserModel(id=principal.id, username=username, role=UserRole(payload["role"]))
     
-    return user
+    if user is not None:
+        return user
+    return UserModel(id=principal.id, username=username, role=principal.role)
 
 
 def get_current_active_user(
@@ -248,3 +541,47 @@ def require_employee_or_admin(
             detail="Employee or Admin privileges required"
         )
     return current_user
+
+
+# ============================================
+# ASYNC AUTHENTICATION DEPENDENCIES (DB_ASYNC)
+# ============================================
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> UserModel:
+    """
+    get_current_user on the request's AsyncSession.
+    
+    The same checks run with run_sync, so a principal cache miss loads the
+    user on the async connection instead of a sync Session and pool.
+    
+    Args:
+        token: JWT token from Authorization header
+        db: Async database session
+        
+    Returns:
+        Current authenticated user
+    """
+    return await db.run_sync(lambda session: get_current_user(token, session))
+
+
+async def get_current_active_user_async(
+    current_user: UserModel = Depends(get_current_user_async)
+) -> UserModel:
+    """get_current_active_user for the async routes."""
+    return get_current_active_user(current_user)
+
+
+async def require_admin_async(
+    current_user: UserModel = Depends(get_current_active_user_async)
+) -> UserModel:
+    """require_admin for the async routes."""
+    return require_admin(current_user)
+
+
+async def require_employee_or_admin_async(
+    current_user: UserModel = Depends(get_current_active_user_async)
+) -> UserModel:
+    """require_employee_or_admin for the async routes."""
+    return require_employee_or_admin(current_user)
@@ -0,0 +1,75 @@
+"""
+Streaming CSV / NDJSON exports.
+Rows are read in partitions from a streamed result (yield_per / server-side
+cursor) and each partition is encoded and sent before the next one is read,
+so memory stays bounded by the partition size whatever the row count.
+"""
+import csv
+import io
+import os
+from typing import Callable, Iterable, Iterator, Sequence
+
+from dotenv import load_dotenv
+from pydantic_core import to_json
+from sqlalchemy import Enum
+
+load_dotenv()
+
+# Rows fetched from the cursor and encoded per response chunk
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+# Media type of each export format
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _plain_values(columns: Sequence) -> Callable:
+    """
+    Row -> values with the members of Enum columns replaced by their values,
+    like in the JSON responses. Only those columns are checked.
+    """
+    enums = [position for position, column in enumerate(columns) if isinstance(column.type, Enum)]
+
+    def plain(row) -> list:
+        values = list(row)
+        for position in enums:
+            if values[position] is not None:
+                values[position] = values[position].value
+        return values
+
+    return plain
+
+
+def csv_chunks(columns: Sequence, partitions: Iterable) -> Iterator[str]:
+    """
+    Yield a header line (the column keys), then the CSV lines of each
+    partition of rows read for columns.
+    """
+    plain = _plain_values(columns)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    writer.writerow([column.key for column in columns])
+    yield flush()
+    for rows in partitions:
+        writer.writerows(map(plain, rows))
+        yield flush()
+
+
+def ndjson_chunks(columns: Sequence, partitions: Iterable) -> Iterator[bytes]:
+    """Yield the JSON lines (one object keyed by column key per row) of each partition of rows."""
+    plain = _plain_values(columns)
+    names = [column.key for column in columns]
+    for rows in partitions:
+        yield b"".join(to_json(dict(zip(names, plain(row)))) + b"\n" for row in rows)
+
+
+EXPORT_WRITERS = {"csv": csv_chunks, "ndjson": ndjson_chunks}
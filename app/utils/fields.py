@@ -0,0 +1,126 @@
+"""
+Sparse fieldsets (?fields=) for list and detail responses.
+Selects only the requested columns and serializes only those fields, so
+tables showing a few columns skip reading and encoding the long text ones.
+"""
+from enum import Enum
+from typing import Any, Dict, Iterable, Optional, Type
+
+from fastapi import HTTPException, Query, Response, status
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+
+def schema_columns(schema: Type[BaseModel], columns: Iterable) -> Dict[str, Any]:
+    """
+    Map every field of a response schema to the column expression reading it.
+
+    Raises:
+        KeyError: If a schema field has no column of the same name (at import time)
+    """
+    by_key = {column.key: column for column in columns}
+    return {name: by_key[name] for name in schema.model_fields}
+
+
+def sparse_fields(columns: Dict[str, Any]):
+    """Dependency parsing ?fields= against the fields of one response schema."""
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None, max_length=500, description="Comma-separated fields to return (all when omitted)"
+        ),
+    ) -> "SparseFields":
+        return SparseFields(columns, fields)
+
+    return dependency
+
+
+# ============================================
+# SPARSE FIELDSETS
+# ============================================
+class SparseFields:
+    """
+    Response fields requested with ?fields=, and the columns that read them.
+
+    Without ?fields= every helper is a pass-through: queries select the model
+    and the response model serializes the objects as usual.
+    """
+
+    def __init__(self, columns: Dict[str, Any], fields: Optional[str]):
+        """
+        Args:
+            columns: Allowed field names mapped to column expressions, in response order
+            fields: Comma-separated field names, or None for the full response
+
+        Raises:
+            HTTPException: 400 if no field or an unknown field is named
+        """
+        self.columns = columns
+        self.names = None
+        if fields is None:
+            return
+
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        if not requested:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="fields must name at least one field")
+        unknown = requested - columns.keys()
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid fields: {', '.join(sorted(unknown))}. Expected any of: {', '.join(columns)}",
+            )
+        self.names = [name for name in columns if name in requested]
+
+    @property
+    def requested(self) -> bool:
+        return self.names is not None
+
+    def entities(self, *default, required: Iterable = ()) -> tuple:
+        """
+        What to SELECT: default (a model or its full column list), or only the
+        requested columns labeled by field name, plus the required ones (the
+        keyset sort key and id) that are read to build the page but not returned.
+        """
+        if not self.requested:
+            return default
+
+        selected = {name: self.columns[name] for name in self.names}
+        for column in required:
+            selected.setdefault(column.key, column)
+        return tuple(column.label(name) for name, column in selected.items())
+
+    def rows(self, result) -> list:
+        """Rows of an executed select(*entities(Model)): ORM objects or column rows."""
+        return result.all() if self.requested else result.scalars().all()
+
+    def first(self, result):
+        """First row of an executed select(*entities(Model)), or None."""
+        return result.first() if self.requested else result.scalars().first()
+
+    def dump(self, row) -> dict:
+        mapping = row._mapping
+        item = {}
+        for name in self.names:
+            value = mapping[name]
+            # Plain values keep to_json on its fast path
+            item[name] = value.value if isinstance(value, Enum) else value
+        return item
+
+    def render(self, content, response: Optional[Response] = None):
+        """
+        Return content (a row, a list of rows or a cursor page) unchanged for
+        the response model, or as JSON holding only the requested fields.
+        response carries headers already set by the endpoint (X-Total-Count).
+        """
+        if not self.requested:
+            return content
+
+        if isinstance(content, dict):
+            content = {"total": None, **content, "items": [self.dump(row) for row in content["items"]]}
+        elif isinstance(content, list):
+            content = [self.dump(row) for row in content]
+        else:
+            content = self.dump(content)
+
+        headers = dict(response.headers) if response is not None else None
+        return Response(to_json(content), media_type="application/json", headers=headers)
@@ -0,0 +1,175 @@
+"""
+Prefix lookup utilities.
+Name normalization, index-friendly prefix conditions and an in-process sorted
+array answering prefix lookups with binary search.
+"""
+from bisect import bisect_left, insort
+from threading import Lock, Thread
+from typing import Any, Callable, Hashable, Iterable, List, Optional, Tuple
+import time
+import unicodedata
+
+from sqlalchemy import and_
+
+
+def normalize_name(value: Optional[str]) -> str:
+    """Lowercase, strip accents and collapse whitespace ("  José  Pérez" -> "jose perez")."""
+    value = unicodedata.normalize("NFKD", value or "")
+    value = "".join(char for char in value if not unicodedata.combining(char))
+    return " ".join(value.lower().split())
+
+
+def prefix_condition(column, prefix: str, dialect: str):
+    """
+    Condition matching values of column starting with prefix, served by an index.
+
+    PostgreSQL uses LIKE 'prefix%' (with a text_pattern_ops index); elsewhere
+    the equivalent range [prefix, next prefix) is used, which SQLite's
+    binary-collated indexes serve directly.
+    """
+    if dialect == "postgresql":
+        escaped = prefix.replace("/", "//").replace("%", "/%").replace("_", "/_")
+        return column.like(escaped + "%", escape="/")
+
+    upper = prefix.rstrip(chr(0x10FFFF))
+    if not upper:
+        return column >= prefix
+    upper = upper[:-1] + chr(ord(upper[-1]) + 1)
+    return and_(column >= prefix, column < upper)
+
+
+# ============================================
+# IN-PROCESS SORTED INDEX
+# ============================================
+class SortedPrefixIndex:
+    """
+    Sorted array of (key, id) with a payload per id, answering prefix lookups
+    in O(log n + limit).
+
+    It is loaded in full by load() and kept current with put()/discard() after
+    committed writes of this process; it reports itself stale after max_age
+    seconds so writes from other workers are picked up by a reload, which
+    refresh_in_background() runs while lookups keep reading the old contents.
+    """
+
+    def __init__(self, max_age: float = 60.0):
+        """
+        Args:
+            max_age: Seconds after which a loaded index should be reloaded
+        """
+        self.max_age = max_age
+        self._keys: List[Tuple[str, Hashable]] = []
+        self._entries: dict = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = Lock()
+        self._refreshing = False
+        self._changes: Optional[list] = None
+        self.loads = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    @property
+    def stale(self) -> bool:
+        """True when never loaded, invalidated or older than max_age."""
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age
+
+    def load(self, rows: Iterable[Tuple[str, Hashable, Any]]) -> None:
+        """
+        Replace the contents with (key, id, payload) rows. During a background
+        refresh, the put()/discard() calls made since it started are applied
+        again on top, as rows may have been read before those writes.
+        """
+        entries = {row_id: (key, payload) for key, row_id, payload in rows}
+        keys = sorted((key, row_id) for row_id, (key, _) in entries.items())
+        with self._lock:
+            self._keys, self._entries = keys, entries
+            self._loaded_at = time.monotonic()
+            self.loads += 1
+            for key, row_id, payload in self._changes or ():
+                self._discard(row_id)
+                if payload is not None:
+                    self._insert(key, row_id, payload)
+
+    def refresh_in_background(self, rows: Callable[[], Iterable[Tuple[str, Hashable, Any]]]) -> bool:
+        """
+        Reload from rows() on a daemon thread, unless a refresh is already
+        running; the current contents keep answering lookups until then.
+        Returns whether a refresh was started.
+        """
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+            self._changes = []
+        Thread(target=self._refresh, args=(rows,), name="lookup-index-refresh", daemon=True).start()
+        return True
+
+    def _refresh(self, rows: Callable) -> None:
+        try:
+            self.load(rows())
+        finally:
+            with self._lock:
+                self._refreshing = False
+                self._changes = None
+
+    def invalidate(self) -> None:
+        """Mark the index for a full reload on its next use."""
+        with self._lock:
+            self._loaded_at = None
+
+    def put(self, key: str, row_id: Hashable, payload: Any) -> None:
+        """Insert or replace the entry of row_id (ignored until loaded)."""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            self._discard(row_id)
+            self._insert(key, row_id, payload)
+            if self._changes is not None:
+                self._changes.append((key, row_id, payload))
+
+    def discard(self, row_id: Hashable) -> None:
+        """Remove the entry of row_id, if present."""
+        with self._lock:
+            self._discard(row_id)
+            if self._changes is not None:
+                self._changes.append((None, row_id, None))
+
+    def _insert(self, key: str, row_id: Hashable, payload: Any) -> None:
+        insort(self._keys, (key, row_id))
+        self._entries[row_id] = (key, payload)
+
+    def _discard(self, row_id: Hashable) -> None:
+        entry = self._entries.pop(row_id, None)
+        if entry is not None:
+            position = bisect_left(self._keys, (entry[0], row_id))
+            del self._keys[position]
+
+    def lookup(self, prefix: str, limit: int) -> list:
+        """Payloads of up to limit entries whose key starts with prefix, in key order."""
+        with self._lock:
+            position = bisect_left(self._keys, (prefix,))
+            results = []
+            while position < len(self._keys) and len(results) < limit:
+                key, row_id = self._keys[position]
+                if not key.startswith(prefix):
+                    break
+                results.append(self._entries[row_id][1])
+                position += 1
+            return results
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def stats(self) -> dict:
+        """Return size and load counters for monitoring."""
+        with self._lock:
+            return {
+                "size": len(self._keys),
+                "loaded": self._loaded_at is not None,
+                "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+                "max_age_seconds": self.max_age,
+                "loads": self.loads,
+                "refreshing": self._refreshing,
+            }
@@ -0,0 +1,128 @@
+"""
+Keyset (cursor) pagination helpers.
+Orders listings by a (sort_key, id) pair and resumes after the last row seen,
+so every page costs the same index range scan regardless of its depth.
+"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+import json
+
+from fastapi import HTTPException, status
+from sqlalchemy import literal, tuple_
+
+
+def _bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def encode_cursor(sort: str, key: Any, row_id: int) -> str:
+    """Build the opaque cursor pointing just after (key, row_id)."""
+    if isinstance(key, (date, datetime)):
+        key = key.isoformat()
+    raw = json.dumps([sort, key, row_id], separators=(",", ":")).encode()
+    return urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, python_type: type) -> tuple:
+    """
+    Decode a cursor produced by encode_cursor for the same sort.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or was issued for another sort
+    """
+    try:
+        raw = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, key, row_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise _bad_request("Invalid cursor")
+
+    if cursor_sort != sort:
+        raise _bad_request("Cursor does not match the requested sort")
+
+    try:
+        if python_type in (date, datetime):
+            key = python_type.fromisoformat(key)
+        elif not isinstance(key, python_type):
+            raise ValueError(key)
+        if not isinstance(row_id, int):
+            raise ValueError(row_id)
+    except (ValueError, TypeError):
+        raise _bad_request("Invalid cursor")
+    return key, row_id
+
+
+# ============================================
+# KEYSET PAGINATION
+# ============================================
+class KeysetPagination:
+    """
+    Orders a listing by (sort column, id) and pages through it with cursors.
+
+    Works on ORM Query objects and on select() statements alike. sort is one
+    of the allowed column names, optionally prefixed with "-" for descending.
+    """
+
+    def __init__(self, sort_columns: Dict[str, Any], id_column, sort: str, cursor: Optional[str], limit: int):
+        """
+        Args:
+            sort_columns: Allowed sort names mapped to model columns
+            id_column: Primary key column used as the tie-breaker
+            sort: Requested sort, e.g. "entry_date" or "-entry_date"
+            cursor: Cursor from a previous page; "" requests the first page
+            limit: Page size
+
+        Raises:
+            HTTPException: 400 for an unknown sort, bad cursor or limit below 1
+        """
+        self.descending = sort.startswith("-")
+        name = sort.lstrip("-")
+        if name not in sort_columns:
+            raise _bad_request(f"Invalid sort, expected one of: {', '.join(sort_columns)}")
+        if limit < 1:
+            raise _bad_request("limit must be at least 1")
+
+        self.sort = sort
+        self.column = sort_columns[name]
+        self.id_column = id_column
+        self.limit = limit
+        self.after = None
+        if cursor:
+            self.after = decode_cursor(cursor, sort, self.column.type.python_type)
+
+    def order(self, query):
+        """Apply the stable (sort_key, id) ordering."""
+        columns = [self.column] if self.column is self.id_column else [self.column, self.id_column]
+        return query.order_by(*(c.desc() if self.descending else c.asc() for c in columns))
+
+    def apply(self, query):
+        """Restrict query to the rows after the cursor and fetch one extra row."""
+        if self.after is not None:
+            key, row_id = self.after
+            if self.column is self.id_column:
+                bound, values = self.id_column, literal(row_id)
+            else:
+                bound = tuple_(self.column, self.id_column)
+                values = tuple_(literal(key), literal(row_id))
+            query = query.filter(bound < values if self.descending else bound > values)
+        return self.order(query).limit(self.limit + 1)
+
+    def page(self, rows, key=None) -> dict:
+        """
+        Build the response for rows fetched with apply().
+
+        Args:
+            rows: Result rows (one more than limit if there is a next page)
+            key: Function returning the (sort value, id) of a row; defaults
+                to reading the sort and id attributes of ORM objects
+        """
+        items = list(rows[:self.limit])
+        next_cursor = None
+        if len(rows) > self.limit and items:
+            last = items[-1]
+            if key is None:
+                sort_value, row_id = getattr(last, self.column.key), getattr(last, self.id_column.key)
+            else:
+                sort_value, row_id = key(last)
+            next_cursor = encode_cursor(self.sort, sort_value, row_id)
+        return {"items": items, "next_cursor": next_cursor}
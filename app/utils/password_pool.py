@@ -0,0 +1,105 @@
+"""
+Dedicated worker pool for bcrypt password hashing.
+Keeps CPU-heavy hashing off the request threadpool and sheds load with a 503
+when too many hashing jobs are already queued.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+from typing import Any, Callable
+import asyncio
+import os
+
+from fastapi import HTTPException, status
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# ============================================
+# CONFIGURATION
+# ============================================
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_POOL_MAX_QUEUE = int(os.getenv("PASSWORD_POOL_MAX_QUEUE", "32"))
+
+
+# ============================================
+# HASHING POOL
+# ============================================
+class PasswordHashingPool:
+    """
+    Size-limited thread pool for bcrypt work.
+
+    bcrypt releases the GIL while hashing, so worker threads run in parallel
+    while at most max_workers cores are used. Jobs beyond max_workers wait in
+    a queue of at most max_queue entries; further jobs are rejected.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._slots = BoundedSemaphore(max_workers + max_queue)
+        self._lock = Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _acquire(self) -> None:
+        """Reserve a slot or raise 503 when the queue is full."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
+        with self._lock:
+            self.in_flight += 1
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+        self._slots.release()
+
+    def submit(self, fn: Callable[..., Any], *args: Any):
+        """
+        Schedule fn on the pool.
+
+        Returns:
+            concurrent.futures.Future with the result of fn
+
+        Raises:
+            HTTPException: 503 if the queue-depth limit is reached
+        """
+        self._acquire()
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn on the pool and wait for its result (for sync handlers)."""
+        return self.submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn on the pool without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def stats(self) -> dict:
+        """Return pool size and load counters for monitoring."""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+password_pool = PasswordHashingPool(PASSWORD_POOL_WORKERS, PASSWORD_POOL_MAX_QUEUE)
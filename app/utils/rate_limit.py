@@ -0,0 +1,94 @@
+"""
+In-memory token-bucket rate limiting.
+Used to reject excess login attempts before any database or bcrypt work.
+"""
+from threading import Lock
+from typing import Dict, Tuple
+import math
+import time
+
+
+# ============================================
+# TOKEN BUCKET LIMITER
+# ============================================
+class TokenBucketLimiter:
+    """
+    Token buckets keyed by an arbitrary string (username, client IP...).
+
+    Each bucket is a (tokens, updated_at) tuple kept in a dict ordered by last
+    update. A bucket idle for a full refill period is indistinguishable from a
+    new one, so such buckets are evicted from the front of the dict on every
+    call; max_keys caps memory when many distinct keys arrive at once.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float, max_keys: int = 100_000):
+        """
+        Args:
+            capacity: Burst size (tokens available to a new key)
+            refill_per_second: Tokens regained per second
+            max_keys: Maximum number of buckets kept in memory
+        """
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.max_keys = max_keys
+        self._full_refill_seconds = self.capacity / self.refill_per_second if self.refill_per_second > 0 else math.inf
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = Lock()
+        self.allowed = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    def _evict(self, now: float) -> None:
+        """Drop idle (fully refilled) buckets and enforce max_keys (lock must be held)."""
+        buckets = self._buckets
+        while buckets:
+            key = next(iter(buckets))
+            _, updated_at = buckets[key]
+            if now - updated_at < self._full_refill_seconds and len(buckets) < self.max_keys:
+                break
+            del buckets[key]
+            self.evicted += 1
+
+    def acquire(self, key: str) -> Tuple[bool, float]:
+        """
+        Take one token from the bucket of key.
+
+        Returns:
+            (allowed, retry_after_seconds)
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+
+            tokens, updated_at = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.refill_per_second)
+
+            if tokens >= 1.0:
+                self._buckets[key] = (tokens - 1.0, now)
+                self.allowed += 1
+                return True, 0.0
+
+            self._buckets[key] = (tokens, now)
+            self.rejected += 1
+            if self.refill_per_second <= 0:
+                return False, math.inf
+            return False, (1.0 - tokens) / self.refill_per_second
+
+    def clear(self) -> None:
+        """Drop every bucket and reset the counters."""
+        with self._lock:
+            self._buckets.clear()
+            self.allowed = 0
+            self.rejected = 0
+            self.evicted = 0
+
+    def stats(self) -> dict:
+        """Return bucket count and counters for monitoring."""
+        with self._lock:
+            return {
+                "keys": len(self._buckets),
+                "max_keys": self.max_keys,
+                "allowed": self.allowed,
+                "rejected": self.rejected,
+                "evicted": self.evicted,
+            }
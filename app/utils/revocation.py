@@ -0,0 +1,166 @@
+"""
+Refresh-token revocation store.
+Keeps revoked token IDs (jti) in memory for O(1) checks, backed by the
+revoked_tokens table and pruned as soon as the tokens would expire anyway.
+"""
+from calendar import timegm
+from datetime import datetime, timedelta
+from heapq import heappop, heappush
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+import os
+import time
+
+from dotenv import load_dotenv
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.revoked_token import RevokedToken
+
+# Load environment variables
+load_dotenv()
+
+# How often each process pulls revocations made by other workers and prunes the table
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", "30"))
+
+
+def _to_timestamp(value: datetime) -> float:
+    """Convert a naive UTC datetime to a POSIX timestamp."""
+    return float(timegm(value.utctimetuple()))
+
+
+# ============================================
+# REVOCATION STORE
+# ============================================
+class TokenRevocationStore:
+    """
+    In-memory set of revoked jti values with an expiry-ordered heap.
+
+    Lookups are dictionary hits; the heap lets expired entries be dropped in
+    O(log n) each, so memory only holds tokens that could still be presented.
+    """
+
+    def __init__(self, sync_interval: float):
+        self.sync_interval = sync_interval
+        self._revoked: Dict[str, float] = {}
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._lock = Lock()
+        self._next_sync = 0.0
+        self._synced_since: Optional[datetime] = None
+        self.checks = 0
+        self.rejections = 0
+        self.pruned = 0
+
+    def _remember(self, jti: str, expires_ts: float) -> None:
+        """Add a jti to memory (lock must be held)."""
+        if expires_ts <= time.time():
+            return
+        if self._revoked.get(jti) != expires_ts:
+            heappush(self._expiry_heap, (expires_ts, jti))
+        self._revoked[jti] = expires_ts
+
+    def _prune_memory(self, now: float) -> None:
+        """Drop entries whose token has expired (lock must be held)."""
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_ts, jti = heappop(self._expiry_heap)
+            if self._revoked.get(jti) == expires_ts:
+                del self._revoked[jti]
+                self.pruned += 1
+
+    def sync(self, db: Session, force: bool = False) -> None:
+        """
+        Prune expired rows from the table and load revocations recorded by
+        other processes since the previous sync. Runs at most once per interval.
+
+        Args:
+            db: Database session
+            force: Sync even if the interval has not elapsed
+        """
+        now_monotonic = time.monotonic()
+        if not force and now_monotonic < self._next_sync:
+            return
+        self._next_sync = now_monotonic + self.sync_interval
+
+        now = datetime.utcnow()
+        db.query(RevokedToken).filter(RevokedToken.expires_at <= now).delete(synchronize_session=False)
+
+        query = db.query(RevokedToken.jti, RevokedToken.expires_at).filter(RevokedToken.expires_at > now)
+        if self._synced_since is not None:
+            query = query.filter(RevokedToken.revoked_at >= self._synced_since)
+        rows = query.all()
+        db.commit()
+
+        # Overlap the next window by one interval to tolerate slow commits elsewhere
+        self._synced_since = now - timedelta(seconds=self.sync_interval)
+        with self._lock:
+            for jti, expires_at in rows:
+                self._remember(jti, _to_timestamp(expires_at))
+
+    def is_revoked(self, db: Session, jti: str) -> bool:
+        """
+        Check whether a refresh token has been revoked.
+
+        Args:
+            db: Database session (only used when a periodic sync is due)
+            jti: JWT ID claim of the token
+
+        Returns:
+            True if the token must be rejected
+        """
+        self.sync(db)
+        with self._lock:
+            self._prune_memory(time.time())
+            self.checks += 1
+            revoked = jti in self._revoked
+            if revoked:
+                self.rejections += 1
+            return revoked
+
+    def revoke(self, db: Session, jti: str, expires_at: datetime) -> bool:
+        """
+        Revoke a refresh token until it expires.
+
+        Args:
+            db: Database session
+            jti: JWT ID claim of the token
+            expires_at: Token expiry as a naive UTC datetime
+
+        Returns:
+            False if the token had already been revoked, True otherwise
+        """
+        db.add(RevokedToken(jti=jti, expires_at=expires_at, revoked_at=datetime.utcnow()))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            with self._lock:
+                self._remember(jti, _to_timestamp(expires_at))
+            return False
+
+        with self._lock:
+            self._remember(jti, _to_timestamp(expires_at))
+        return True
+
+    def clear(self) -> None:
+        """Forget every in-memory entry and force a full sync on next use."""
+        with self._lock:
+            self._revoked.clear()
+            self._expiry_heap.clear()
+            self._next_sync = 0.0
+            self._synced_since = None
+            self.checks = 0
+            self.rejections = 0
+            self.pruned = 0
+
+    def stats(self) -> dict:
+        """Return store size and counters for monitoring."""
+        with self._lock:
+            return {
+                "size": len(self._revoked),
+                "checks": self.checks,
+                "rejections": self.rejections,
+                "pruned": self.pruned,
+            }
+
+
+revocation_store = TokenRevocationStore(REVOCATION_SYNC_SECONDS)
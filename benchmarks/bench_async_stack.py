@@ -0,0 +1,128 @@
+"""
+Sync vs async database stack under concurrent load.
+
+Serves the same CRUD reads from the sync routers (threadpool + Session) and
+from the async routers (event loop + AsyncSession) over one SQLite file, with
+N concurrent clients each issuing requests back to back, and reports
+throughput and tail latency for both stacks.
+
+Both engines use the application's pool settings (DB_POOL_*). Once the
+clients outnumber the pooled connections, sync handlers block threadpool
+threads on checkout while the requests holding connections wait for a thread
+to validate their response, so the sync stack stalls until DB_POOL_TIMEOUT;
+lower it (e.g. DB_POOL_TIMEOUT=5) to keep the sync run short.
+
+Usage:
+    python -m benchmarks.bench_async_stack --clients 200 --seconds 5
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks.common import make_sqlite_engine, override_db, percentile, summarize
+from benchmarks.bench_login_contention import seed
+
+
+def admin_user():
+    from app.models import User, UserRole
+
+    return User(id=1, username="bench_admin", password="x", role=UserRole.ADMIN)
+
+
+def build_sync_app(engine):
+    from app.routes import clients_router, vehicle_router, work_order_router
+    from app.utils.auth import get_current_active_user
+
+    app = FastAPI()
+    for router in (clients_router, vehicle_router, work_order_router):
+        app.include_router(router)
+    override_db(app, engine)
+    app.dependency_overrides[get_current_active_user] = admin_user
+    return app
+
+
+def build_async_app(path):
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.database.database import build_async_engine, get_async_db
+    from app.routes.aio import async_clients_router, async_vehicle_router, async_work_order_router
+    from app.utils.auth import get_current_active_user_async
+
+    async_engine = build_async_engine(f"sqlite:///{path}")
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    async def _get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app = FastAPI()
+    for router in (async_clients_router, async_vehicle_router, async_work_order_router):
+        app.include_router(router)
+    app.dependency_overrides[get_async_db] = _get_async_db
+    app.dependency_overrides[get_current_active_user_async] = admin_user
+    return app, async_engine
+
+
+async def load(app, clients: int, seconds: float):
+    """Run the request mix against app and return (elapsed_s, errors, latencies_ms)."""
+    paths = ["/work-orders/", "/clients/1", "/vehicles/1", "/work-orders/1"]
+    latencies, errors = [], 0
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    limits = httpx.Limits(max_connections=None)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+        started_at = time.perf_counter()
+        deadline = started_at + seconds
+
+        async def worker(offset):
+            nonlocal errors
+            i = offset
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.get(paths[i % len(paths)])
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    errors += 1
+                i += 1
+
+        await asyncio.gather(*(worker(n) for n in range(clients)))
+
+    return time.perf_counter() - started_at, errors, latencies
+
+
+async def run(clients: int, seconds: float):
+    from app.database.database import build_engine
+
+    seed_engine, path = make_sqlite_engine()
+    seed(override_db(FastAPI(), seed_engine))
+    seed_engine.dispose()
+
+    # Same pool class and settings as the application engine
+    engine = build_engine(f"sqlite:///{path}")
+
+    sync_app = build_sync_app(engine)
+    async_app, async_engine = build_async_app(path)
+
+    print(f"{clients} concurrent clients, {seconds:.0f}s per stack")
+    for label, app in (("sync (threadpool + Session)", sync_app), ("async (AsyncSession)", async_app)):
+        elapsed, errors, latencies = await load(app, clients, seconds)
+        summarize(label, latencies)
+        print(f"{'':<32} rps={len(latencies) / elapsed:8.1f} errors={errors} p99.9={percentile(latencies, 99.9):8.2f}ms")
+
+    await async_engine.dispose()
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Single vs bulk creates.
+
+Imports --items clients, one vehicle per client and --items work orders into
+a throwaway SQLite database twice: with one POST per item to /clients/,
+/vehicles/ and /work-orders/, then with one POST per --batch items to the
+/bulk endpoints, and reports the wall time and rows per second of each.
+
+Usage:
+    python -m benchmarks.bench_bulk --items 5000 --batch 1000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.bench_async_stack import build_sync_app
+from benchmarks.common import make_sqlite_engine
+
+
+def client_item(n):
+    return {"name": f"Imported Client {n}", "phone_number": "123456"}
+
+
+def vehicle_item(n, owner_id):
+    return {"vehicle_type": "Car", "brand_model": "Bench", "kilometers": 0, "plate_number": f"IMP-{n:07d}", "owner_id": owner_id}
+
+
+def work_order_item(client_id, vehicle_id):
+    return {"entry_date": "2025-01-01", "client_id": client_id, "vehicle_id": vehicle_id, "workers": "Bench", "details": "Imported"}
+
+
+async def single(client, items: int):
+    client_ids, vehicle_ids = [], []
+    for n in range(items):
+        response = await client.post("/clients/", json=client_item(n))
+        client_ids.append(response.raise_for_status().json()["id"])
+    for n, owner_id in enumerate(client_ids):
+        response = await client.post("/vehicles/", json=vehicle_item(n, owner_id))
+        vehicle_ids.append(response.raise_for_status().json()["id"])
+    for client_id, vehicle_id in zip(client_ids, vehicle_ids):
+        (await client.post("/work-orders/", json=work_order_item(client_id, vehicle_id))).raise_for_status()
+
+
+async def bulk(client, items: int, batch: int):
+    async def post(path, payload):
+        data = (await client.post(path, json=payload)).raise_for_status().json()
+        assert not data["errors"], data["errors"][:3]
+        return [row["id"] for row in data["created"]]
+
+    client_ids, vehicle_ids = [], []
+    for start in range(0, items, batch):
+        client_ids += await post("/clients/bulk", [client_item(n) for n in range(start, min(items, start + batch))])
+    for start in range(0, items, batch):
+        chunk = list(enumerate(client_ids))[start:start + batch]
+        vehicle_ids += await post("/vehicles/bulk", [vehicle_item(n, owner_id) for n, owner_id in chunk])
+    pairs = list(zip(client_ids, vehicle_ids))
+    for start in range(0, items, batch):
+        await post("/work-orders/bulk", [work_order_item(c, v) for c, v in pairs[start:start + batch]])
+
+
+async def run(items: int, batch: int):
+    for label in ("single", "bulk"):
+        engine, _ = make_sqlite_engine()
+        transport = httpx.ASGITransport(app=build_sync_app(engine))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            started = time.perf_counter()
+            await (single(client, items) if label == "single" else bulk(client, items, batch))
+            elapsed = time.perf_counter() - started
+        print(f"{label:<8} {3 * items} rows in {elapsed:6.2f}s ({3 * items / elapsed:8.0f} rows/s)")
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.items, args.batch))
+
+
+if __name__ == "__main__":
+    main()
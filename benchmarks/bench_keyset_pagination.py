@@ -0,0 +1,98 @@
+"""
+Offset vs keyset pagination on a large work-order table.
+
+Fills a throwaway SQLite database with --rows work orders, then times
+GET /work-orders/ for page 1 and page --page (of --limit rows) both with
+skip/limit and with a cursor, sorted by -entry_date. Keyset pages cost the
+same at any depth; offset pages grow with the number of skipped rows.
+
+Usage:
+    python -m benchmarks.bench_keyset_pagination --rows 1000000 --page 10000
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+
+import httpx
+from sqlalchemy import insert
+
+from benchmarks.bench_async_stack import build_sync_app
+from benchmarks.common import make_sqlite_engine, summarize
+
+
+def seed(engine, rows: int):
+    from app.models import Client, Vehicle, WorkOrder
+
+    with engine.begin() as conn:
+        conn.execute(insert(Client), [{"id": 1, "name": "Bench Client", "phone_number": "123456"}])
+        conn.execute(insert(Vehicle), [{
+            "id": 1, "vehicle_type": "Car", "brand_model": "Bench", "kilometers": 0,
+            "plate_number": "BEN-001", "owner_id": 1,
+        }])
+        start = date(2015, 1, 1)
+        for offset in range(0, rows, 50_000):
+            conn.execute(insert(WorkOrder), [
+                {
+                    # About 270 orders per day, so entry_date ties are common
+                    "entry_date": start + timedelta(days=n // 270), "client_id": 1, "vehicle_id": 1,
+                    "work_status": "PENDING", "payment_status": "NOT_PAID", "workers": "Bench",
+                }
+                for n in range(offset, min(rows, offset + 50_000))
+            ])
+
+
+async def run(rows: int, page: int, limit: int, repeat: int):
+    from app.models import WorkOrder
+    from app.utils.pagination import encode_cursor
+
+    engine, _ = make_sqlite_engine()
+    started = time.perf_counter()
+    seed(engine, rows)
+    print(f"seeded {rows} work orders in {time.perf_counter() - started:.1f}s")
+
+    # Cursor pointing just before the requested page (computed outside the timings)
+    skip = (page - 1) * limit
+    with engine.connect() as conn:
+        boundary = conn.execute(
+            WorkOrder.__table__.select()
+            .with_only_columns(WorkOrder.entry_date, WorkOrder.id)
+            .order_by(WorkOrder.entry_date.desc(), WorkOrder.id.desc())
+            .offset(skip - 1).limit(1)
+        ).one()
+    deep_cursor = encode_cursor("-entry_date", boundary.entry_date, boundary.id)
+
+    cases = [
+        ("offset page 1", {"skip": 0}),
+        (f"offset page {page}", {"skip": skip}),
+        ("keyset page 1", {"cursor": ""}),
+        (f"keyset page {page}", {"cursor": deep_cursor}),
+    ]
+
+    transport = httpx.ASGITransport(app=build_sync_app(engine))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, params in cases:
+            params = {**params, "limit": limit, "sort": "-entry_date"}
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                response = await client.get("/work-orders/", params=params)
+                samples.append((time.perf_counter() - started) * 1000)
+                response.raise_for_status()
+            summarize(label, samples)
+
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.page, args.limit, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+CRUD latency during a login burst.
+
+Measures /work-orders/ read latency with the readers alone, then again while
+--logins clients keep calling /auth/login (bcrypt bound) back to back, and
+reports login throughput, rejected logins and both read latencies. Logins
+await bcrypt on the password pool, so the burst should not hold the
+threadpool threads the reads run on (AnyIO's default limit is 40).
+
+On machines with few cores bcrypt also competes with the reads for CPU;
+--simulated-bcrypt-ms replaces the check with a sleep of that length to
+measure the threadpool effect alone (PASSWORD_POOL_WORKERS sets the pool).
+
+Usage:
+    python -m benchmarks.bench_login_contention --logins 40 --readers 10 --seconds 5
+    PASSWORD_POOL_WORKERS=4 python -m benchmarks.bench_login_contention --simulated-bcrypt-ms 250
+"""
+import argparse
+import asyncio
+import time
+from datetime import date
+
+import httpx
+
+from benchmarks.common import make_sqlite_engine, override_db, summarize
+
+
+def seed(SessionLocal):
+    from app.models import Client, PaymentStatus, User, UserRole, Vehicle, WorkOrder, WorkStatus
+    from app.utils.auth import hash_password
+
+    db = SessionLocal()
+    db.add(User(username="bench_admin", password=hash_password("Bench!1"), role=UserRole.ADMIN))
+    client = Client(name="Bench Client", phone_number="123456")
+    db.add(client)
+    db.flush()
+    vehicle = Vehicle(vehicle_type="Car", brand_model="Bench", kilometers=0, plate_number="BEN-001", owner_id=client.id)
+    db.add(vehicle)
+    db.flush()
+    db.add_all([
+        WorkOrder(
+            entry_date=date.today(), client_id=client.id, vehicle_id=vehicle.id,
+            work_status=WorkStatus.PENDING, payment_status=PaymentStatus.NOT_PAID, workers="Bench",
+        )
+        for _ in range(100)
+    ])
+    db.commit()
+    db.close()
+
+
+async def run(logins: int, readers: int, seconds: float, simulated_bcrypt_ms: float):
+    import app.utils.auth as auth
+    from app.main import app
+
+    # The burst comes from one client and one user: measure hashing, not admission control
+    auth.LOGIN_RATE_LIMIT_ENABLED = False
+    if simulated_bcrypt_ms:
+        auth.verify_password = lambda plain, hashed: time.sleep(simulated_bcrypt_ms / 1000) or True
+
+    engine, _ = make_sqlite_engine()
+    SessionLocal = override_db(app, engine)
+    seed(SessionLocal)
+
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+        credentials = {"username": "bench_admin", "password": "Bench!1"}
+        token = (await client.post("/auth/login", json=credentials)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        async def reader(deadline, latencies):
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                await client.get("/work-orders/", headers=headers)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        idle_latencies = []
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(*(reader(deadline, idle_latencies) for _ in range(readers)))
+
+        read_latencies, login_latencies = [], []
+        outcome = {"ok": 0, "rejected": 0}
+
+        async def login(deadline):
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.post("/auth/login", json=credentials)
+                login_latencies.append((time.perf_counter() - start) * 1000)
+                outcome["ok" if response.status_code == 200 else "rejected"] += 1
+
+        started = time.perf_counter()
+        deadline = started + seconds
+        await asyncio.gather(
+            *(reader(deadline, read_latencies) for _ in range(readers)),
+            *(login(deadline) for _ in range(logins)),
+        )
+        elapsed = time.perf_counter() - started
+
+    print(f"logins ok={outcome['ok']} rejected(503)={outcome['rejected']} "
+          f"throughput={outcome['ok'] / elapsed:.1f} logins/s")
+    summarize("login latency", login_latencies)
+    summarize("/work-orders/ read (idle)", idle_latencies)
+    summarize("/work-orders/ read (burst)", read_latencies)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--readers", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--simulated-bcrypt-ms", type=float, default=0, help="sleep instead of checking the password")
+    args = parser.parse_args()
+    asyncio.run(run(args.logins, args.readers, args.seconds, args.simulated_bcrypt_ms))
@@ -0,0 +1,114 @@
+"""
+Typeahead lookups at scale.
+
+Fills a throwaway SQLite database with --vehicles vehicles (and one client per
+two vehicles), then times plate and client-name prefix lookups for random
+2-4 character prefixes, served from the database indexes and from the
+in-process sorted index. lookup_vehicles()/lookup_clients() are timed
+directly, and GET /vehicles/lookup end to end.
+
+Usage:
+    python -m benchmarks.bench_lookup --vehicles 500000
+"""
+import argparse
+import asyncio
+import random
+import string
+import time
+
+import httpx
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.bench_async_stack import build_sync_app
+from benchmarks.common import make_sqlite_engine, summarize
+
+NAMES = ["José", "María", "Lucía", "Martín", "Sofía", "Andrés", "Valentina", "Joaquín", "Camila", "Tomás"]
+
+
+def plate(rng):
+    return "".join(rng.choices(string.ascii_uppercase, k=3)) + "-" + "".join(rng.choices(string.digits, k=4))
+
+
+def seed(engine, vehicles: int):
+    from app.models import Client, Vehicle
+
+    rng = random.Random(11)
+    clients = max(1, vehicles // 2)
+    plates = set()
+    while len(plates) < vehicles:
+        plates.add(plate(rng))
+
+    with engine.begin() as conn:
+        conn.execute(insert(Client), [
+            {"id": n, "name": f"{rng.choice(NAMES)} {rng.choice(NAMES)}ez {n}", "phone_number": "123456"}
+            for n in range(1, clients + 1)
+        ])
+        conn.execute(insert(Vehicle), [
+            {"id": n, "vehicle_type": "Car", "brand_model": "Bench", "kilometers": 0, "plate_number": p, "owner_id": (n - 1) % clients + 1}
+            for n, p in enumerate(sorted(plates, key=lambda _: rng.random()), start=1)
+        ])
+
+
+def prefixes(rng, count, alphabet, lengths=(2, 3, 4)):
+    return ["".join(rng.choices(alphabet, k=rng.choice(lengths))) for _ in range(count)]
+
+
+def time_calls(label, func, args_list):
+    samples = []
+    for args in args_list:
+        started = time.perf_counter()
+        func(*args)
+        samples.append((time.perf_counter() - started) * 1000)
+    summarize(label, samples)
+
+
+async def run(vehicles: int, limit: int, repeat: int):
+    from app.database import lookup
+
+    engine, _ = make_sqlite_engine()
+    started = time.perf_counter()
+    seed(engine, vehicles)
+    print(f"seeded {vehicles} vehicles in {time.perf_counter() - started:.1f}s")
+
+    rng = random.Random(3)
+    plate_prefixes = prefixes(rng, repeat, string.ascii_uppercase)
+    name_prefixes = prefixes(rng, repeat, "jmlsavct", lengths=(1, 2, 3))
+    SessionLocal = sessionmaker(bind=engine, future=True)
+
+    for memory in (False, True):
+        lookup.LOOKUP_MEMORY_INDEX = memory
+        mode = "memory" if memory else "db"
+        with SessionLocal() as db:
+            if memory:
+                started = time.perf_counter()
+                lookup.lookup_vehicles(db, "A", 1)
+                lookup.lookup_clients(db, "a", 1)
+                print(f"loaded the memory indexes in {time.perf_counter() - started:.1f}s")
+            time_calls(f"{mode} lookup_vehicles", lookup.lookup_vehicles, [(db, p, limit) for p in plate_prefixes])
+            time_calls(f"{mode} lookup_clients", lookup.lookup_clients, [(db, p, limit) for p in name_prefixes])
+
+        transport = httpx.ASGITransport(app=build_sync_app(engine))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            samples = []
+            for p in plate_prefixes:
+                started = time.perf_counter()
+                response = await client.get("/vehicles/lookup", params={"prefix": p, "limit": limit})
+                samples.append((time.perf_counter() - started) * 1000)
+                response.raise_for_status()
+            summarize(f"{mode} GET /vehicles/lookup", samples)
+
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vehicles", type=int, default=500_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.vehicles, args.limit, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Nested listings on growing tables.
+
+For each size in --sizes, fills a throwaway SQLite database with that many
+work orders (--per-vehicle orders per vehicle, two vehicles per client) and
+times one cursor page of GET /clients/{id}/vehicles and
+GET /vehicles/{id}/work-orders for a client and vehicle in the middle of the
+table. Latency and response size stay flat as the tables grow, since each
+page is read through the owner_id / (vehicle_id, entry_date) indexes.
+
+Usage:
+    python -m benchmarks.bench_nested_lists --sizes 10000,100000,1000000
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+
+import httpx
+from sqlalchemy import insert
+
+from benchmarks.bench_async_stack import build_sync_app
+from benchmarks.common import make_sqlite_engine, summarize
+
+
+def seed(engine, orders: int, per_vehicle: int):
+    from app.models import Client, Vehicle, WorkOrder
+
+    vehicles = max(1, orders // per_vehicle)
+    clients = max(1, vehicles // 2)
+    start = date(2015, 1, 1)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Client), [
+            {"id": n, "name": f"Client {n}", "phone_number": "123456"} for n in range(1, clients + 1)
+        ])
+        conn.execute(insert(Vehicle), [
+            {
+                "id": n, "vehicle_type": "Car", "brand_model": "Bench", "kilometers": 0,
+                "plate_number": f"BEN-{n:07d}", "owner_id": (n - 1) % clients + 1,
+            }
+            for n in range(1, vehicles + 1)
+        ])
+        for offset in range(0, orders, 50_000):
+            conn.execute(insert(WorkOrder), [
+                {
+                    "entry_date": start + timedelta(days=n % 3650), "client_id": (n % vehicles) % clients + 1,
+                    "vehicle_id": n % vehicles + 1, "work_status": "PENDING", "payment_status": "NOT_PAID",
+                    "workers": "Bench",
+                }
+                for n in range(offset, min(orders, offset + 50_000))
+            ])
+
+    return clients // 2 or 1, vehicles // 2 or 1
+
+
+async def run(sizes, per_vehicle: int, limit: int, repeat: int):
+    for size in sizes:
+        engine, _ = make_sqlite_engine()
+        started = time.perf_counter()
+        client_id, vehicle_id = seed(engine, size, per_vehicle)
+        print(f"\nseeded {size} work orders in {time.perf_counter() - started:.1f}s")
+
+        cases = [
+            (f"/clients/{client_id}/vehicles", "id"),
+            (f"/vehicles/{vehicle_id}/work-orders", "-entry_date"),
+        ]
+
+        transport = httpx.ASGITransport(app=build_sync_app(engine))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for path, sort in cases:
+                params = {"cursor": "", "limit": limit, "sort": sort}
+                samples = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    response = await client.get(path, params=params)
+                    samples.append((time.perf_counter() - started) * 1000)
+                    response.raise_for_status()
+                label = path.split("/")[-1]
+                summarize(f"{label} ({len(response.content)} bytes)", samples)
+
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        type=lambda value: [int(size) for size in value.split(",")])
+    parser.add_argument("--per-vehicle", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.per_vehicle, args.limit, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Full-text search vs substring matching.
+
+Fills a throwaway SQLite database with --rows work orders (random details and
+spare parts from a small vocabulary, one vehicle per 20 orders), builds the
+FTS5 index, then times GET /search/?q= against GET /work-orders/expanded?q=
+(LIKE '%q%' over the same fields, SQLite's ILIKE) for a common word, a rare
+word, a plate and a two-word query.
+
+Usage:
+    python -m benchmarks.bench_search --rows 1000000
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+
+import httpx
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.bench_async_stack import build_sync_app
+from benchmarks.common import make_sqlite_engine, summarize
+
+COMMON = ["compressor", "leak", "recharge", "filter", "vent", "noise", "gas", "belt", "fan", "sensor"]
+RARE = "evaporator"
+
+
+def seed(engine, rows: int):
+    from app.models import Client, Vehicle, WorkOrder
+
+    rng = random.Random(7)
+    vehicles = max(1, rows // 20)
+    start = date(2015, 1, 1)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Client), [
+            {"id": n, "name": f"Client {n}", "phone_number": "123456"} for n in range(1, vehicles + 1)
+        ])
+        conn.execute(insert(Vehicle), [
+            {
+                "id": n, "vehicle_type": "Car", "brand_model": "Bench", "kilometers": 0,
+                "plate_number": f"BEN{n:07d}", "owner_id": n,
+            }
+            for n in range(1, vehicles + 1)
+        ])
+        for offset in range(0, rows, 50_000):
+            batch = []
+            for n in range(offset, min(rows, offset + 50_000)):
+                words = rng.sample(COMMON, 4)
+                if n % 10_000 == 0:
+                    words[0] = RARE
+                vehicle_id = n % vehicles + 1
+                batch.append({
+                    "entry_date": start + timedelta(days=n % 3650), "client_id": vehicle_id, "vehicle_id": vehicle_id,
+                    "work_status": "PENDING", "payment_status": "NOT_PAID", "workers": "Bench",
+                    "details": " ".join(words[:3]), "spare_parts": words[3],
+                })
+            conn.execute(insert(WorkOrder), batch)
+
+    return vehicles
+
+
+async def run(rows: int, limit: int, repeat: int):
+    from app.database.search import rebuild_search_index
+    from app.routes import search_router
+
+    engine, _ = make_sqlite_engine()
+    started = time.perf_counter()
+    vehicles = seed(engine, rows)
+    print(f"seeded {rows} work orders in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    with sessionmaker(bind=engine, future=True)() as session:
+        rebuild_search_index(session)
+    print(f"built the search index in {time.perf_counter() - started:.1f}s")
+
+    queries = ["compressor", RARE, f"BEN{vehicles // 2:07d}", "leak sensor"]
+
+    app = build_sync_app(engine)
+    app.include_router(search_router)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for q in queries:
+            for label, path in (("fts", "/search/"), ("like", "/work-orders/expanded")):
+                samples = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    response = await client.get(path, params={"q": q, "limit": limit})
+                    samples.append((time.perf_counter() - started) * 1000)
+                    response.raise_for_status()
+                summarize(f"{label} {q!r} ({len(response.json())} hits)", samples)
+
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.limit, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Full vs sparse work-order pages.
+
+Fills a throwaway SQLite database with --rows work orders whose details and
+spare parts are filled to their maximum length (1000 and 500 chars), then
+times cursor pages of GET /work-orders/ and /work-orders/expanded with every
+field and with ?fields= naming the columns a table shows, reporting latency
+and response size.
+
+Usage:
+    python -m benchmarks.bench_sparse_fields --rows 100000 --limit 500
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+
+import httpx
+from sqlalchemy import insert
+
+from benchmarks.bench_async_stack import build_sync_app
+from benchmarks.common import make_sqlite_engine, summarize
+
+TABLE_FIELDS = "id,entry_date,work_status,payment_status,workers"
+
+
+def seed(engine, rows: int):
+    from app.models import Client, Vehicle, WorkOrder
+
+    vehicles = max(1, rows // 20)
+    start = date(2015, 1, 1)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Client), [
+            {"id": n, "name": f"Client {n}", "phone_number": "123456"} for n in range(1, vehicles + 1)
+        ])
+        conn.execute(insert(Vehicle), [
+            {
+                "id": n, "vehicle_type": "Car", "brand_model": "Bench", "kilometers": 0,
+                "plate_number": f"BEN{n:07d}", "owner_id": n,
+            }
+            for n in range(1, vehicles + 1)
+        ])
+        for offset in range(0, rows, 50_000):
+            conn.execute(insert(WorkOrder), [
+                {
+                    "entry_date": start + timedelta(days=n % 3650), "client_id": n % vehicles + 1,
+                    "vehicle_id": n % vehicles + 1, "work_status": "PENDING", "payment_status": "NOT_PAID",
+                    "workers": "Bench", "details": "d" * 1000, "spare_parts": "s" * 500, "hours": 2,
+                }
+                for n in range(offset, min(rows, offset + 50_000))
+            ])
+
+
+async def run(rows: int, limit: int, repeat: int):
+    engine, _ = make_sqlite_engine()
+    started = time.perf_counter()
+    seed(engine, rows)
+    print(f"seeded {rows} work orders in {time.perf_counter() - started:.1f}s")
+
+    transport = httpx.ASGITransport(app=build_sync_app(engine))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ("/work-orders/", "/work-orders/expanded"):
+            for fields in (None, TABLE_FIELDS):
+                params = {"cursor": "", "limit": limit, "sort": "-entry_date"}
+                if fields:
+                    params["fields"] = fields
+                samples = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    response = await client.get(path, params=params)
+                    samples.append((time.perf_counter() - started) * 1000)
+                    response.raise_for_status()
+                label = "sparse" if fields else "full"
+                summarize(f"{label} {path} ({len(response.content)} bytes)", samples)
+
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.limit, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
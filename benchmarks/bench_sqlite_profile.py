@@ -0,0 +1,113 @@
+"""
+SQLite read/write concurrency with and without the tuned connection profile.
+
+Runs concurrent readers (work-order and client GETs) next to concurrent
+writers (work-order POSTs and PUTs) against the sync CRUD routes, once on a
+database in SQLite's default rollback-journal mode and once with the
+SQLITE_PROFILE=tuned pragmas (WAL, synchronous=NORMAL, mmap, cache,
+busy_timeout, temp_store), and reports throughput and latency of both.
+
+Keep readers + writers within the pool (DB_POOL_SIZE + DB_MAX_OVERFLOW).
+Use --dir to place the database on the disk the shop server actually uses:
+the rollback journal pays several fsyncs per commit, WAL with
+synchronous=NORMAL pays none until checkpoints, so tmpfs hides most of it.
+
+Usage:
+    python -m benchmarks.bench_sqlite_profile --readers 8 --writers 4 --seconds 5 --dir .
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date
+
+import httpx
+from sqlalchemy import text
+
+from benchmarks.bench_async_stack import build_sync_app
+from benchmarks.bench_login_contention import seed
+from benchmarks.common import make_sqlite_engine, override_db, percentile, summarize
+
+
+async def load(app, readers: int, writers: int, seconds: float):
+    """Run readers and writers side by side; return per-kind latencies and errors."""
+    read_paths = ["/work-orders/", "/clients/1", "/work-orders/1"]
+    samples = {"read": [], "write": []}
+    errors = {"read": 0, "write": 0}
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        deadline = time.perf_counter() + seconds
+
+        async def reader(offset):
+            i = offset
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.get(read_paths[i % len(read_paths)])
+                samples["read"].append((time.perf_counter() - started) * 1000)
+                errors["read"] += response.status_code != 200
+                i += 1
+
+        async def writer(offset):
+            i = offset
+            payload = {"entry_date": str(date.today()), "client_id": 1, "vehicle_id": 1, "workers": "Bench"}
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                if i % 2:
+                    response = await client.put(f"/work-orders/{i % 100 + 1}", json={"workers": f"Bench {i}"})
+                else:
+                    response = await client.post("/work-orders/", json=payload)
+                samples["write"].append((time.perf_counter() - started) * 1000)
+                errors["write"] += response.status_code not in (200, 201)
+                i += 1
+
+        await asyncio.gather(
+            *(reader(n) for n in range(readers)),
+            *(writer(n) for n in range(writers)),
+        )
+
+    return samples, errors
+
+
+async def run(readers: int, writers: int, seconds: float, directory: str = None):
+    from app.database.database import build_engine
+
+    print(f"{readers} readers + {writers} writers, {seconds:.0f}s per profile")
+    for profile in ("default", "tuned"):
+        fd, path = tempfile.mkstemp(suffix=".db", dir=directory)
+        os.close(fd)
+        seed_engine, _ = make_sqlite_engine(path)
+        seed(override_db(build_sync_app(seed_engine), seed_engine))
+        seed_engine.dispose()
+
+        engine = build_engine(f"sqlite:///{path}", sqlite_profile=profile)
+        with engine.connect() as conn:
+            journal = conn.execute(text("PRAGMA journal_mode")).scalar()
+
+        samples, errors = await load(build_sync_app(engine), readers, writers, seconds)
+        print(f"-- {profile} (journal_mode={journal})")
+        for kind in ("read", "write"):
+            summarize(f"  {kind}s", samples[kind])
+            print(
+                f"{'':<32} rps={len(samples[kind]) / seconds:8.1f} "
+                f"errors={errors[kind]} p99.9={percentile(samples[kind], 99.9):8.2f}ms"
+            )
+        engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--dir", default=None, help="directory for the database files (default: system temp)")
+    args = parser.parse_args()
+    asyncio.run(run(args.readers, args.writers, args.seconds, args.dir))
+
+
+if __name__ == "__main__":
+    main()
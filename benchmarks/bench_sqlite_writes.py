@@ -0,0 +1,118 @@
+"""
+Sustained SQLite write throughput with and without the single writer.
+
+Concurrent clients POST work orders and vehicles back to back through the
+sync CRUD routes. "shared pool" lets every request write on its own pooled
+connection (SQLITE_SINGLE_WRITER=false); "single writer" routes flushes and
+commits through one dedicated connection while reads keep the pool. Both
+runs use the same SQLITE_PROFILE; pass --profile default to compare on the
+rollback journal, where lock contention is worst.
+
+Usage:
+    python -m benchmarks.bench_sqlite_writes --writers 12 --seconds 5
+"""
+import argparse
+import asyncio
+import itertools
+import time
+from datetime import date
+
+import httpx
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.bench_async_stack import build_sync_app
+from benchmarks.bench_login_contention import seed
+from benchmarks.common import make_sqlite_engine, override_db, percentile, summarize
+
+
+def override_routing_db(app, engine, writer):
+    """Point get_db at a session routing writes to writer and reads to engine."""
+    from app.database.database import get_db
+    from app.database.routing import RoutingSession
+
+    SessionLocal = sessionmaker(
+        bind=engine, class_=RoutingSession, primary=writer, replica=engine,
+        replica_lag_free=True, autoflush=False, autocommit=False, future=True,
+    )
+
+    def _get_db():
+        db = SessionLocal()
+        db.info["replica"] = True
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _get_db
+
+
+async def load(app, writers: int, seconds: float):
+    """Run writers back to back; return (latencies_ms, error statuses)."""
+    latencies, errors = [], {}
+    plates = itertools.count()
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    work_order = {"entry_date": str(date.today()), "client_id": 1, "vehicle_id": 1, "workers": "Bench"}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        deadline = time.perf_counter() + seconds
+
+        async def writer(offset):
+            i = offset
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                if i % 2:
+                    vehicle = {
+                        "vehicle_type": "Car", "brand_model": "Bench", "kilometers": 0,
+                        "plate_number": f"W-{next(plates)}", "owner_id": 1,
+                    }
+                    response = await client.post("/vehicles/", json=vehicle)
+                else:
+                    response = await client.post("/work-orders/", json=work_order)
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code not in (200, 201):
+                    errors[response.status_code] = errors.get(response.status_code, 0) + 1
+                i += 1
+
+        await asyncio.gather(*(writer(n) for n in range(writers)))
+
+    return latencies, errors
+
+
+async def run(writers: int, seconds: float, profile: str):
+    from app.database.database import SINGLE_WRITER_POOL, build_engine
+
+    print(f"{writers} concurrent writers, {seconds:.0f}s per mode, SQLITE_PROFILE={profile}")
+    for mode in ("shared pool", "single writer"):
+        seed_engine, path = make_sqlite_engine()
+        seed(override_db(build_sync_app(seed_engine), seed_engine))
+        seed_engine.dispose()
+
+        url = f"sqlite:///{path}"
+        engine = build_engine(url, sqlite_profile=profile)
+        writer = build_engine(url, sqlite_profile=profile, **SINGLE_WRITER_POOL) if mode == "single writer" else None
+
+        app = build_sync_app(engine)
+        if writer is not None:
+            override_routing_db(app, engine, writer)
+
+        latencies, errors = await load(app, writers, seconds)
+        summarize(mode, latencies)
+        ok = len(latencies) - sum(errors.values())
+        print(f"{'':<32} writes/s={ok / seconds:8.1f} errors={errors or 0} p99.9={percentile(latencies, 99.9):8.2f}ms")
+
+        engine.dispose()
+        if writer is not None:
+            writer.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=12)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--profile", default="tuned", choices=("tuned", "default"))
+    args = parser.parse_args()
+    asyncio.run(run(args.writers, args.seconds, args.profile))
+
+
+if __name__ == "__main__":
+    main()
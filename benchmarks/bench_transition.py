@@ -0,0 +1,74 @@
+"""
+Per-order PUTs vs one bulk status transition.
+
+Fills a throwaway SQLite database with --rows work orders spread over ten
+years, then marks one month of them as PAID twice: with one
+PUT /work-orders/{id} per order, and (after resetting them) with a single
+PATCH /work-orders/status?date_from=&date_to=.
+
+Usage:
+    python -m benchmarks.bench_transition --rows 1000000
+"""
+import argparse
+import asyncio
+import time
+from datetime import date
+
+import httpx
+from sqlalchemy import select, update
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.bench_async_stack import build_sync_app
+from benchmarks.bench_nested_lists import seed
+from benchmarks.common import make_sqlite_engine
+
+MONTH = {"date_from": "2020-03-01", "date_to": "2020-03-31"}
+
+
+async def run(rows: int):
+    from app.database.counters import reconcile_counters
+    from app.models import WorkOrder, PaymentStatus
+
+    engine, _ = make_sqlite_engine()
+    started = time.perf_counter()
+    seed(engine, rows, per_vehicle=20)
+    Session = sessionmaker(bind=engine, future=True)
+    with Session() as session:
+        reconcile_counters(session, fix=True)
+    print(f"seeded {rows} work orders in {time.perf_counter() - started:.1f}s")
+
+    in_month = WorkOrder.entry_date.between(date(2020, 3, 1), date(2020, 3, 31))
+    with Session() as session:
+        ids = session.scalars(select(WorkOrder.id).where(in_month)).all()
+
+    transport = httpx.ASGITransport(app=build_sync_app(engine))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        started = time.perf_counter()
+        for work_order_id in ids:
+            (await client.put(f"/work-orders/{work_order_id}", json={"payment_status": "PAID"})).raise_for_status()
+        print(f"put     {len(ids)} orders in {time.perf_counter() - started:6.2f}s")
+
+        with Session() as session:
+            session.execute(update(WorkOrder).where(in_month).values(payment_status=PaymentStatus.NOT_PAID))
+            session.commit()
+            reconcile_counters(session, fix=True)
+
+        started = time.perf_counter()
+        response = await client.patch("/work-orders/status", params=MONTH, json={"payment_status": "PAID"})
+        updated = response.raise_for_status().json()["updated"]
+        print(f"patch   {updated} orders in {time.perf_counter() - started:6.2f}s")
+
+    with Session() as session:
+        assert reconcile_counters(session) == {}
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Shared helpers for the benchmark scripts.
+Builds a throwaway SQLite database and an in-process HTTP client for the app.
+"""
+import os
+import statistics
+import tempfile
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base
+
+
+def make_sqlite_engine(path: str = None):
+    """Create a file-backed SQLite engine with every table created."""
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False}, future=True)
+    Base.metadata.create_all(bind=engine)
+    return engine, path
+
+
+def override_db(app, engine):
+    """Point the app's get_db dependency at the given engine."""
+    from app.database.database import get_db
+
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+
+    def _get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    return SessionLocal
+
+
+def percentile(samples, pct):
+    """Return the pct percentile (0-100) of a list of numbers."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(label, samples_ms):
+    """Print count, median and tail latency for a list of millisecond samples."""
+    if not samples_ms:
+        print(f"{label:<32} no samples")
+        return
+    print(
+        f"{label:<32} n={len(samples_ms):<6} "
+        f"p50={statistics.median(samples_ms):8.2f}ms "
+        f"p99={percentile(samples_ms, 99):8.2f}ms"
+    )
@@ -0,0 +1,151 @@
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import bulk, lookup
+from app.database.counters import reconcile_counters
+from app.database.search import search_terms, search_work_orders
+from app.models import Client, Vehicle, WorkOrder
+from app.models.base import Base
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, future=True)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture()
+def vehicle(session):
+    owner = Client(name="Bulk Client", phone_number="123456")
+    vehicle = Vehicle(vehicle_type="Car", brand_model="Corolla", kilometers=10, plate_number="BLK-001", owner=owner)
+    session.add(vehicle)
+    session.commit()
+    return vehicle
+
+
+def order(vehicle, **fields):
+    return {"entry_date": "2025-01-01", "client_id": vehicle.owner_id, "vehicle_id": vehicle.id, "workers": "Ana", **fields}
+
+
+def test_work_orders_are_inserted_in_chunks_with_counters_and_search(session, vehicle, monkeypatch):
+    monkeypatch.setattr(bulk, "BULK_CHUNK_SIZE", 2)
+    items = [
+        order(vehicle, details="Compressor leak"),
+        order(vehicle, vehicle_id=999),
+        order(vehicle, payment_status="PAID"),
+        order(vehicle, workers=""),
+        order(vehicle, details="Compressor belt"),
+    ]
+
+    result = bulk.bulk_create_work_orders(session, items)
+
+    assert [row.details for row in result["created"]] == ["Compressor leak", None, "Compressor belt"]
+    assert [(error["index"], error["detail"]) for error in result["errors"]][0] == (1, "Vehicle not found")
+    assert result["errors"][1]["index"] == 3
+    assert session.scalar(select(WorkOrder.id).where(WorkOrder.workers == "")) is None
+
+    assert reconcile_counters(session) == {}
+    query = search_work_orders(select(WorkOrder.id), search_terms("compressor"), "sqlite")
+    assert sorted(session.scalars(query)) == [result["created"][0].id, result["created"][2].id]
+
+
+def test_work_order_references_are_checked(session, vehicle):
+    other = Client(name="Other", phone_number="1")
+    session.add(other)
+    session.commit()
+
+    result = bulk.bulk_create_work_orders(session, [order(vehicle, client_id=other.id), order(vehicle, client_id=999)])
+
+    assert result["created"] == []
+    assert [error["detail"] for error in result["errors"]] == [
+        "Vehicle does not belong to the specified client",
+        "Client not found",
+    ]
+
+
+def test_vehicle_plates_taken_or_repeated_in_the_batch_are_rejected(session, vehicle, monkeypatch):
+    monkeypatch.setattr(lookup, "LOOKUP_MEMORY_INDEX", True)
+    lookup.vehicle_index.invalidate()
+    assert len(lookup.lookup_vehicles(session, "BLK", 10)) == 1  # loads the memory index
+    new = {"vehicle_type": "Car", "brand_model": "Uno", "kilometers": 0, "owner_id": vehicle.owner_id}
+
+    result = bulk.bulk_create_vehicles(session, [
+        {**new, "plate_number": "blk-002"},
+        {**new, "plate_number": "BLK-001"},
+        {**new, "plate_number": "BLK-002"},
+        {**new, "plate_number": "BLK-003", "owner_id": 999},
+    ])
+
+    assert [row.plate_number for row in result["created"]] == ["BLK-002"]
+    assert [(error["index"], error["detail"]) for error in result["errors"]] == [
+        (1, "Plate number already exists"),
+        (2, "Plate number already exists"),
+        (3, "Owner not found"),
+    ]
+    assert [v["plate_number"] for v in lookup.lookup_vehicles(session, "BLK", 10)] == ["BLK-001", "BLK-002"]
+    lookup.vehicle_index.invalidate()
+
+
+def test_integrity_error_retries_the_chunk_row_by_row(session, vehicle):
+    rows = [
+        {"vehicle_type": "Car", "brand_model": "Uno", "kilometers": 0, "owner_id": vehicle.owner_id, "plate_number": plate}
+        for plate in ("BLK-010", "BLK-001", "BLK-011")
+    ]
+    created, errors = [], []
+
+    bulk._insert_chunk(session, Vehicle, list(enumerate(rows)), lambda db, rows: None, created, errors)
+
+    assert [row.plate_number for row in created] == ["BLK-010", "BLK-011"]
+    assert errors == [{"index": 1, "detail": "Integrity error creating vehicles"}]
+
+
+def test_clients_get_a_normalized_name(session):
+    result = bulk.bulk_create_clients(session, [{"name": "José Pérez", "phone_number": "1"}, {"name": "X", "phone_number": "abc"}])
+
+    assert [row.name_normalized for row in result["created"]] == ["jose perez"]
+    assert result["errors"][0]["index"] == 1
+    assert "phone_number" in result["errors"][0]["detail"]
+
+
+def test_transition_updates_changed_rows_and_moves_the_counters(session, vehicle):
+    from app.models import PaymentStatus, WorkStatus
+
+    bulk.bulk_create_work_orders(session, [order(vehicle), order(vehicle), order(vehicle, payment_status="PAID")])
+    ids = session.scalars(select(WorkOrder.id).order_by(WorkOrder.id)).all()
+
+    rows = bulk.transition_work_orders(session, WorkOrder.id.in_(ids), payment_status=PaymentStatus.PAID)
+    assert sorted(row.id for row in rows) == ids[:2]
+    assert reconcile_counters(session) == {}
+
+    rows = bulk.transition_work_orders(
+        session, WorkOrder.id.in_(ids[1:]), work_status=WorkStatus.COMPLETED, payment_status=PaymentStatus.BILL_SENT
+    )
+    assert {(row.work_status, row.payment_status) for row in rows} == {(WorkStatus.COMPLETED, PaymentStatus.BILL_SENT)}
+    assert reconcile_counters(session) == {}
+
+    assert bulk.transition_work_orders(session, WorkOrder.id.in_(ids[1:]), work_status=WorkStatus.COMPLETED) == []
+
+
+def test_transition_ignores_rows_that_start_matching_after_the_lock(session, vehicle, monkeypatch):
+    from app.models import PaymentStatus
+
+    bulk.bulk_create_work_orders(session, [order(vehicle), order(vehicle, payment_status="PAID")])
+    first, second = session.scalars(select(WorkOrder.id).order_by(WorkOrder.id)).all()
+    real_update = bulk.update
+
+    def update_after_concurrent_write(table):
+        # Another request moves the second order back to NOT_PAID between the two statements
+        session.get(WorkOrder, second).payment_status = PaymentStatus.NOT_PAID
+        session.flush()
+        return real_update(table)
+
+    monkeypatch.setattr(bulk, "update", update_after_concurrent_write)
+    rows = bulk.transition_work_orders(session, WorkOrder.vehicle_id == vehicle.id, payment_status=PaymentStatus.PAID)
+
+    assert [row.id for row in rows] == [first]
+    assert reconcile_counters(session) == {}
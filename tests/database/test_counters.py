@@ -0,0 +1,85 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database.counters import reconcile_counters
+from app.models import Client, Vehicle, WorkOrder, WorkOrderCounter, WorkStatus, PaymentStatus
+from app.models.base import Base
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, future=True)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture()
+def vehicle(session):
+    owner = Client(name="Counter Client", phone_number="123456")
+    vehicle = Vehicle(vehicle_type="Car", brand_model="Corolla", kilometers=10, plate_number="CNT-001", owner=owner)
+    session.add(vehicle)
+    session.commit()
+    return vehicle
+
+
+def new_order(vehicle, **fields):
+    return WorkOrder(entry_date=date(2025, 1, 1), client_id=vehicle.owner_id, vehicle_id=vehicle.id, workers="Ana", **fields)
+
+
+def counts(session):
+    return {
+        (row.work_status.value, row.payment_status.value): row.count
+        for row in session.query(WorkOrderCounter).filter(WorkOrderCounter.count != 0)
+    }
+
+
+def test_counters_follow_inserts_updates_and_deletes(session, vehicle):
+    orders = [new_order(vehicle), new_order(vehicle), new_order(vehicle, payment_status=PaymentStatus.PAID)]
+    session.add_all(orders)
+    session.commit()
+    assert counts(session) == {("pending", "NOT_PAID"): 2, ("pending", "PAID"): 1}
+
+    # Updated after the commit expired it: the stored status is still known
+    orders[0].work_status = WorkStatus.COMPLETED
+    session.commit()
+    assert counts(session) == {("pending", "NOT_PAID"): 1, ("completed", "NOT_PAID"): 1, ("pending", "PAID"): 1}
+
+    session.delete(orders[2])
+    session.commit()
+    assert counts(session) == {("pending", "NOT_PAID"): 1, ("completed", "NOT_PAID"): 1}
+
+    # Cascading delete of the client removes the rest
+    session.delete(session.get(Client, vehicle.owner_id))
+    session.commit()
+    assert counts(session) == {}
+
+
+def test_counters_roll_back_with_the_transaction(session, vehicle):
+    session.add(new_order(vehicle))
+    session.flush()
+    session.rollback()
+    assert counts(session) == {}
+
+
+def test_reconcile_reports_and_fixes_drift(session, vehicle):
+    session.add_all([new_order(vehicle), new_order(vehicle)])
+    session.commit()
+    assert reconcile_counters(session) == {}
+
+    session.execute(text("UPDATE work_order_counters SET count = 5"))
+    session.execute(text("INSERT INTO work_order_counters VALUES ('COMPLETED', 'PAID', 1)"))
+    session.commit()
+
+    drift = reconcile_counters(session, fix=True)
+    assert drift == {
+        (WorkStatus.COMPLETED, PaymentStatus.PAID): (1, 0),
+        (WorkStatus.PENDING, PaymentStatus.NOT_PAID): (5, 2),
+    }
+    assert counts(session) == {("pending", "NOT_PAID"): 2}
+    assert reconcile_counters(session) == {}
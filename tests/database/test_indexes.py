@@ -0,0 +1,38 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.models.base import Base
+
+
+@pytest.fixture()
+def conn():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+
+def query_plan(conn, sql):
+    return " ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+
+@pytest.mark.parametrize(
+    "sql, index",
+    [
+        ("SELECT id FROM work_orders WHERE client_id = 1", "ix_work_orders_client_id_entry_date"),
+        ("SELECT id FROM work_orders WHERE vehicle_id = 1 ORDER BY entry_date", "ix_work_orders_vehicle_id_entry_date"),
+        ("SELECT id FROM work_orders WHERE entry_date >= '2025-01-01'", "ix_work_orders_entry_date_id"),
+        (
+            "SELECT id FROM work_orders WHERE work_status = 'PENDING' AND entry_date >= '2025-01-01'",
+            "ix_work_orders_work_status_entry_date",
+        ),
+        (
+            "SELECT id FROM work_orders WHERE payment_status = 'PAID' ORDER BY entry_date",
+            "ix_work_orders_payment_status_entry_date",
+        ),
+        ("SELECT id FROM vehicles WHERE owner_id = 1", "ix_vehicles_owner_id"),
+    ],
+)
+def test_filters_use_an_index(conn, sql, index):
+    assert index in query_plan(conn, sql)
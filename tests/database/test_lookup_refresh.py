@@ -0,0 +1,39 @@
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import lookup
+from app.models import Client, Vehicle
+from app.models.base import Base
+
+
+def test_stale_memory_index_answers_while_it_reloads(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'lookup.db'}", future=True)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, future=True)()
+    session.add(Vehicle(vehicle_type="Car", brand_model="Uno", kilometers=0, plate_number="OLD-001",
+                        owner=Client(name="Lookup Client", phone_number="123456")))
+    session.commit()
+
+    monkeypatch.setattr(lookup, "LOOKUP_MEMORY_INDEX", True)
+    monkeypatch.setattr(lookup.vehicle_index, "max_age", 0)
+    lookup.vehicle_index.invalidate()
+    try:
+        assert [v["plate_number"] for v in lookup.lookup_vehicles(session, "", 10)] == ["OLD-001"]
+        loads = lookup.vehicle_index.loads
+
+        # Written by another worker: only a reload sees it
+        with engine.begin() as conn:
+            conn.execute(insert(Vehicle), [{"vehicle_type": "Car", "brand_model": "Uno", "kilometers": 0,
+                                            "plate_number": "NEW-001", "owner_id": 1}])
+
+        assert [v["plate_number"] for v in lookup.lookup_vehicles(session, "", 10)] == ["OLD-001"]
+        while lookup.vehicle_index.stats()["refreshing"]:
+            time.sleep(0.01)
+        assert lookup.vehicle_index.loads == loads + 1
+        assert [v["plate_number"] for v in lookup.vehicle_index.lookup("", 10)] == ["NEW-001", "OLD-001"]
+    finally:
+        lookup.vehicle_index.invalidate()
+        session.close()
+        engine.dispose()
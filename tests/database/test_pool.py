@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.database.pool import TimedQueuePool
+
+
+@pytest.fixture()
+def pooled_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_pool_counts_checkouts(pooled_engine):
+    for _ in range(3):
+        with pooled_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    stats = pooled_engine.pool.stats()
+    assert stats["checkouts"] == 3
+    assert stats["checked_out"] == 0
+    assert stats["pool_size"] == 1
+
+
+def test_pool_records_wait_and_timeouts(pooled_engine):
+    with pooled_engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            pooled_engine.connect()
+
+        stats = pooled_engine.pool.stats()
+        assert stats["checked_out"] == 1
+        assert stats["timeouts"] == 1
+        assert stats["wait_ms_max"] >= 50
+
+
+def test_build_engine_uses_configured_pool(tmp_path, monkeypatch):
+    from app.database import database
+
+    monkeypatch.setattr(database, "DB_POOL_SIZE", 3)
+    monkeypatch.setattr(database, "DB_MAX_OVERFLOW", 2)
+    engine = database.build_engine(f"sqlite:///{tmp_path / 'app.db'}")
+
+    assert isinstance(engine.pool, TimedQueuePool)
+    assert engine.pool.size() == 3
+    assert engine.pool._max_overflow == 2
+    engine.dispose()
@@ -0,0 +1,134 @@
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.database import database
+from app.database.routing import RoutingSession, pin_primary, recent_writers, use_replica
+from app.models.base import Base
+from app.models.client import Client
+
+
+@pytest.fixture()
+def engines(tmp_path):
+    # Two SQLite files stand in for the primary and its replica
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}", future=True)
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", future=True)
+    for engine, name in ((primary, "On Primary"), (replica, "On Replica")):
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as db:
+            db.add(Client(name=name, phone_number="123"))
+            db.commit()
+    recent_writers.clear()
+    yield primary, replica
+    recent_writers.clear()
+    primary.dispose()
+    replica.dispose()
+
+
+@pytest.fixture()
+def RoutingSessionLocal(engines):
+    primary, replica = engines
+    return sessionmaker(bind=primary, class_=RoutingSession, primary=primary, replica=replica, autoflush=False)
+
+
+def make_request(method, authorization=None):
+    headers = [(b"authorization", authorization.encode())] if authorization else []
+    return Request({"type": "http", "method": method, "path": "/", "headers": headers, "client": ("10.0.0.1", 1234)})
+
+
+def names(db):
+    return [client.name for client in db.query(Client).order_by(Client.id)]
+
+
+def test_flagged_session_reads_from_replica(RoutingSessionLocal):
+    with RoutingSessionLocal() as db:
+        assert names(db) == ["On Primary"]
+
+    with RoutingSessionLocal(info={"replica": True}) as db:
+        assert names(db) == ["On Replica"]
+
+
+def test_writes_go_to_primary_and_are_read_back(RoutingSessionLocal):
+    with RoutingSessionLocal(info={"replica": True}) as db:
+        db.add(Client(name="New", phone_number="456"))
+        db.commit()
+
+        assert names(db) == ["On Primary", "New"]
+
+
+def test_pinned_session_reads_from_primary_until_commit(engines):
+    primary, replica = engines
+    LagFreeSession = sessionmaker(class_=RoutingSession, primary=primary, replica=replica, replica_lag_free=True)
+
+    with LagFreeSession(info={"replica": True}) as db:
+        assert names(db) == ["On Replica"]
+        pin_primary(db)
+        assert names(db) == ["On Primary"]
+        db.commit()
+        assert names(db) == ["On Replica"]
+
+
+def test_transition_counts_on_the_primary(engines):
+    from sqlalchemy import event
+    from app.database.bulk import transition_work_orders
+    from app.database.counters import reconcile_counters
+    from app.models import PaymentStatus, Vehicle, WorkOrder
+
+    primary, replica = engines
+    LagFreeSession = sessionmaker(class_=RoutingSession, primary=primary, replica=replica, replica_lag_free=True)
+    with LagFreeSession(info={"replica": True}) as db:
+        owner = Client(name="Owner", phone_number="1")
+        vehicle = Vehicle(vehicle_type="Car", brand_model="Uno", kilometers=0, plate_number="PIN-001", owner=owner)
+        db.add(WorkOrder(entry_date=date(2025, 1, 1), client=owner, vehicle=vehicle, workers="Ana"))
+        db.flush()
+        vehicle_id = vehicle.id
+        db.commit()
+
+        replica_statements = []
+        event.listen(replica, "before_cursor_execute", lambda *args: replica_statements.append(args[2]))
+        rows = transition_work_orders(db, WorkOrder.vehicle_id == vehicle_id, payment_status=PaymentStatus.PAID)
+
+        assert len(rows) == 1
+        assert replica_statements == []
+        pin_primary(db)
+        assert reconcile_counters(db) == {}
+
+
+def test_use_replica_only_for_safe_requests_without_recent_writes():
+    recent_writers.clear()
+
+    assert use_replica(None) is False
+    assert use_replica(make_request("GET", "Bearer a")) is True
+    assert use_replica(make_request("POST", "Bearer a")) is False
+    assert use_replica(make_request("GET", "Bearer a")) is False
+    assert use_replica(make_request("GET", "Bearer b")) is True
+
+    recent_writers.clear()
+    assert use_replica(make_request("GET", "Bearer a")) is True
+
+
+def test_get_db_routes_requests(engines, RoutingSessionLocal, monkeypatch):
+    from app.routes import clients_router
+    from app.utils.auth import get_current_active_user
+
+    monkeypatch.setattr(database, "SessionLocal", RoutingSessionLocal)
+    app = FastAPI()
+    app.include_router(clients_router)
+    app.dependency_overrides[get_current_active_user] = lambda: None
+    client = TestClient(app)
+    headers = {"Authorization": "Bearer reader"}
+
+    assert [c["name"] for c in client.get("/clients/", headers=headers).json()] == ["On Replica"]
+
+    created = client.post("/clients/", json={"name": "Written", "phone_number": "1"}, headers=headers)
+    assert created.status_code == 201
+
+    # Read-after-write: the writer now reads from the primary
+    assert [c["name"] for c in client.get("/clients/", headers=headers).json()] == ["On Primary", "Written"]
+    other = client.get("/clients/", headers={"Authorization": "Bearer other"}).json()
+    assert [c["name"] for c in other] == ["On Replica"]
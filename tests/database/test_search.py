@@ -0,0 +1,72 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database.search import rebuild_search_index, search_terms, search_work_orders
+from app.models import Client, Vehicle, WorkOrder
+from app.models.base import Base
+from app.models.work_order_search import fts_work_order_search
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, future=True)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture()
+def orders(session):
+    owner = Client(name="Martina Gómez", phone_number="123456")
+    vehicle = Vehicle(vehicle_type="Car", brand_model="Corolla", kilometers=10, plate_number="AB123CD", owner=owner)
+    orders = [
+        WorkOrder(entry_date=date(2025, 1, 1), client=owner, vehicle=vehicle, workers="Ana", details="Compressor leak"),
+        WorkOrder(entry_date=date(2025, 1, 2), client=owner, vehicle=vehicle, workers="Beto", spare_parts="Cabin filter"),
+    ]
+    session.add_all(orders)
+    session.commit()
+    return orders
+
+
+def search(session, q):
+    query = search_work_orders(select(WorkOrder.id), search_terms(q), "sqlite")
+    return session.scalars(query).all()
+
+
+def test_index_follows_work_order_writes(session, orders):
+    leak, filter_ = orders
+    assert search(session, "compr") == [leak.id]
+    assert search(session, "gomez filter") == [filter_.id]
+
+    leak.details = "Recharged gas"
+    session.commit()
+    assert search(session, "compressor") == []
+    assert search(session, "recharg") == [leak.id]
+
+    session.delete(filter_)
+    session.commit()
+    assert search(session, "cabin") == []
+    assert session.scalar(select(fts_work_order_search.c.rowid).where(fts_work_order_search.c.rowid == filter_.id)) is None
+
+
+def test_index_follows_client_and_plate_changes(session, orders):
+    orders[0].client.name = "Lucía Pérez"
+    orders[0].vehicle.plate_number = "ZZ999ZZ"
+    session.commit()
+
+    assert search(session, "martina") == []
+    assert sorted(search(session, "lucia zz999")) == sorted(o.id for o in orders)
+
+
+def test_rebuild_search_index(session, orders):
+    session.execute(fts_work_order_search.delete())
+    session.commit()
+    assert search(session, "ana") == []
+
+    assert rebuild_search_index(session) == 2
+    assert search(session, "ana") == [orders[0].id]
@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import SINGLE_WRITER_POOL, build_engine
+from app.database.routing import RoutingSession
+from app.models.base import Base
+from app.models.client import Client
+
+
+@pytest.fixture()
+def WriterSessionLocal(tmp_path):
+    url = f"sqlite:///{tmp_path / 'shop.db'}"
+    readers = build_engine(url, pool_size=4, max_overflow=0)
+    writer = build_engine(url, **SINGLE_WRITER_POOL)
+    Base.metadata.create_all(bind=writer)
+    factory = sessionmaker(
+        bind=readers,
+        class_=RoutingSession,
+        primary=writer,
+        replica=readers,
+        replica_lag_free=True,
+        autoflush=False,
+        info={"replica": True},
+    )
+    yield factory, readers, writer
+    readers.dispose()
+    writer.dispose()
+
+
+def test_writes_use_the_writer_and_reads_return_to_the_pool(WriterSessionLocal):
+    factory, readers, writer = WriterSessionLocal
+
+    with factory() as db:
+        client = Client(name="Shop", phone_number="1")
+        db.add(client)
+        db.commit()
+        writer_checkouts = writer.pool.stats()["checkouts"]
+
+        db.refresh(client)
+        assert db.scalar(select(func.count(Client.id))) == 1
+
+    # The refresh and count after commit were served by the read pool
+    assert writer.pool.stats()["checkouts"] == writer_checkouts
+    assert writer.pool.stats()["pool_size"] == 1
+
+
+def test_reads_inside_a_write_transaction_see_uncommitted_rows(WriterSessionLocal):
+    factory, _, _ = WriterSessionLocal
+
+    with factory() as db:
+        db.add(Client(name="Pending", phone_number="1"))
+        db.flush()
+        assert db.scalar(select(func.count(Client.id))) == 1
+        db.rollback()
+        assert db.scalar(select(func.count(Client.id))) == 0
+
+
+def test_concurrent_writers_are_serialized(WriterSessionLocal):
+    factory, _, writer = WriterSessionLocal
+
+    def write(n):
+        with factory() as db:
+            for i in range(10):
+                db.add(Client(name=f"Client {n}-{i}", phone_number="1"))
+                db.commit()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(write, range(8)))
+
+    with factory() as db:
+        assert db.scalar(select(func.count(Client.id))) == 80
+    assert writer.pool.stats()["timeouts"] == 0
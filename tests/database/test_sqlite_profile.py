@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.database.database import build_async_engine, build_engine
+from app.database.sqlite import SQLITE_PRAGMAS
+
+
+def pragma(conn, name):
+    return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_tuned_profile_applies_pragmas(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'tuned.db'}", sqlite_profile="tuned")
+    with engine.connect() as conn:
+        assert pragma(conn, "journal_mode") == "wal"
+        assert pragma(conn, "synchronous") == 1  # NORMAL
+        assert pragma(conn, "busy_timeout") == SQLITE_PRAGMAS["busy_timeout"]
+        assert pragma(conn, "cache_size") == SQLITE_PRAGMAS["cache_size"]
+        assert pragma(conn, "temp_store") == 2  # MEMORY
+    engine.dispose()
+
+
+def test_default_profile_keeps_sqlite_defaults(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'plain.db'}", sqlite_profile="default")
+    with engine.connect() as conn:
+        assert pragma(conn, "journal_mode") == "delete"
+    engine.dispose()
+
+
+def test_in_memory_database_is_left_alone():
+    engine = build_engine("sqlite:///:memory:", sqlite_profile="tuned")
+    with engine.connect() as conn:
+        assert pragma(conn, "journal_mode") == "memory"
+    engine.dispose()
+
+
+def test_async_engine_applies_pragmas(tmp_path):
+    pytest.importorskip("aiosqlite")
+
+    async def journal_mode():
+        engine = build_async_engine(f"sqlite:///{tmp_path / 'async.db'}", sqlite_profile="tuned")
+        async with engine.connect() as conn:
+            mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+        await engine.dispose()
+        return mode
+
+    assert asyncio.run(journal_mode()) == "wal"
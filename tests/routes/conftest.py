@@ -18,6 +18,18 @@ def setup_database():
     yield
     Base.metadata.drop_all(bind=engine)
 
+@pytest.fixture(autouse=True)
+def clear_auth_caches():
+    from app.utils.auth import principal_cache, token_cache, login_user_limiter, login_ip_limiter
+    from app.utils.revocation import revocation_store
+    from app.routes.work_orders import stats_cache
+    stores = (principal_cache, token_cache, revocation_store, login_user_limiter, login_ip_limiter, stats_cache)
+    for store in stores:
+        store.clear()
+    yield
+    for store in stores:
+        store.clear()
+
 @pytest.fixture(scope="function")
 def db_session():
     connection = engine.connect()
@@ -0,0 +1,228 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.database import get_async_db, get_db, to_async_url
+from app.models.base import Base
+from app.models.client import Client
+from app.models.user import User, UserRole
+from app.routes.aio import (
+    async_auth_router,
+    async_clients_router,
+    async_user_router,
+    async_vehicle_router,
+    async_work_order_router,
+)
+from app.utils.auth import build_token_claims, create_access_token, get_current_active_user_async, hash_password, principal_cache
+
+# ------------------------
+# ASYNC APP FIXTURES
+# ------------------------
+@pytest.fixture()
+def sync_session(tmp_path):
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    engine = create_engine(url, future=True)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, future=True)()
+    session.info["url"] = url
+    yield session
+    session.close()
+    engine.dispose()
+
+@pytest.fixture()
+def async_client(sync_session):
+    # NullPool: every TestClient request runs on its own event loop
+    async_engine = create_async_engine(to_async_url(sync_session.info["url"]), poolclass=NullPool)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    def no_sync_session():
+        pytest.fail("an async route opened a sync Session")
+
+    admin = User(id=1, username="admin", password="x", role=UserRole.ADMIN)
+    app = FastAPI()
+    for router in (async_auth_router, async_clients_router, async_user_router, async_vehicle_router, async_work_order_router):
+        app.include_router(router)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_db] = no_sync_session
+    app.dependency_overrides[get_current_active_user_async] = lambda: admin
+
+    yield TestClient(app)
+
+@pytest.fixture()
+def client_with_vehicle(sync_session):
+    from app.models.vehicle import Vehicle
+
+    owner = Client(name="Async Client", phone_number="123456")
+    sync_session.add(owner)
+    sync_session.flush()
+    vehicle = Vehicle(vehicle_type="Car", brand_model="Corolla", kilometers=10, plate_number="ASY-001", owner_id=owner.id)
+    sync_session.add(vehicle)
+    sync_session.commit()
+    return owner.id, vehicle.id
+
+# ------------------------
+# TESTS
+# ------------------------
+def test_async_client_crud(async_client):
+    created = async_client.post("/clients/", json={"name": "Nico", "phone_number": "123"})
+    assert created.status_code == 201
+    client_id = created.json()["id"]
+
+    assert async_client.get(f"/clients/{client_id}").json()["name"] == "Nico"
+    assert async_client.put(f"/clients/{client_id}", json={"name": "Nicolas"}).json()["name"] == "Nicolas"
+    assert any(c["id"] == client_id for c in async_client.get("/clients/").json())
+
+    assert async_client.delete(f"/clients/{client_id}").status_code == 204
+    assert async_client.get(f"/clients/{client_id}").status_code == 404
+
+def test_async_vehicle_rejects_duplicate_plate(async_client, client_with_vehicle):
+    owner_id, _ = client_with_vehicle
+    payload = {"vehicle_type": "Car", "brand_model": "Civic", "kilometers": 0, "plate_number": "asy-001", "owner_id": owner_id}
+
+    response = async_client.post("/vehicles/", json=payload)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Plate number already exists"
+
+def test_async_work_order_lifecycle(async_client, client_with_vehicle):
+    owner_id, vehicle_id = client_with_vehicle
+    payload = {"entry_date": "2025-11-22", "client_id": owner_id, "vehicle_id": vehicle_id, "workers": "John Doe"}
+
+    created = async_client.post("/work-orders/", json=payload)
+    assert created.status_code == 201
+    order_id = created.json()["id"]
+
+    assert async_client.put(f"/work-orders/{order_id}", json={"workers": "Jane"}).json()["workers"] == "Jane"
+    assert len(async_client.get("/work-orders/").json()) == 1
+    assert async_client.delete(f"/work-orders/{order_id}").json()["message"] == "Work order deleted"
+    assert async_client.get(f"/work-orders/{order_id}").status_code == 404
+
+def test_async_client_delete_cascades_to_children(async_client, client_with_vehicle):
+    owner_id, vehicle_id = client_with_vehicle
+
+    assert async_client.delete(f"/clients/{owner_id}").status_code == 204
+    assert async_client.get(f"/vehicles/{vehicle_id}").status_code == 404
+
+def test_async_user_update_bumps_token_version(async_client, sync_session):
+    created = async_client.post("/user/", json={"username": "async_user", "password": "Async!1", "role": "EMPLOYEE"})
+    assert created.status_code == 200
+    user_id = created.json()["id"]
+
+    old_version = sync_session.get(User, user_id).token_version
+    assert async_client.put(f"/user/{user_id}", json={"role": "ADMIN"}).json()["role"] == "ADMIN"
+
+    sync_session.expire_all()
+    assert sync_session.get(User, user_id).token_version == old_version + 1
+
+def test_async_login_and_refresh(async_client, sync_session):
+    from app.utils.auth import login_ip_limiter, login_user_limiter
+    from app.utils.revocation import revocation_store
+
+    login_ip_limiter.clear()
+    login_user_limiter.clear()
+    revocation_store.clear()
+    sync_session.add(User(username="async_login", password=hash_password("Login!1"), role=UserRole.EMPLOYEE))
+    sync_session.commit()
+
+    login = async_client.post("/auth/login", json={"username": "async_login", "password": "Login!1"})
+    assert login.status_code == 200
+
+    refresh = {"refresh_token": login.json()["refresh_token"]}
+    assert async_client.post("/auth/refresh", json=refresh).status_code == 200
+    assert async_client.post("/auth/refresh", json=refresh).status_code == 401
+    revocation_store.clear()
+
+def test_async_clients_cursor_pagination(async_client):
+    for name in ("Carla", "Ana", "Bruno"):
+        async_client.post("/clients/", json={"name": name, "phone_number": "123"})
+
+    first = async_client.get("/clients/", params={"cursor": "", "sort": "name", "limit": 2}).json()
+    second = async_client.get("/clients/", params={"cursor": first["next_cursor"], "sort": "name", "limit": 2}).json()
+
+    assert [c["name"] for c in first["items"]] == ["Ana", "Bruno"]
+    assert [c["name"] for c in second["items"]] == ["Carla"]
+    assert second["next_cursor"] is None
+
+def test_async_expanded_work_orders(async_client, client_with_vehicle):
+    owner_id, vehicle_id = client_with_vehicle
+    payload = {"entry_date": "2025-11-22", "client_id": owner_id, "vehicle_id": vehicle_id, "workers": "John Doe"}
+    async_client.post("/work-orders/", json=payload)
+
+    page = async_client.get("/work-orders/expanded", params={"cursor": "", "with_total": True}).json()
+
+    assert page["total"] == 1
+    assert page["items"][0]["client_name"] == "Async Client"
+    assert page["items"][0]["vehicle_plate"] == "ASY-001"
+
+def test_async_nested_listings(async_client, client_with_vehicle):
+    owner_id, vehicle_id = client_with_vehicle
+    for day in ("2025-11-20", "2025-11-22"):
+        payload = {"entry_date": day, "client_id": owner_id, "vehicle_id": vehicle_id, "workers": "John Doe"}
+        async_client.post("/work-orders/", json=payload)
+
+    assert [v["id"] for v in async_client.get(f"/clients/{owner_id}/vehicles").json()] == [vehicle_id]
+
+    page = async_client.get(f"/vehicles/{vehicle_id}/work-orders", params={"cursor": "", "limit": 1}).json()
+    assert page["items"][0]["entry_date"] == "2025-11-22"
+    assert page["next_cursor"] is not None
+    assert async_client.get("/clients/99999/vehicles").status_code == 404
+
+def test_async_sparse_fields(async_client, client_with_vehicle):
+    owner_id, vehicle_id = client_with_vehicle
+    payload = {"entry_date": "2025-11-22", "client_id": owner_id, "vehicle_id": vehicle_id, "workers": "John Doe"}
+    order_id = async_client.post("/work-orders/", json=payload).json()["id"]
+
+    assert async_client.get(f"/clients/{owner_id}", params={"fields": "name"}).json() == {"name": "Async Client"}
+    assert async_client.get("/vehicles/", params={"fields": "plate_number"}).json() == [{"plate_number": "ASY-001"}]
+
+    page = async_client.get("/work-orders/expanded", params={"fields": "id,client_name", "cursor": ""}).json()
+    assert page["items"] == [{"id": order_id, "client_name": "Async Client"}]
+    response = async_client.get(f"/work-orders/{order_id}", params={"fields": "workers,hours"})
+    assert response.json() == {"workers": "John Doe", "hours": None}
+    assert async_client.get("/work-orders/", params={"fields": "bogus"}).status_code == 400
+
+def test_async_work_order_stats(async_client, client_with_vehicle):
+    owner_id, vehicle_id = client_with_vehicle
+    payload = {"entry_date": "2025-11-22", "client_id": owner_id, "vehicle_id": vehicle_id, "workers": "John Doe"}
+
+    assert async_client.get("/work-orders/stats").json()["total"] == 0
+    async_client.post("/work-orders/", json=payload)
+
+    stats = async_client.get("/work-orders/stats").json()
+    assert (stats["total"], stats["pending"], stats["unpaid"]) == (1, 1, 1)
+
+def test_async_auth_loads_the_user_on_the_async_session(async_client, sync_session):
+    user = User(username="async_token", password="x", role=UserRole.EMPLOYEE)
+    sync_session.add(user)
+    sync_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token(build_token_claims(user))}"}
+    del async_client.app.dependency_overrides[get_current_active_user_async]
+    principal_cache.clear()
+
+    assert async_client.get("/auth/me", headers=headers).json()["username"] == "async_token"
+    assert async_client.get("/work-orders/", headers=headers).status_code == 200
+    assert async_client.get("/user/", headers=headers).status_code == 403
+    principal_cache.clear()
+
+def test_async_export_streams_on_the_async_session(async_client, client_with_vehicle):
+    owner_id, vehicle_id = client_with_vehicle
+    ids = []
+    for day in ("2025-11-20", "2025-11-22"):
+        payload = {"entry_date": day, "client_id": owner_id, "vehicle_id": vehicle_id, "workers": "John Doe"}
+        ids.append(async_client.post("/work-orders/", json=payload).json()["id"])
+
+    response = async_client.get("/work-orders/export", params={"fields": "id,client_name"})
+
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert response.text.splitlines() == ["id,client_name"] + [f"{order_id},Async Client" for order_id in ids]
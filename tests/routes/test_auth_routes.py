@@ -0,0 +1,166 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.user import User, UserRole
+from app.utils.auth import hash_password
+
+
+@pytest.fixture()
+def stored_user(db_session: Session):
+    user = User(username="login_user", password=hash_password("Login!1"), role=UserRole.EMPLOYEE)
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+# -----------------------------
+# TEST: LOGIN
+# -----------------------------
+def test_login_returns_tokens(client: TestClient, stored_user):
+    response = client.post("/auth/login", json={"username": "login_user", "password": "Login!1"})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["user"]["id"] == stored_user.id
+    assert data["access_token"]
+    assert data["refresh_token"]
+
+def test_login_wrong_password(client: TestClient, stored_user):
+    response = client.post("/auth/login", json={"username": "login_user", "password": "Wrong!1"})
+
+    assert response.status_code == 401
+
+def test_login_returns_503_when_hashing_pool_is_saturated(client: TestClient, stored_user, monkeypatch):
+    from app.utils import password_pool as pool_module
+
+    def busy(*args, **kwargs):
+        raise HTTPException(status_code=503, detail="Authentication service is busy, please retry")
+
+    monkeypatch.setattr(pool_module.password_pool, "submit", busy)
+
+    response = client.post("/auth/login", json={"username": "login_user", "password": "Login!1"})
+
+    assert response.status_code == 503
+
+# -----------------------------
+# TEST: REFRESH TOKEN ROTATION AND REVOCATION
+# -----------------------------
+def _login(client: TestClient):
+    response = client.post("/auth/login", json={"username": "login_user", "password": "Login!1"})
+    assert response.status_code == 200
+    return response.json()
+
+def test_refresh_token_can_only_be_used_once(client: TestClient, stored_user):
+    tokens = _login(client)
+
+    first = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    second = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert first.status_code == 200
+    assert second.status_code == 401
+    assert client.post("/auth/refresh", json={"refresh_token": first.json()["refresh_token"]}).status_code == 200
+
+def test_logout_revokes_refresh_token(client: TestClient, stored_user):
+    tokens = _login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    response = client.post("/auth/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers)
+
+    assert response.status_code == 200
+    assert client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+
+def test_logout_without_body_still_succeeds(client: TestClient, stored_user):
+    tokens = _login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    assert client.post("/auth/logout", headers=headers).status_code == 200
+
+def test_refresh_token_is_not_a_bearer_credential(client: TestClient, stored_user):
+    tokens = _login(client)
+
+    assert client.get("/auth/me", headers={"Authorization": f"Bearer {tokens['access_token']}"}).status_code == 200
+    response = client.get("/auth/me", headers={"Authorization": f"Bearer {tokens['refresh_token']}"})
+    assert response.status_code == 401
+
+# -----------------------------
+# TEST: LOGIN RATE LIMITING
+# -----------------------------
+def test_login_is_rejected_before_any_work_when_rate_exceeded(client: TestClient, stored_user, monkeypatch):
+    from app.utils import auth as auth_utils
+
+    for _ in range(int(auth_utils.LOGIN_RATE_USER_BURST)):
+        client.post("/auth/login", json={"username": "login_user", "password": "Wrong!1"})
+
+    def fail(*args, **kwargs):
+        raise AssertionError("bcrypt must not run for rejected attempts")
+
+    monkeypatch.setattr(auth_utils.password_pool, "submit", fail)
+    response = client.post("/auth/login", json={"username": "login_user", "password": "Login!1"})
+
+    assert response.status_code == 429
+    assert "Retry-After" in response.headers
+    assert auth_utils.login_user_limiter.stats()["rejected"] == 1
+
+def test_login_rate_is_limited_per_ip_across_usernames(client: TestClient, monkeypatch):
+    from app.utils import auth as auth_utils
+
+    monkeypatch.setattr(auth_utils, "login_ip_limiter", auth_utils.TokenBucketLimiter(2, 0.001))
+    monkeypatch.setattr(auth_utils, "LOGIN_RATE_IP_ENABLED", True)
+
+    statuses = [
+        client.post("/auth/login", json={"username": f"random_{i}", "password": "x"}).status_code
+        for i in range(3)
+    ]
+
+    assert statuses == [401, 401, 429]
+
+def test_login_ip_limit_is_opt_in(client: TestClient, monkeypatch):
+    from app.utils import auth as auth_utils
+
+    monkeypatch.setattr(auth_utils, "login_ip_limiter", auth_utils.TokenBucketLimiter(2, 0.001))
+    monkeypatch.setattr(auth_utils, "LOGIN_RATE_IP_ENABLED", False)
+
+    statuses = [
+        client.post("/auth/login", json={"username": f"shift_{i}", "password": "x"}).status_code
+        for i in range(3)
+    ]
+
+    assert statuses == [401, 401, 401]
+
+# -----------------------------
+# TEST: REHASH ON LOGIN
+# -----------------------------
+def test_login_rehashes_password_with_a_lower_cost(client: TestClient, db_session: Session, stored_user, monkeypatch):
+    from app.utils.auth import password_hashing
+
+    old_cost = int(stored_user.password.split("$")[2])
+
+    def stored_cost():
+        db_session.expire_all()
+        user = db_session.query(User).filter(User.id == stored_user.id).first()
+        return int(user.password.split("$")[2])
+
+    # A worker calibrated to a lower cost leaves the hash alone
+    monkeypatch.setitem(password_hashing, "rounds", old_cost - 1)
+    assert client.post("/auth/login", json={"username": "login_user", "password": "Login!1"}).status_code == 200
+    assert stored_cost() == old_cost
+
+    monkeypatch.setitem(password_hashing, "rounds", old_cost + 1)
+    assert client.post("/auth/login", json={"username": "login_user", "password": "Login!1"}).status_code == 200
+    assert stored_cost() == old_cost + 1
+    assert client.post("/auth/login", json={"username": "login_user", "password": "Login!1"}).status_code == 200
+
+def test_login_lowers_the_cost_to_a_fixed_bcrypt_rounds(client: TestClient, db_session: Session, stored_user, monkeypatch):
+    from app.utils.auth import password_hashing
+
+    old_cost = int(stored_user.password.split("$")[2])
+    monkeypatch.setattr("app.utils.auth.BCRYPT_ROUNDS", str(old_cost - 1))
+    monkeypatch.setitem(password_hashing, "rounds", old_cost - 1)
+
+    assert client.post("/auth/login", json={"username": "login_user", "password": "Login!1"}).status_code == 200
+
+    db_session.expire_all()
+    user = db_session.query(User).filter(User.id == stored_user.id).first()
+    assert int(user.password.split("$")[2]) == old_cost - 1
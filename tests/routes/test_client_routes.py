@@ -111,3 +111,87 @@ def test_delete_client_non_admin(override_employee, db_session):
 
     response = employee_client.delete(f"/clients/{new_client.id}")
     assert response.status_code == 403 or response.status_code == 401
+
+# ------------------------------------------
+# GET VEHICLES OF A CLIENT
+# ------------------------------------------
+def test_list_client_vehicles(override_current_user, db_session):
+    from app.models.vehicle import Vehicle
+
+    owner, other = Client(**NEW_CLIENT), Client(**UPDATE_CLIENT)
+    db_session.add_all([owner, other])
+    db_session.commit()
+    vehicles = [
+        Vehicle(vehicle_type="Car", brand_model="Fiat Uno", kilometers=1000, plate_number=f"NST-{i}{owner.id}", owner_id=owner.id)
+        for i in range(3)
+    ]
+    db_session.add_all(vehicles + [
+        Vehicle(vehicle_type="Car", brand_model="Fiat Uno", kilometers=1000, plate_number=f"OTH-{other.id}", owner_id=other.id)
+    ])
+    db_session.commit()
+
+    client = override_current_user
+    page = client.get(f"/clients/{owner.id}/vehicles", params={"cursor": "", "limit": 2}).json()
+    assert [v["id"] for v in page["items"]] == [v.id for v in vehicles[:2]]
+    page = client.get(f"/clients/{owner.id}/vehicles", params={"cursor": page["next_cursor"], "limit": 2}).json()
+    assert [v["id"] for v in page["items"]] == [vehicles[2].id]
+    assert page["next_cursor"] is None
+
+    response = client.get(f"/clients/{other.id}/vehicles")
+    assert [v["owner_id"] for v in response.json()] == [other.id]
+
+    assert client.get("/clients/99999/vehicles").status_code == 404
+
+# ------------------------------------------
+# BULK CREATE
+# ------------------------------------------
+def test_create_clients_bulk(override_current_user):
+    client = override_current_user
+    response = client.post("/clients/bulk", json=[NEW_CLIENT, {**UPDATE_CLIENT, "email": "not-an-email"}, UPDATE_CLIENT])
+    assert response.status_code == 200
+
+    data = response.json()
+    assert [c["name"] for c in data["created"]] == [NEW_CLIENT["name"], UPDATE_CLIENT["name"]]
+    assert [e["index"] for e in data["errors"]] == [1]
+    assert client.get(f"/clients/{data['created'][1]['id']}").json()["email"] == UPDATE_CLIENT["email"]
+
+    assert client.post("/clients/bulk", json=[NEW_CLIENT] * 5001).status_code == 422
+
+# ------------------------------------------
+# SPARSE FIELDSETS
+# ------------------------------------------
+def test_clients_sparse_fields(override_current_user, db_session):
+    owner = Client(**NEW_CLIENT)
+    db_session.add(owner)
+    db_session.commit()
+
+    client = override_current_user
+    response = client.get(f"/clients/{owner.id}", params={"fields": "name,email"})
+    assert response.json() == {"name": NEW_CLIENT["name"], "email": NEW_CLIENT["email"]}
+
+    page = client.get("/clients/", params={"fields": "id", "sort": "-name", "cursor": ""}).json()
+    assert all(list(c) == ["id"] for c in page["items"])
+    assert {"id": owner.id} in page["items"]
+
+    response = client.get("/clients/", params={"fields": "name_normalized"})
+    assert response.status_code == 400
+
+# ------------------------------------------
+# LOOK UP CLIENTS BY NAME PREFIX
+# ------------------------------------------
+def test_lookup_clients_by_name_prefix(override_current_user, db_session):
+    db_session.add_all([
+        Client(name="José Pérez", phone_number="1"),
+        Client(name="Josefina Díaz", phone_number="2"),
+        Client(name="Joaquín Ruiz", phone_number="3"),
+    ])
+    db_session.commit()
+
+    client = override_current_user
+    resp = client.get("/clients/lookup", params={"prefix": "JOSE"})
+    assert resp.status_code == 200
+    assert [c["name"] for c in resp.json()] == ["José Pérez", "Josefina Díaz"]
+
+    assert [c["name"] for c in client.get("/clients/lookup", params={"prefix": "josé p"}).json()] == ["José Pérez"]
+    assert len(client.get("/clients/lookup", params={"prefix": "jo", "limit": 1}).json()) == 1
+    assert client.get("/clients/lookup", params={"prefix": "jo", "limit": 51}).status_code == 422
@@ -0,0 +1,55 @@
+from datetime import date
+
+import pytest
+from app.models.client import Client
+from app.models.vehicle import Vehicle
+from app.models.work_order import WorkOrder
+
+
+@pytest.fixture()
+def indexed_orders(db_session):
+    owner = Client(name="Search Client", phone_number="123456")
+    vehicle = Vehicle(vehicle_type="Car", brand_model="Corolla", kilometers=10, plate_number="SRC-777", owner=owner)
+    orders = [
+        WorkOrder(entry_date=date(2025, 1, 1), client=owner, vehicle=vehicle, workers="Ana", details="Compressor noise"),
+        WorkOrder(entry_date=date(2025, 1, 2), client=owner, vehicle=vehicle, workers="Compressor team", details="Vent"),
+        WorkOrder(entry_date=date(2025, 1, 3), client=owner, vehicle=vehicle, workers="Beto", details="Filter"),
+    ]
+    db_session.add_all(orders)
+    db_session.commit()
+    return orders
+
+
+def test_search_ranks_matches(override_employee, indexed_orders):
+    resp = override_employee.get("/search/", params={"q": "compressor"})
+    assert resp.status_code == 200
+    data = resp.json()
+
+    # details outweigh workers
+    assert [o["id"] for o in data] == [indexed_orders[0].id, indexed_orders[1].id]
+    assert data[0]["vehicle_plate"] == "SRC-777"
+    assert data[0]["client_name"] == "Search Client"
+
+
+def test_search_by_plate_and_limit(override_employee, indexed_orders):
+    data = override_employee.get("/search/", params={"q": "src-777", "limit": 2}).json()
+    assert len(data) == 2
+
+    assert override_employee.get("/search/", params={"q": "%%"}).json() == []
+    assert override_employee.get("/search/", params={"q": "ana", "limit": 1000}).status_code == 422
+
+
+def test_search_ranks_older_matches_too(override_employee, indexed_orders, db_session):
+    owner, vehicle = indexed_orders[0].client, indexed_orders[0].vehicle
+    db_session.add_all([
+        WorkOrder(entry_date=date(2025, 2, day), client=owner, vehicle=vehicle, workers="Compressor crew", details="Vent")
+        for day in range(1, 6)
+    ])
+    db_session.commit()
+
+    data = override_employee.get("/search/", params={"q": "compressor", "limit": 1}).json()
+    assert [o["id"] for o in data] == [indexed_orders[0].id]
+
+
+def test_search_requires_employee(client):
+    assert client.get("/search/", params={"q": "x"}).status_code == 401
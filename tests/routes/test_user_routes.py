@@ -149,3 +149,138 @@ def test_delete_user(client: TestClient, db_session: Session, fake_admin):
     assert remaining is None
 
     client.app.dependency_overrides.clear()
+
+# -----------------------------
+# TEST: PRINCIPAL CACHE
+# -----------------------------
+def _auth_header(user):
+    from app.utils.auth import create_access_token
+    token = create_access_token({"sub": user.username, "role": user.role.value})
+    return {"Authorization": f"Bearer {token}"}
+
+def test_principal_cache_skips_user_lookup_on_warm_requests(client: TestClient, db_session: Session):
+    from app.utils.auth import principal_cache
+
+    user = User(username="cached", password=hash_password("Cached!1"), role=UserRole.EMPLOYEE)
+    db_session.add(user)
+    db_session.commit()
+    headers = _auth_header(user)
+
+    assert client.get(f"/user/{user.id}", headers=headers).status_code == 200
+    assert client.get(f"/user/{user.id}", headers=headers).status_code == 200
+
+    stats = principal_cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+
+def test_principal_cache_invalidated_on_role_change(client: TestClient, db_session: Session, fake_admin):
+    from app.utils.auth import principal_cache
+
+    user = User(username="promoted", password=hash_password("Promo!1"), role=UserRole.EMPLOYEE)
+    db_session.add(user)
+    db_session.commit()
+    headers = _auth_header(user)
+
+    # Warm the cache, then promote the user through the admin endpoint
+    assert client.get("/user/", headers=headers).status_code == 403
+    client.app.dependency_overrides[require_admin] = lambda: fake_admin
+    assert client.put(f"/user/{user.id}", json={"role": "ADMIN"}).status_code == 200
+    client.app.dependency_overrides.pop(require_admin)
+
+    assert principal_cache.get("promoted") is None
+    assert client.get("/user/", headers=headers).status_code == 200
+
+def test_principal_cache_invalidated_on_delete(client: TestClient, db_session: Session, fake_admin):
+    user = User(username="removed", password=hash_password("Gone!1"), role=UserRole.EMPLOYEE)
+    db_session.add(user)
+    db_session.commit()
+    headers = _auth_header(user)
+
+    assert client.get(f"/user/{user.id}", headers=headers).status_code == 200
+    client.app.dependency_overrides[require_admin] = lambda: fake_admin
+    assert client.delete(f"/user/{user.id}").status_code == 200
+    client.app.dependency_overrides.pop(require_admin)
+
+    assert client.get(f"/user/{user.id}", headers=headers).status_code == 401
+
+# -----------------------------
+# TEST: CLAIMS-ONLY AUTHORIZATION
+# -----------------------------
+@pytest.fixture()
+def claims_only(monkeypatch):
+    monkeypatch.setattr("app.utils.auth.AUTH_CLAIMS_ONLY", True)
+
+def _claims_header(user):
+    from app.utils.auth import create_access_token, build_token_claims
+    return {"Authorization": f"Bearer {create_access_token(build_token_claims(user))}"}
+
+def test_claims_only_warm_authorization_runs_no_queries(client: TestClient, db_session: Session, claims_only):
+    from sqlalchemy import event
+
+    admin = User(username="claims_admin", password=hash_password("Claims!1"), role=UserRole.ADMIN)
+    db_session.add(admin)
+    db_session.commit()
+    headers = _claims_header(admin)
+
+    # First request warms the principal cache
+    assert client.get("/system/stats", headers=headers).status_code == 200
+
+    statements = []
+    engine = db_session.get_bind().engine
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = client.get("/system/stats", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert response.status_code == 200
+    assert statements == []
+
+def test_claims_only_role_change_invalidates_old_tokens(client: TestClient, db_session: Session, fake_admin, claims_only):
+    user = User(username="claims_emp", password=hash_password("Claims!1"), role=UserRole.ADMIN)
+    db_session.add(user)
+    db_session.commit()
+    old_headers = _claims_header(user)
+    assert client.get("/user/", headers=old_headers).status_code == 200
+    old_version = user.token_version
+
+    client.app.dependency_overrides[require_admin] = lambda: fake_admin
+    assert client.put(f"/user/{user.id}", json={"role": "EMPLOYEE"}).status_code == 200
+    client.app.dependency_overrides.pop(require_admin)
+
+    db_session.refresh(user)
+    assert user.token_version == old_version + 1
+    assert client.get(f"/user/{user.id}", headers=old_headers).status_code == 401
+    assert client.get(f"/user/{user.id}", headers=_claims_header(user)).status_code == 200
+    assert client.get("/user/", headers=_claims_header(user)).status_code == 403
+
+def test_claims_only_deleted_user_is_rejected(client: TestClient, db_session: Session, fake_admin, claims_only):
+    user = User(username="claims_gone", password=hash_password("Claims!1"), role=UserRole.EMPLOYEE)
+    db_session.add(user)
+    db_session.commit()
+    headers = _claims_header(user)
+    assert client.get(f"/user/{user.id}", headers=headers).status_code == 200
+
+    client.app.dependency_overrides[require_admin] = lambda: fake_admin
+    assert client.delete(f"/user/{user.id}").status_code == 200
+    client.app.dependency_overrides.pop(require_admin)
+
+    assert client.get(f"/user/{user.id}", headers=headers).status_code == 401
+
+def test_claims_only_recreated_user_rejects_old_tokens(client: TestClient, db_session: Session, fake_admin, claims_only):
+    user = User(username="claims_bob", password=hash_password("Claims!1"), role=UserRole.ADMIN)
+    db_session.add(user)
+    db_session.commit()
+    admin_headers = _claims_header(user)
+    assert client.get("/user/", headers=admin_headers).status_code == 200
+
+    client.app.dependency_overrides[require_admin] = lambda: fake_admin
+    assert client.delete(f"/user/{user.id}").status_code == 200
+    created = client.post("/user/", json={"username": "claims_bob", "password": "Claims!1", "role": "EMPLOYEE"})
+    client.app.dependency_overrides.pop(require_admin)
+    assert created.status_code == 200
+
+    assert client.get("/user/", headers=admin_headers).status_code == 401
+    recreated = db_session.get(User, created.json()["id"])
+    assert client.get("/user/", headers=_claims_header(recreated)).status_code == 403
@@ -143,3 +143,68 @@ def test_update_vehicle_invalid_plate(client, owner):
 
     resp = client.put(f"/vehicles/{vid}", json=bad_update)
     assert resp.status_code in (422, 400)
+
+
+# ---------- Bulk create ----------
+def test_create_vehicles_bulk(override_employee, owner):
+    items = [
+        {**NEW_VEHICLE_PAYLOAD, "owner_id": owner.id},
+        {**NEW_VEHICLE_PAYLOAD_2, "owner_id": 99999},
+        {**NEW_VEHICLE_PAYLOAD, "owner_id": owner.id},
+        {**NEW_VEHICLE_PAYLOAD_2, "owner_id": owner.id, "kilometers": -1},
+    ]
+    response = override_employee.post("/vehicles/bulk", json=items)
+    assert response.status_code == 200
+
+    data = response.json()
+    assert [v["plate_number"] for v in data["created"]] == ["CCC-222"]
+    assert [(e["index"], e["detail"]) for e in data["errors"][:2]] == [(1, "Owner not found"), (2, "Plate number already exists")]
+    assert data["errors"][2]["index"] == 3
+    assert override_employee.get(f"/vehicles/{data['created'][0]['id']}").status_code == 200
+
+
+# ---------- Typeahead lookup by plate ----------
+@pytest.fixture()
+def memory_lookup(monkeypatch):
+    from app.database import lookup
+
+    monkeypatch.setattr(lookup, "LOOKUP_MEMORY_INDEX", True)
+    lookup.vehicle_index.invalidate()
+    lookup.client_index.invalidate()
+    yield lookup
+    lookup.vehicle_index.invalidate()
+    lookup.client_index.invalidate()
+
+
+def create_lookup_vehicles(client, owner):
+    for plate in ("LKP-002", "LKP-001", "LKX-100", "ZZZ-999"):
+        client.post("/vehicles/", json={**NEW_VEHICLE_PAYLOAD, "owner_id": owner.id, "plate_number": plate})
+
+
+def test_lookup_vehicles_by_plate_prefix(client, owner):
+    create_lookup_vehicles(client, owner)
+
+    resp = client.get("/vehicles/lookup", params={"prefix": "lkp"})
+    assert resp.status_code == 200
+    assert [v["plate_number"] for v in resp.json()] == ["LKP-001", "LKP-002"]
+    assert set(resp.json()[0]) == {"id", "plate_number", "brand_model", "owner_id"}
+
+    assert len(client.get("/vehicles/lookup", params={"prefix": "LK", "limit": 2}).json()) == 2
+    assert client.get("/vehicles/lookup", params={"prefix": "LK", "limit": 500}).status_code == 422
+    assert client.get("/vehicles/lookup", params={"prefix": ""}).status_code == 422
+
+
+def test_lookup_vehicles_from_memory_index(client, owner, memory_lookup):
+    loads = memory_lookup.vehicle_index.loads
+    create_lookup_vehicles(client, owner)
+    assert [v["plate_number"] for v in client.get("/vehicles/lookup", params={"prefix": "LKP"}).json()] == ["LKP-001", "LKP-002"]
+    assert memory_lookup.vehicle_index.loads == loads + 1
+
+    # Committed writes update the loaded index in place
+    vehicle_id = client.post("/vehicles/", json={**NEW_VEHICLE_PAYLOAD, "owner_id": owner.id, "plate_number": "LKP-000"}).json()["id"]
+    client.put(f"/vehicles/{vehicle_id}", json={"brand_model": "Renamed"})
+    client.delete(f"/vehicles/{client.get('/vehicles/lookup', params={'prefix': 'LKP-002'}).json()[0]['id']}")
+
+    data = client.get("/vehicles/lookup", params={"prefix": "LKP"}).json()
+    assert [(v["plate_number"], v["brand_model"]) for v in data] == [("LKP-000", "Renamed"), ("LKP-001", "Toyota Corolla")]
+    assert memory_lookup.vehicle_index.loads == loads + 1
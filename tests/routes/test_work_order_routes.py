@@ -128,6 +128,33 @@ def test_update_work_order(test_client, work_order_payload):
     data = resp.json()
     assert data["workers"] == "Jane Smith"
 
+def test_update_and_delete_lock_the_work_order(override_employee, db_session, filter_orders):
+    from sqlalchemy import event
+    from sqlalchemy.dialects import postgresql
+    from app.database.counters import reconcile_counters
+
+    locking_selects = []
+
+    def record(state):
+        if not state.is_select:
+            return
+        sql = str(state.statement.compile(dialect=postgresql.dialect()))
+        if "FROM work_orders" in sql:
+            locking_selects.append(sql.rstrip().endswith("FOR UPDATE"))
+
+    order_id = filter_orders[0].id
+    event.listen(db_session, "do_orm_execute", record)
+    try:
+        resp = override_employee.put(f"/work-orders/{order_id}", json={"work_status": "completed"})
+        assert resp.status_code == 200
+        assert override_employee.delete(f"/work-orders/{order_id}").status_code == 200
+    finally:
+        event.remove(db_session, "do_orm_execute", record)
+
+    # PUT: locked load, then the refresh after commit; DELETE: locked load
+    assert locking_selects == [True, False, True]
+    assert reconcile_counters(db_session) == {}
+
 # ------------------------
 # DELETE WORK ORDER
 # ------------------------
@@ -142,3 +169,320 @@ def test_delete_work_order(test_client, work_order_payload):
 
     resp_check = test_client.get(f"/work-orders/{order_id}")
     assert resp_check.status_code == 404
+
+# ------------------------
+# CURSOR PAGINATION
+# ------------------------
+def test_list_work_orders_cursor_pages(override_employee, db_session, client_obj, vehicle_obj):
+    from app.models.work_order import WorkOrder
+
+    # Several orders share an entry date, so the id tie-breaker decides the order
+    orders = [
+        WorkOrder(entry_date=date(2025, 1, 1) + timedelta(days=n // 2), client_id=client_obj.id,
+                  vehicle_id=vehicle_obj.id, workers=f"Worker {n}")
+        for n in range(7)
+    ]
+    db_session.add_all(orders)
+    db_session.commit()
+    expected = [o.id for o in sorted(orders, key=lambda o: (o.entry_date, o.id), reverse=True)]
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        resp = override_employee.get("/work-orders/", params={"cursor": cursor, "sort": "-entry_date", "limit": 3})
+        assert resp.status_code == 200
+        page = resp.json()
+        seen += [o["id"] for o in page["items"]]
+        cursor = page["next_cursor"]
+
+    assert seen == expected
+
+def test_list_work_orders_cursor_survives_inserts(override_employee, db_session, client_obj, vehicle_obj):
+    from app.models.work_order import WorkOrder
+
+    db_session.add_all([
+        WorkOrder(entry_date=date(2025, 2, n + 1), client_id=client_obj.id, vehicle_id=vehicle_obj.id, workers="W")
+        for n in range(4)
+    ])
+    db_session.commit()
+
+    first = override_employee.get("/work-orders/", params={"cursor": "", "sort": "entry_date", "limit": 2}).json()
+    # A new order sorting before the cursor must not shift the next page
+    db_session.add(WorkOrder(entry_date=date(2024, 12, 31), client_id=client_obj.id, vehicle_id=vehicle_obj.id, workers="W"))
+    db_session.commit()
+    second = override_employee.get(
+        "/work-orders/", params={"cursor": first["next_cursor"], "sort": "entry_date", "limit": 2}
+    ).json()
+
+    dates = [o["entry_date"] for o in first["items"] + second["items"]]
+    assert dates == ["2025-02-01", "2025-02-02", "2025-02-03", "2025-02-04"]
+
+def test_list_work_orders_rejects_bad_cursor_and_sort(override_employee):
+    assert override_employee.get("/work-orders/", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert override_employee.get("/work-orders/", params={"sort": "workers"}).status_code == 400
+
+# ------------------------
+# FILTERS AND SEARCH
+# ------------------------
+@pytest.fixture()
+def filter_orders(db_session, client_obj, vehicle_obj):
+    from app.models.work_order import WorkOrder
+
+    orders = [
+        WorkOrder(entry_date=date(2025, 3, 1), client_id=client_obj.id, vehicle_id=vehicle_obj.id, workers="Ana",
+                  work_status=WorkStatus.PENDING, payment_status=PaymentStatus.NOT_PAID, details="Compressor leak"),
+        WorkOrder(entry_date=date(2025, 3, 5), client_id=client_obj.id, vehicle_id=vehicle_obj.id, workers="Beto",
+                  work_status=WorkStatus.COMPLETED, payment_status=PaymentStatus.PAID, spare_parts="Filter 100%"),
+        WorkOrder(entry_date=date(2025, 3, 9), client_id=client_obj.id, vehicle_id=vehicle_obj.id, workers="Ana",
+                  work_status=WorkStatus.COMPLETED, payment_status=PaymentStatus.NOT_PAID),
+    ]
+    db_session.add_all(orders)
+    db_session.commit()
+    return orders
+
+def test_list_work_orders_filters(override_employee, filter_orders, vehicle_obj):
+    def ids(**params):
+        resp = override_employee.get("/work-orders/", params={"sort": "entry_date", **params})
+        assert resp.status_code == 200
+        return [o["id"] for o in resp.json()]
+
+    a, b, c = (o.id for o in filter_orders)
+    assert ids(work_status="completed") == [b, c]
+    assert ids(payment_status="NOT_PAID", work_status="completed") == [c]
+    assert ids(date_from="2025-03-02", date_to="2025-03-09") == [b, c]
+    assert ids(vehicle_id=vehicle_obj.id, q="compressor") == [a]
+    assert ids(q=vehicle_obj.plate_number.lower()) == [a, b, c]
+    assert ids(q="test client") == [a, b, c]
+    assert ids(q="100%") == [b]
+    assert c in ids(q=str(c))
+
+def test_list_work_orders_total(override_employee, filter_orders):
+    page = override_employee.get("/work-orders/", params={"cursor": "", "limit": 1, "q": "ana", "with_total": True}).json()
+    assert page["total"] == 2
+    assert len(page["items"]) == 1
+
+    resp = override_employee.get("/work-orders/", params={"payment_status": "PAID", "with_total": True})
+    assert resp.headers["X-Total-Count"] == "1"
+
+def test_list_work_orders_rejects_inverted_date_range(override_employee):
+    resp = override_employee.get("/work-orders/", params={"date_from": "2025-03-09", "date_to": "2025-03-01"})
+    assert resp.status_code == 400
+
+# ------------------------
+# EXPANDED LISTING
+# ------------------------
+@pytest.fixture()
+def count_selects(db_session):
+    from sqlalchemy import event
+
+    connection = db_session.connection()
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    event.listen(connection, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(connection, "before_cursor_execute", before_cursor_execute)
+
+def test_expanded_listing_embeds_client_and_vehicle(override_employee, fake_employee, filter_orders, client_obj, vehicle_obj, count_selects):
+    expected_ids = [filter_orders[0].id, filter_orders[2].id]
+    client_fields = (client_obj.name, client_obj.phone_number, client_obj.email)
+    vehicle_fields = (vehicle_obj.plate_number, vehicle_obj.brand_model, vehicle_obj.vehicle_type)
+    fake_employee.role  # load the expired user outside the counted request
+    count_selects.clear()
+
+    resp = override_employee.get("/work-orders/expanded", params={"sort": "entry_date", "q": "ana"})
+    assert resp.status_code == 200
+    assert len(count_selects) == 1
+
+    data = resp.json()
+    assert [o["id"] for o in data] == expected_ids
+    assert (data[0]["client_name"], data[0]["client_phone"], data[0]["client_email"]) == client_fields
+    assert (data[0]["vehicle_plate"], data[0]["vehicle_model"], data[0]["vehicle_type"]) == vehicle_fields
+
+def test_expanded_listing_pages_with_one_select_each(override_employee, fake_employee, filter_orders, count_selects):
+    fake_employee.role
+    count_selects.clear()
+
+    cursor, pages = "", 0
+    while cursor is not None:
+        page = override_employee.get("/work-orders/expanded", params={"cursor": cursor, "limit": 2}).json()
+        cursor = page["next_cursor"]
+        pages += 1
+
+    assert pages == 2
+    assert len(count_selects) == pages
+
+# ------------------------
+# BULK CREATE
+# ------------------------
+def test_create_work_orders_bulk(override_employee, work_order_payload, client_obj):
+    stats = override_employee.get("/work-orders/stats").json()
+    items = [
+        work_order_payload,
+        {**work_order_payload, "client_id": 99999},
+        {**work_order_payload, "payment_status": "PAID", "details": "Bulk imported"},
+    ]
+
+    response = override_employee.post("/work-orders/bulk", json=items)
+    assert response.status_code == 200
+    data = response.json()
+    assert [o["payment_status"] for o in data["created"]] == ["NOT_PAID", "PAID"]
+    assert data["errors"] == [{"index": 1, "detail": "Client not found"}]
+
+    # The cached stats were dropped and the counters moved
+    assert override_employee.get("/work-orders/stats").json()["total"] == stats["total"] + 2
+    assert override_employee.get(f"/work-orders/{data['created'][1]['id']}").json()["details"] == "Bulk imported"
+
+def test_transition_work_order_status(override_employee, filter_orders):
+    a, b, c = (o.id for o in filter_orders)
+    assert override_employee.get("/work-orders/stats").json()["unpaid"] == 2
+
+    # Orders of a date range that are not paid yet
+    resp = override_employee.patch(
+        "/work-orders/status", params={"date_from": "2025-03-01", "date_to": "2025-03-31"}, json={"payment_status": "PAID"}
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {"updated": 2, "ids": [a, c]}
+    assert override_employee.get("/work-orders/stats").json()["unpaid"] == 0
+
+    resp = override_employee.patch("/work-orders/status", params={"q": "ana"}, json={"ids": [b, c], "work_status": "completed"})
+    assert resp.json() == {"updated": 0, "ids": []}
+
+    resp = override_employee.patch("/work-orders/status", json={"ids": [a], "work_status": "completed"})
+    assert resp.json() == {"updated": 1, "ids": [a]}
+    assert override_employee.get(f"/work-orders/{a}").json()["work_status"] == "completed"
+
+def test_transition_work_order_status_requires_a_selection_and_a_target(override_employee, filter_orders):
+    assert override_employee.patch("/work-orders/status", json={"payment_status": "PAID"}).status_code == 400
+    assert override_employee.patch("/work-orders/status", json={"ids": [filter_orders[0].id]}).status_code == 422
+
+# ------------------------
+# EXPORT
+# ------------------------
+def test_export_work_orders_csv(override_employee, filter_orders, client_obj, vehicle_obj):
+    import csv
+    a, b, c = (o.id for o in filter_orders)
+
+    resp = override_employee.get("/work-orders/export", params={"date_from": "2025-03-02", "date_to": "2025-03-09"})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert resp.headers["content-disposition"] == 'attachment; filename="work-orders.csv"'
+
+    rows = list(csv.DictReader(resp.text.splitlines()))
+    assert [int(row["id"]) for row in rows] == [b, c]
+    assert rows[0]["work_status"] == "completed"
+    assert rows[0]["entry_date"] == "2025-03-05"
+    assert rows[0]["spare_parts"] == "Filter 100%"
+    assert rows[1]["spare_parts"] == ""
+    assert rows[0]["client_name"] == client_obj.name
+    assert rows[0]["vehicle_plate"] == vehicle_obj.plate_number
+
+    resp = override_employee.get("/work-orders/export", params={"date_from": "2030-01-01"})
+    assert resp.text.splitlines() == [resp.text.splitlines()[0]]
+
+def test_export_work_orders_ndjson(override_employee, filter_orders, monkeypatch):
+    import json
+    from app.routes import work_orders
+    a, b, c = (o.id for o in filter_orders)
+
+    # Several partitions of the cursor
+    monkeypatch.setattr(work_orders, "EXPORT_BATCH_SIZE", 2)
+    resp = override_employee.get(
+        "/work-orders/export", params={"format": "ndjson", "fields": "payment_status,id", "q": "ana"}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in resp.text.splitlines()] == [
+        {"id": a, "payment_status": "NOT_PAID"},
+        {"id": c, "payment_status": "NOT_PAID"},
+    ]
+
+    assert override_employee.get("/work-orders/export", params={"format": "xml"}).status_code == 422
+
+# ------------------------
+# SPARSE FIELDSETS
+# ------------------------
+def test_list_work_orders_sparse_fields(override_employee, fake_employee, filter_orders, count_selects):
+    a, b, c = (o.id for o in filter_orders)
+    fake_employee.role
+    count_selects.clear()
+
+    resp = override_employee.get(
+        "/work-orders/", params={"fields": "work_status, id", "sort": "entry_date", "with_total": True}
+    )
+    assert resp.status_code == 200
+    assert resp.json() == [
+        {"id": a, "work_status": "pending"},
+        {"id": b, "work_status": "completed"},
+        {"id": c, "work_status": "completed"},
+    ]
+    assert resp.headers["X-Total-Count"] == "3"
+    assert "details" not in count_selects[-1]
+
+    # The sort key is read for the cursor without being returned
+    page = override_employee.get(
+        "/work-orders/", params={"fields": "workers", "sort": "-entry_date", "cursor": "", "limit": 2}
+    ).json()
+    assert page["items"] == [{"workers": "Ana"}, {"workers": "Beto"}]
+    page = override_employee.get(
+        "/work-orders/", params={"fields": "workers", "sort": "-entry_date", "cursor": page["next_cursor"], "limit": 2}
+    ).json()
+    assert page == {"items": [{"workers": "Ana"}], "next_cursor": None, "total": None}
+
+def test_sparse_fields_on_detail_and_expanded(override_employee, filter_orders, vehicle_obj):
+    order = filter_orders[0]
+
+    resp = override_employee.get(f"/work-orders/{order.id}", params={"fields": "entry_date,details"})
+    assert resp.json() == {"entry_date": "2025-03-01", "details": "Compressor leak"}
+    assert override_employee.get("/work-orders/99999", params={"fields": "id"}).status_code == 404
+
+    resp = override_employee.get("/work-orders/expanded", params={"fields": "id,vehicle_plate", "q": "compressor"})
+    assert resp.json() == [{"id": order.id, "vehicle_plate": vehicle_obj.plate_number}]
+
+    resp = override_employee.get(f"/vehicles/{vehicle_obj.id}/work-orders", params={"fields": "id"})
+    assert resp.json() == [{"id": o.id} for o in reversed(filter_orders)]
+
+def test_sparse_fields_rejects_unknown_fields(override_employee):
+    resp = override_employee.get("/work-orders/", params={"fields": "id,client_name"})
+    assert resp.status_code == 400
+    assert "client_name" in resp.json()["detail"]
+    assert override_employee.get("/work-orders/", params={"fields": " , "}).status_code == 400
+
+def test_list_vehicle_work_orders(override_employee, filter_orders, vehicle_obj):
+    a, b, c = (o.id for o in filter_orders)
+
+    resp = override_employee.get(f"/vehicles/{vehicle_obj.id}/work-orders")
+    assert resp.status_code == 200
+    assert [o["id"] for o in resp.json()] == [c, b, a]
+
+    page = override_employee.get(f"/vehicles/{vehicle_obj.id}/work-orders", params={"cursor": "", "limit": 2}).json()
+    assert [o["id"] for o in page["items"]] == [c, b]
+    page = override_employee.get(
+        f"/vehicles/{vehicle_obj.id}/work-orders", params={"cursor": page["next_cursor"], "limit": 2}
+    ).json()
+    assert [o["id"] for o in page["items"]] == [a]
+    assert page["next_cursor"] is None
+
+    assert override_employee.get("/vehicles/99999/work-orders").status_code == 404
+
+def test_work_order_stats(override_employee, fake_employee, filter_orders, count_selects):
+    stats = override_employee.get("/work-orders/stats").json()
+    assert (stats["total"], stats["pending"], stats["completed"], stats["unpaid"]) == (3, 1, 2, 2)
+    assert stats["by_payment_status"] == {"NOT_PAID": 2, "PAID": 1}
+    assert stats["facets"] == {"work_status": ["completed", "pending"], "payment_status": ["NOT_PAID", "PAID"]}
+
+    # Served from the cache until a write
+    fake_employee.role
+    count_selects.clear()
+    assert override_employee.get("/work-orders/stats").json() == stats
+    assert count_selects == []
+
+    override_employee.put(f"/work-orders/{filter_orders[0].id}", json={"payment_status": "BILL_SENT"})
+    stats = override_employee.get("/work-orders/stats").json()
+    assert stats["by_payment_status"] == {"BILL_SENT": 1, "NOT_PAID": 1, "PAID": 1}
+    assert stats["unpaid"] == 2
+
+    override_employee.delete(f"/work-orders/{filter_orders[1].id}")
+    assert override_employee.get("/work-orders/stats").json()["completed"] == 1
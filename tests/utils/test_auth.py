@@ -0,0 +1,110 @@
+import time
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.auth import create_access_token, decode_token, token_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_token_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+def test_decode_token_serves_warm_tokens_from_cache():
+    token = create_access_token({"sub": "cached_user"})
+
+    first = decode_token(token)
+    second = decode_token(token)
+
+    assert first == second
+    assert second["sub"] == "cached_user"
+    assert token_cache.stats()["hits"] == 1
+
+
+def test_decode_token_never_caches_invalid_tokens():
+    token = create_access_token({"sub": "cached_user"})
+    tampered = token[:-2] + ("AA" if not token.endswith("AA") else "BB")
+
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            decode_token(tampered)
+
+    assert len(token_cache) == 0
+
+
+def test_decode_token_cache_entry_drops_at_expiry():
+    token = create_access_token({"sub": "short_lived"}, expires_delta=timedelta(seconds=1))
+    decode_token(token)
+
+    time.sleep(1.1)
+
+    assert token_cache.get(token) is None
+
+
+def test_cached_payload_is_not_shared_with_callers():
+    token = create_access_token({"sub": "cached_user"})
+
+    decode_token(token)["sub"] = "mutated"
+
+    assert decode_token(token)["sub"] == "cached_user"
+
+
+def test_calibration_stays_within_safe_bounds():
+    from app.utils.auth import calibrate_bcrypt_rounds, BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS
+
+    assert calibrate_bcrypt_rounds(0.001) == BCRYPT_MIN_ROUNDS
+    assert calibrate_bcrypt_rounds(10 ** 9) == BCRYPT_MAX_ROUNDS
+
+
+def test_password_needs_rehash_only_upgrades_the_stored_cost(monkeypatch):
+    import bcrypt
+    from app.utils.auth import password_hashing, password_needs_rehash
+
+    stored = bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds=11)).decode()
+
+    monkeypatch.setitem(password_hashing, "rounds", 12)
+    assert password_needs_rehash(stored) is True
+    monkeypatch.setitem(password_hashing, "rounds", 11)
+    assert password_needs_rehash(stored) is False
+    # A worker calibrated lower keeps the stored cost
+    monkeypatch.setitem(password_hashing, "rounds", 10)
+    assert password_needs_rehash(stored) is False
+    assert password_needs_rehash("not-a-bcrypt-hash") is False
+
+
+def test_password_needs_rehash_follows_a_fixed_cost_both_ways(monkeypatch):
+    import bcrypt
+    from app.utils.auth import password_hashing, password_needs_rehash
+
+    stored = bcrypt.hashpw(b"secret", bcrypt.gensalt(rounds=11)).decode()
+    monkeypatch.setattr("app.utils.auth.BCRYPT_ROUNDS", "10")
+
+    monkeypatch.setitem(password_hashing, "rounds", 10)
+    assert password_needs_rehash(stored) is True
+    monkeypatch.setitem(password_hashing, "rounds", 11)
+    assert password_needs_rehash(stored) is False
+    monkeypatch.setitem(password_hashing, "rounds", 12)
+    assert password_needs_rehash(stored) is True
+
+
+def _request(peer: str, forwarded_for: str = None):
+    from starlette.requests import Request
+
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "headers": headers, "client": (peer, 1234)})
+
+
+def test_client_ip_reads_forwarded_for_only_from_trusted_proxies(monkeypatch):
+    import ipaddress
+    from app.utils.auth import request_client_ip
+
+    monkeypatch.setattr("app.utils.auth.TRUSTED_PROXIES", [ipaddress.ip_network("10.0.0.0/8")])
+
+    # The first entry is whatever the client sent; the proxies appended the rest
+    assert request_client_ip(_request("10.0.0.5", "1.2.3.4, 203.0.113.9, 10.0.0.7")) == "203.0.113.9"
+    assert request_client_ip(_request("10.0.0.5")) == "10.0.0.5"
+    assert request_client_ip(_request("198.51.100.1", "203.0.113.9")) == "198.51.100.1"
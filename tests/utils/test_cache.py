@@ -0,0 +1,51 @@
+import time
+
+from app.utils.cache import TTLCache
+
+
+def test_cache_hit_and_miss_counters():
+    cache = TTLCache(max_size=10, ttl=60)
+
+    assert cache.get("missing") is None
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+def test_cache_entries_expire():
+    cache = TTLCache(max_size=10, ttl=60)
+
+    cache.set("key", "value", ttl=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(max_size=2, ttl=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_invalidate():
+    cache = TTLCache(max_size=10, ttl=60)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.invalidate("a", "unknown")
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
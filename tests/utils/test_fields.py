@@ -0,0 +1,36 @@
+import pytest
+from fastapi import HTTPException
+
+from app.models.work_order import WorkOrder
+from app.schemas.work_order import WorkOrderResponse
+from app.utils.fields import SparseFields, schema_columns
+
+COLUMNS = schema_columns(WorkOrderResponse, WorkOrder.__table__.columns)
+
+
+def test_schema_columns_follow_the_schema():
+    assert list(COLUMNS) == list(WorkOrderResponse.model_fields)
+
+
+def test_without_fields_everything_passes_through():
+    fields = SparseFields(COLUMNS, None)
+    content = [object()]
+
+    assert not fields.requested
+    assert fields.entities(WorkOrder, required=(WorkOrder.id,)) == (WorkOrder,)
+    assert fields.render(content) is content
+
+
+def test_requested_fields_keep_schema_order_and_add_required_columns():
+    fields = SparseFields(COLUMNS, "workers, id,workers")
+
+    assert fields.names == ["workers", "id"]
+    labels = [column.name for column in fields.entities(WorkOrder, required=(WorkOrder.entry_date, WorkOrder.id))]
+    assert labels == ["workers", "id", "entry_date"]
+
+
+@pytest.mark.parametrize("value", ["", " , ", "id,name_normalized"])
+def test_empty_or_unknown_fields_are_rejected(value):
+    with pytest.raises(HTTPException) as exc:
+        SparseFields(COLUMNS, value)
+    assert exc.value.status_code == 400
@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import column
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.utils.lookup import SortedPrefixIndex, normalize_name, prefix_condition
+
+
+def test_normalize_name():
+    assert normalize_name("  José   PÉREZ ") == "jose perez"
+    assert normalize_name(None) == ""
+
+
+@pytest.mark.parametrize(
+    "dialect, sql",
+    [
+        (sqlite.dialect(), "name >= 'ab%' AND name < 'ab&'"),
+        (postgresql.dialect(), "name LIKE 'ab/%%%%' ESCAPE '/'"),
+    ],
+)
+def test_prefix_condition(dialect, sql):
+    condition = prefix_condition(column("name"), "ab%", dialect.name)
+    assert str(condition.compile(dialect=dialect, compile_kwargs={"literal_binds": True})) == sql
+
+
+def test_sorted_prefix_index():
+    index = SortedPrefixIndex(max_age=60)
+    index.put("ignored", 1, "x")
+    assert index.stale and len(index) == 0
+
+    index.load([("ana", 1, "Ana"), ("andres", 2, "Andrés"), ("bruno", 3, "Bruno"), ("ana", 4, "Ana B")])
+    assert index.lookup("an", 10) == ["Ana", "Ana B", "Andrés"]
+    assert index.lookup("an", 2) == ["Ana", "Ana B"]
+    assert index.lookup("z", 10) == []
+
+    index.put("zoe", 1, "Zoe")
+    index.discard(2)
+    assert index.lookup("an", 10) == ["Ana B"]
+    assert index.lookup("", 10) == ["Ana B", "Bruno", "Zoe"]
+
+    index.invalidate()
+    assert index.stale
+
+
+def test_sorted_prefix_index_refreshes_in_the_background():
+    index = SortedPrefixIndex(max_age=0)
+    index.load([("ana", 1, "Ana"), ("bruno", 2, "Bruno")])
+    reading, release = threading.Event(), threading.Event()
+
+    def rows():
+        reading.set()
+        release.wait(5)
+        return [("ana", 1, "Ana"), ("bruno", 2, "Bruno"), ("carla", 3, "Carla")]
+
+    assert index.refresh_in_background(rows)
+    assert reading.wait(5)
+    assert not index.refresh_in_background(rows)
+    assert index.lookup("", 10) == ["Ana", "Bruno"]  # the old contents answer meanwhile
+
+    index.put("diego", 4, "Diego")  # committed after the rows were read
+    index.discard(1)
+    release.set()
+    while index.stats()["refreshing"]:
+        time.sleep(0.01)
+
+    assert index.loads == 2
+    assert index.lookup("", 10) == ["Bruno", "Carla", "Diego"]
@@ -0,0 +1,45 @@
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.work_order import WorkOrder
+from app.utils.pagination import KeysetPagination, decode_cursor, encode_cursor
+
+SORTS = {"id": WorkOrder.id, "entry_date": WorkOrder.entry_date}
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("-entry_date", date(2025, 3, 4), 42)
+
+    assert decode_cursor(cursor, "-entry_date", date) == (date(2025, 3, 4), 42)
+
+
+@pytest.mark.parametrize("cursor", ["%%%", "e30", encode_cursor("id", "x", 1)])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, "id", int)
+    assert exc.value.status_code == 400
+
+
+def test_cursor_from_another_sort_is_rejected():
+    with pytest.raises(HTTPException) as exc:
+        KeysetPagination(SORTS, WorkOrder.id, "entry_date", encode_cursor("id", 5, 5), 10)
+    assert exc.value.detail == "Cursor does not match the requested sort"
+
+
+def test_unknown_sort_and_bad_limit_are_rejected():
+    with pytest.raises(HTTPException):
+        KeysetPagination(SORTS, WorkOrder.id, "workers", None, 10)
+    with pytest.raises(HTTPException):
+        KeysetPagination(SORTS, WorkOrder.id, "id", None, 0)
+
+
+def test_page_emits_cursor_only_when_more_rows_exist():
+    keyset = KeysetPagination(SORTS, WorkOrder.id, "entry_date", "", 2)
+    rows = [WorkOrder(id=n, entry_date=date(2025, 1, n)) for n in (1, 2, 3)]
+
+    page = keyset.page(rows)
+    assert [o.id for o in page["items"]] == [1, 2]
+    assert decode_cursor(page["next_cursor"], "entry_date", date) == (date(2025, 1, 2), 2)
+    assert keyset.page(rows[:2])["next_cursor"] is None
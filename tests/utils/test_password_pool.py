@@ -0,0 +1,35 @@
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.password_pool import PasswordHashingPool
+
+
+def test_pool_runs_jobs_and_counts_them():
+    pool = PasswordHashingPool(max_workers=2, max_queue=2)
+
+    assert pool.run(lambda a, b: a + b, 2, 3) == 5
+
+    stats = pool.stats()
+    assert stats["completed"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_pool_rejects_with_503_when_queue_is_full():
+    pool = PasswordHashingPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    running = pool.submit(release.wait)
+    queued = pool.submit(release.wait)
+
+    with pytest.raises(HTTPException) as exc:
+        pool.submit(release.wait)
+
+    assert exc.value.status_code == 503
+    assert pool.stats()["rejected"] == 1
+
+    release.set()
+    running.result()
+    queued.result()
+    assert pool.stats()["in_flight"] == 0
@@ -0,0 +1,53 @@
+import time
+
+from app.utils.rate_limit import TokenBucketLimiter
+
+
+def test_bucket_allows_burst_then_rejects():
+    limiter = TokenBucketLimiter(capacity=3, refill_per_second=0.001)
+
+    results = [limiter.acquire("user")[0] for _ in range(4)]
+
+    assert results == [True, True, True, False]
+    allowed, retry_after = limiter.acquire("user")
+    assert allowed is False
+    assert retry_after > 0
+
+
+def test_buckets_are_independent_per_key():
+    limiter = TokenBucketLimiter(capacity=1, refill_per_second=0.001)
+
+    assert limiter.acquire("a")[0] is True
+    assert limiter.acquire("a")[0] is False
+    assert limiter.acquire("b")[0] is True
+
+
+def test_bucket_refills_over_time():
+    limiter = TokenBucketLimiter(capacity=1, refill_per_second=20)
+
+    assert limiter.acquire("user")[0] is True
+    assert limiter.acquire("user")[0] is False
+    time.sleep(0.06)
+    assert limiter.acquire("user")[0] is True
+
+
+def test_idle_buckets_are_evicted():
+    limiter = TokenBucketLimiter(capacity=1, refill_per_second=50)
+
+    for i in range(100):
+        limiter.acquire(f"user-{i}")
+    time.sleep(0.05)
+    limiter.acquire("fresh")
+
+    stats = limiter.stats()
+    assert stats["keys"] == 1
+    assert stats["evicted"] == 100
+
+
+def test_memory_is_capped_under_random_key_spray():
+    limiter = TokenBucketLimiter(capacity=5, refill_per_second=0.001, max_keys=50)
+
+    for i in range(1000):
+        limiter.acquire(f"spray-{i}")
+
+    assert limiter.stats()["keys"] <= 50
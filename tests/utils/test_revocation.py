@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base
+from app.models.revoked_token import RevokedToken
+from app.utils.revocation import TokenRevocationStore
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine("sqlite:///:memory:", future=True)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, future=True)()
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def test_revoked_token_is_rejected(session):
+    store = TokenRevocationStore(sync_interval=60)
+
+    assert store.revoke(session, "abc", datetime.utcnow() + timedelta(days=1)) is True
+
+    assert store.is_revoked(session, "abc") is True
+    assert store.is_revoked(session, "other") is False
+    assert store.stats()["rejections"] == 1
+
+
+def test_revoking_twice_reports_reuse(session):
+    store = TokenRevocationStore(sync_interval=60)
+    expires_at = datetime.utcnow() + timedelta(days=1)
+
+    assert store.revoke(session, "abc", expires_at) is True
+    assert store.revoke(session, "abc", expires_at) is False
+
+
+def test_other_processes_revocations_are_loaded_on_sync(session):
+    store = TokenRevocationStore(sync_interval=60)
+    session.add(RevokedToken(jti="remote", expires_at=datetime.utcnow() + timedelta(days=1), revoked_at=datetime.utcnow()))
+    session.commit()
+
+    assert store.is_revoked(session, "remote") is True
+
+
+def test_expired_rows_are_pruned_from_table(session):
+    store = TokenRevocationStore(sync_interval=60)
+    session.add(RevokedToken(jti="old", expires_at=datetime.utcnow() - timedelta(minutes=1), revoked_at=datetime.utcnow()))
+    session.commit()
+
+    store.sync(session, force=True)
+
+    assert session.query(RevokedToken).count() == 0
+    assert store.is_revoked(session, "old") is False
+
+
+def test_expired_entries_are_pruned_from_memory(session):
+    store = TokenRevocationStore(sync_interval=60)
+    with store._lock:
+        store._remember("soon", time.time() + 0.05)
+    assert store.is_revoked(session, "soon") is True
+
+    time.sleep(0.1)
+
+    assert store.is_revoked(session, "soon") is False
+    assert store.stats()["size"] == 0
+    assert store.stats()["pruned"] == 1